@@ -0,0 +1,140 @@
+# agent/cache.py - Two-tier TTL cache: in-memory LRU in front of SQLite
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from agent.storage import data_path
+
+
+class TieredCache:
+    """In-memory LRU tier in front of an on-disk SQLite tier, both honouring per-entry TTLs
+
+    The memory tier answers hot keys without touching disk; the disk tier survives
+    restarts and is promoted into memory on a hit. Values must be JSON-serialisable.
+    Expired and over-capacity disk rows are pruned every prune_every writes, so the
+    disk tier may briefly hold up to prune_every rows beyond max_disk_entries.
+    """
+
+    def __init__(self, name: str,
+                 max_entries: int = 256,
+                 max_disk_entries: int = 5000,
+                 ttl: float = 3600.0,
+                 path: Optional[str] = None,
+                 prune_every: int = 100):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.prune_every = max(1, prune_every)
+        self.path = path or data_path(f"{name}_cache.db")
+
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries (expires_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_created_at ON cache_entries (created_at)")
+        self._writes_since_prune = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+                self.expired += 1
+
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if row[1] <= now:
+                with self._conn:
+                    self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            value = json.loads(row[0])
+            self._remember(key, value, row[1])
+            self.disk_hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            self._remember(key, value, expires_at)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, default=str), expires_at, now)
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= self.prune_every:
+                    self._prune_disk(now)
+                    self._writes_since_prune = 0
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+            with self._conn:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        """Insert into the memory tier, evicting least-recently-used entries past capacity"""
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _prune_disk(self, now: float) -> None:
+        """Drop expired rows, then the oldest rows beyond the disk capacity"""
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        self._conn.execute("""
+            DELETE FROM cache_entries WHERE key IN (
+                SELECT key FROM cache_entries ORDER BY created_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_disk_entries,))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        with self._lock:
+            disk_entries = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        return {
+            "name": self.name,
+            "memory_entries": len(self._memory),
+            "disk_entries": disk_entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+        }
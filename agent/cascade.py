@@ -0,0 +1,117 @@
+# agent/cascade.py - Quality-gated model cascade: draft on a fast model, escalate weak drafts
+
+import os
+from collections import defaultdict, deque
+from typing import Any, Dict, Tuple
+
+from agent.metrics import observe_cascade
+
+# Route -> what a usable report looks like: minimum length, headings the prompt asks for,
+# and analysis markers the downstream agents rely on
+CASCADE_CHECKS = {
+    "psychological_interviews": {
+        "min_chars": 6000,
+        "sections": ["INTERVIEW 1", "INTERVIEW 2", "INTERVIEW 3", "PSYCHOLOGICAL INTERVIEW ANALYSIS"],
+        "markers": ["contradiction", "defense"]
+    },
+    "sales_intelligence_interviews": {
+        "min_chars": 6000,
+        "sections": ["INTERVIEW 1", "INTERVIEW 2", "INTERVIEW 3", "SALES INTELLIGENCE EXTRACTION"],
+        "markers": ["objection", "contradiction"]
+    },
+    "campaign_synthesis": {
+        "min_chars": 4000,
+        "sections": ["POSITIONING", "CAMPAIGN FRAMEWORK", "MESSAGING", "IMPLEMENTATION"],
+        "markers": ["contradiction", "hypothesis"]
+    },
+}
+
+# Share of the score each check carries - with the default threshold a truncated draft or
+# one missing half its sections is escalated, a single missing heading or marker is not
+CHECK_WEIGHTS = {"length": 0.2, "sections": 0.4, "markers": 0.2, "complete": 0.2}
+
+# stop_reason / finish_reason values meaning the response hit max_tokens
+TRUNCATED_STOP_REASONS = ("max_tokens", "length")
+
+
+def is_truncated(result: Any) -> bool:
+    metadata = getattr(result, "response_metadata", None) or {}
+    return (metadata.get("stop_reason") or metadata.get("finish_reason")) in TRUNCATED_STOP_REASONS
+
+
+def score_output(route: str, result: Any) -> Tuple[float, Dict[str, float]]:
+    """(score in 0-1, per-check scores) for a draft, using the route's CASCADE_CHECKS"""
+    checks = CASCADE_CHECKS[route]
+    text = getattr(result, "content", "") or ""
+    upper, lower = text.upper(), text.lower()
+
+    parts = {
+        "length": min(len(text) / checks["min_chars"], 1.0),
+        "sections": sum(1 for section in checks["sections"] if section in upper) / len(checks["sections"]),
+        "markers": sum(1 for marker in checks["markers"] if marker in lower) / len(checks["markers"]),
+        "complete": 0.0 if is_truncated(result) else 1.0
+    }
+    score = sum(CHECK_WEIGHTS[name] * value for name, value in parts.items())
+    return score, {name: round(value, 2) for name, value in parts.items()}
+
+
+class ModelCascade:
+    """Escalation decisions and escalation rate for routes that draft on a cheaper model
+
+    A route is cascaded when it has CASCADE_CHECKS and the routing table has a
+    "<route>_draft" entry. The draft is kept when score_output reaches the threshold;
+    otherwise the node re-runs on the route's own model. A failed draft call escalates too.
+
+    Settings: MODEL_CASCADE_ENABLED (true), MODEL_CASCADE_THRESHOLD (0.85).
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("MODEL_CASCADE_ENABLED", "true").lower() == "true"
+        self.threshold = float(os.getenv("MODEL_CASCADE_THRESHOLD", "0.85"))
+        self.drafts: Dict[str, int] = defaultdict(int)
+        self.escalations: Dict[str, int] = defaultdict(int)
+        self._scores: Dict[str, deque] = defaultdict(lambda: deque(maxlen=200))
+
+    def applies(self, route: str) -> bool:
+        return self.enabled and route in CASCADE_CHECKS
+
+    def judge(self, route: str, result: Any) -> Dict[str, Any]:
+        """Score a draft (None = the draft call failed) and record whether it escalates"""
+        if result is None:
+            score, checks = 0.0, {}
+        else:
+            score, checks = score_output(route, result)
+        escalated = score < self.threshold
+
+        self.drafts[route] += 1
+        self.escalations[route] += escalated
+        self._scores[route].append(score)
+        observe_cascade(route, score, escalated)
+        return {"score": round(score, 3), "threshold": self.threshold, "escalated": escalated, "checks": checks}
+
+    def escalation_rate(self, route: str = None) -> float:
+        routes = [route] if route else list(self.drafts)
+        drafts = sum(self.drafts[name] for name in routes)
+        return sum(self.escalations[name] for name in routes) / drafts if drafts else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "drafts": sum(self.drafts.values()),
+            "escalations": sum(self.escalations.values()),
+            "escalation_rate": round(self.escalation_rate(), 3),
+            "routes": {
+                route: {
+                    "drafts": self.drafts[route],
+                    "escalations": self.escalations[route],
+                    "escalation_rate": round(self.escalation_rate(route), 3),
+                    "mean_score": round(sum(self._scores[route]) / len(self._scores[route]), 3)
+                }
+                for route in self.drafts
+            }
+        }
+
+
+# Shared cascade used by call_llm_cascade
+model_cascade = ModelCascade()
@@ -0,0 +1,191 @@
+# agent/checkpointing.py - Durable SQLite checkpoints and run resumption
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, Iterable, Optional
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.constants import CONFIG_KEY_DEDUPE_TASKS
+
+from agent.storage import data_path
+
+logger = logging.getLogger(__name__)
+
+
+def open_checkpointer(path: Optional[str] = None) -> AsyncSqliteSaver:
+    """SQLite checkpointer - the connection opens lazily on first use inside the event loop"""
+    path = path or os.getenv("RESEARCH_CHECKPOINT_DB") or data_path("checkpoints.db")
+    return AsyncSqliteSaver(aiosqlite.connect(path))
+
+
+def new_thread_id() -> str:
+    return f"research_{uuid.uuid4().hex}"
+
+
+def thread_config(thread_id: str) -> Dict[str, Any]:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def failed_nodes(values: Dict[str, Any]) -> list:
+    """Nodes a finished state records as failed (each node's except path sets failed_nodes)"""
+    return list(values.get("failed_nodes") or {})
+
+
+async def discard_writes(saver: AsyncSqliteSaver, config: Dict[str, Any], task_ids: Iterable[str]) -> None:
+    """Delete the pending writes some tasks left at a checkpoint, so resuming from it runs them again"""
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+    configurable = config["configurable"]
+    placeholders = ", ".join("?" for _ in task_ids)
+    async with saver.lock:
+        await saver.conn.execute(
+            f"DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? AND task_id IN ({placeholders})",
+            (configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"], *task_ids)
+        )
+        await saver.conn.commit()
+
+
+async def find_resume_config(graph, thread_id: str) -> Optional[Dict[str, Any]]:
+    """Checkpoint config to resume a thread from, or None when there is nothing to redo
+
+    An interrupted run resumes from its latest checkpoint. A finished run whose agents
+    recorded failures resumes from the checkpoint the first failed node ran from: the
+    failed tasks' writes there are discarded, while the writes of the siblings that
+    succeeded in the same step are kept and re-applied instead of paid for again.
+    Nodes downstream of that step run again, since their inputs may change.
+    """
+    config = thread_config(thread_id)
+    snapshot = await graph.aget_state(config)
+    if not snapshot.values:
+        return None
+    if snapshot.next:
+        return config
+
+    failed = set(failed_nodes(snapshot.values))
+    if not failed:
+        return None
+
+    resume_from = None
+    expected = snapshot.config["configurable"]["checkpoint_id"]
+    async for past in graph.aget_state_history(config):
+        # History is newest first and includes branches of earlier resumes - follow the
+        # latest run's parent chain back to its earliest failed step
+        if past.config["configurable"]["checkpoint_id"] != expected:
+            continue
+        if failed.intersection(past.next):
+            resume_from = past
+        if past.parent_config is None:
+            break
+        expected = past.parent_config["configurable"]["checkpoint_id"]
+    if resume_from is None:
+        return None
+
+    await discard_writes(
+        graph.checkpointer, resume_from.config,
+        [task.id for task in resume_from.tasks if task.name in failed]
+    )
+    # A fork from an explicit checkpoint re-runs every task unless told to skip those with writes
+    return {"configurable": {**resume_from.config["configurable"], CONFIG_KEY_DEDUPE_TASKS: True}}
+
+
+async def resume_run(graph, thread_id: str) -> Optional[Dict[str, Any]]:
+    """Re-run a thread from its resume point - returns the final state, or None if already complete"""
+    resume_config = await find_resume_config(graph, thread_id)
+    if resume_config is None:
+        return None
+    logger.info(f"♻️ Resuming {thread_id} from checkpoint {resume_config['configurable'].get('checkpoint_id', 'latest')}")
+    return await graph.ainvoke(None, resume_config)
+
+
+class CheckpointRetention:
+    """Deletes checkpoint threads that are no longer needed for resumption
+
+    A run that finishes without failed nodes has nothing to resume, so its thread is
+    deleted straight away (CHECKPOINT_KEEP_COMPLETED=true keeps it). Failed and
+    interrupted threads stay resumable for CHECKPOINT_RETENTION_DAYS (default 7) and
+    are then removed by a background prune every CHECKPOINT_PRUNE_INTERVAL seconds
+    (default 3600). Thread start times are tracked in a checkpoint_threads table, since
+    LangGraph's own tables carry no timestamps; threads written before it existed are
+    not aged out and need a one-off manual cleanup.
+    """
+
+    def __init__(self, saver: AsyncSqliteSaver):
+        self.saver = saver
+        self.retention_days = float(os.getenv("CHECKPOINT_RETENTION_DAYS", "7"))
+        self.keep_completed = os.getenv("CHECKPOINT_KEEP_COMPLETED", "false").lower() == "true"
+        self.interval = float(os.getenv("CHECKPOINT_PRUNE_INTERVAL", "3600"))
+        self._ready = False
+        self._task: Optional[asyncio.Task] = None
+        self.deleted = 0
+
+    async def _connection(self) -> aiosqlite.Connection:
+        """The saver's connection, with LangGraph's tables and the thread table in place"""
+        if not self._ready:
+            await self.saver.setup()
+            async with self.saver.lock:
+                await self.saver.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS checkpoint_threads (thread_id TEXT PRIMARY KEY, created_at REAL NOT NULL)"
+                )
+                await self.saver.conn.commit()
+            self._ready = True
+        return self.saver.conn
+
+    async def track(self, thread_id: str) -> None:
+        """Record when a thread was started (a resumed thread keeps its original time)"""
+        conn = await self._connection()
+        async with self.saver.lock:
+            await conn.execute(
+                "INSERT OR IGNORE INTO checkpoint_threads (thread_id, created_at) VALUES (?, ?)",
+                (thread_id, time.time())
+            )
+            await conn.commit()
+
+    async def finished(self, thread_id: str, values: Dict[str, Any]) -> None:
+        """Drop a finished thread's checkpoints unless a failed node may still be resumed"""
+        if self.keep_completed or failed_nodes(values):
+            return
+        await self.delete_thread(thread_id)
+
+    async def delete_thread(self, thread_id: str) -> None:
+        conn = await self._connection()
+        async with self.saver.lock:
+            for table in ("writes", "checkpoints", "checkpoint_threads"):
+                await conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            await conn.commit()
+        self.deleted += 1
+
+    async def prune(self) -> int:
+        """Delete threads started more than retention_days ago - returns how many were removed"""
+        conn = await self._connection()
+        cutoff = time.time() - self.retention_days * 86400
+        async with self.saver.lock:
+            async with conn.execute("SELECT thread_id FROM checkpoint_threads WHERE created_at < ?", (cutoff,)) as cursor:
+                expired = [row[0] for row in await cursor.fetchall()]
+        for thread_id in expired:
+            await self.delete_thread(thread_id)
+        return len(expired)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                removed = await self.prune()
+                if removed:
+                    logger.info(f"🧹 Pruned checkpoints of {removed} threads older than {self.retention_days:g} days")
+            except Exception as e:
+                logger.warning(f"⚠️ Checkpoint prune failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
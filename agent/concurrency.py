@@ -0,0 +1,177 @@
+# agent/concurrency.py - AIMD concurrency limits for provider calls
+
+import asyncio
+import contextlib
+import heapq
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import httpx
+
+from agent.metrics import observe_concurrency, observe_concurrency_change
+from agent.quota import PRIORITY_CLASSES, current_priority
+
+# Provider status codes that mean "send less": rate limited, overloaded
+OVERLOAD_STATUS_CODES = (429, 529)
+
+
+def is_overload(error: BaseException) -> bool:
+    """429 / 529 responses and timeouts - the signals that should shrink the limit"""
+    if isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException)):
+        return True
+    if type(error).__name__ == "APITimeoutError":
+        return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status in OVERLOAD_STATUS_CODES
+
+
+class AdaptiveLimiter:
+    """In-flight call limit that grows additively and shrinks multiplicatively (AIMD)
+
+    A call that finishes within `tolerance` x its usual latency, while the limiter
+    was fully used, adds 1/limit - about +1 per round of calls. A 429, 529 or timeout
+    multiplies the limit by `decrease`; failures from calls started before the last
+    cut are ignored, so one burst of errors counts as a single congestion signal.
+    For `cooldown` seconds after a cut the limiter reports backing_off, and callers
+    should not add optional load such as hedged requests.
+    Latency baselines are kept per call key (agent name), since a digest and a
+    synthesis call have very different normal durations.
+    """
+
+    def __init__(self, name: str, initial: float, minimum: float, maximum: float,
+                 decrease: float = 0.5, tolerance: float = 2.0, history: int = 200, cooldown: float = 30.0):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = min(max(initial, minimum), maximum)
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.history: deque = deque(maxlen=history)
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = 0
+        self._baselines: Dict[str, float] = {}
+        self._last_decrease = 0.0
+        self._record("initial")
+
+    @classmethod
+    def from_env(cls, name: str, prefix: str, initial: int, maximum: int) -> "AdaptiveLimiter":
+        """Settings from <prefix>_CONCURRENCY_{INITIAL,MIN,MAX} and the shared CONCURRENCY_* knobs"""
+        return cls(
+            name,
+            initial=float(os.getenv(f"{prefix}_CONCURRENCY_INITIAL", str(initial))),
+            minimum=float(os.getenv(f"{prefix}_CONCURRENCY_MIN", "1")),
+            maximum=float(os.getenv(f"{prefix}_CONCURRENCY_MAX", str(maximum))),
+            decrease=float(os.getenv("CONCURRENCY_DECREASE_FACTOR", "0.5")),
+            tolerance=float(os.getenv("CONCURRENCY_LATENCY_TOLERANCE", "2.0")),
+            cooldown=float(os.getenv("CONCURRENCY_BACKOFF_SECONDS", "30"))
+        )
+
+    @property
+    def backing_off(self) -> bool:
+        """True within `cooldown` seconds of the last multiplicative decrease"""
+        return bool(self._last_decrease) and time.monotonic() - self._last_decrease < self.cooldown
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= int(self.limit)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, key: str = "default") -> AsyncIterator[None]:
+        """Hold one in-flight slot for the block and feed its outcome back into the limit"""
+        await self._acquire()
+        saturated = self.saturated
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self._release()
+            if is_overload(e):
+                self._on_overload(start, type(e).__name__)
+            raise
+        self._release()
+        self._on_success(key, time.monotonic() - start, saturated)
+
+    async def _acquire(self):
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            observe_concurrency(self.name, self.limit, self.in_flight)
+            return
+
+        self._seq += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITY_CLASSES.get(current_priority(), 0), self._seq, future))
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+        observe_concurrency(self.name, self.limit, self.in_flight)
+
+    def _on_success(self, key: str, latency: float, saturated: bool):
+        baseline = self._baselines.get(key, latency)
+        healthy = latency <= baseline * self.tolerance
+        # Slow-moving baseline so a gradual slowdown still registers as unhealthy for a while
+        self._baselines[key] = baseline * 0.9 + latency * 0.1
+
+        if healthy and saturated and self.limit < self.maximum:
+            before = int(self.limit)
+            self.limit = min(self.limit + 1 / self.limit, self.maximum)
+            if int(self.limit) > before:
+                self._record("increase")
+                observe_concurrency_change(self.name, "increase")
+            self._wake()
+
+    def _on_overload(self, start: float, reason: str):
+        if start < self._last_decrease:
+            return
+        self._last_decrease = time.monotonic()
+        self.limit = max(self.limit * self.decrease, self.minimum)
+        self._record(f"decrease:{reason}")
+        observe_concurrency_change(self.name, "decrease")
+        observe_concurrency(self.name, self.limit, self.in_flight)
+
+    def _record(self, reason: str):
+        self.history.append({"at": round(time.time(), 3), "limit": round(self.limit, 2), "reason": reason})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "backing_off": self.backing_off,
+            "waiting": sum(1 for _, _, future in self._waiters if not future.done()),
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "latency_baselines": {key: round(value, 3) for key, value in self._baselines.items()},
+            "history": list(self.history)[-20:]
+        }
+
+
+# Shared limiters - LLM_CONCURRENCY_*, OPENAI_CONCURRENCY_* and BRAVE_CONCURRENCY_* override the defaults
+llm_limiter = AdaptiveLimiter.from_env("anthropic", "LLM", initial=8, maximum=64)
+openai_limiter = AdaptiveLimiter.from_env("openai", "OPENAI", initial=8, maximum=64)
+search_limiter = AdaptiveLimiter.from_env("brave", "BRAVE", initial=4, maximum=20)
+
+# LLM provider -> its limiter
+LLM_LIMITERS = {"anthropic": llm_limiter, "openai": openai_limiter}
+
+
+def concurrency_stats() -> Dict[str, Any]:
+    return {limiter.name: limiter.stats() for limiter in (llm_limiter, openai_limiter, search_limiter)}
@@ -0,0 +1,60 @@
+# agent/digest.py - Compact structured digests of agent reports for downstream prompts
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+# Digest keys, in the order they are rendered into downstream prompts
+DIGEST_FIELDS = ["archetypes", "pains", "objections", "triggers", "quotes", "opportunities"]
+
+# Per-field cap - keeps a digest to a few hundred tokens however verbose the source was
+MAX_ITEMS_PER_FIELD = 6
+
+
+def digests_enabled() -> bool:
+    return os.getenv("DIGEST_ENABLED", "true").lower() == "true"
+
+
+def parse_digest(text: str) -> Optional[Dict[str, List[str]]]:
+    """Digest dict from an LLM response - None when no usable JSON object is found"""
+    match = re.search(r"\{.*\}", text or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        raw = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(raw, dict):
+        return None
+
+    digest = {}
+    for field in DIGEST_FIELDS:
+        items = raw.get(field) or []
+        if isinstance(items, str):
+            items = [items]
+        digest[field] = [str(item).strip() for item in items if str(item).strip()][:MAX_ITEMS_PER_FIELD]
+
+    return digest if any(digest.values()) else None
+
+
+def render_digest(digest: Dict[str, List[str]]) -> str:
+    """Compact text form of a digest for prompt inputs"""
+    blocks = []
+    for field in DIGEST_FIELDS:
+        items = digest.get(field) or []
+        if items:
+            blocks.append(f"{field.upper()}:\n" + "\n".join(f"- {item}" for item in items))
+    return "\n\n".join(blocks)
+
+
+def upstream_input(state: Dict[str, Any], key: str, default: str = "") -> str:
+    """What a downstream prompt receives for an upstream report
+
+    The rendered digest when one was produced, otherwise the full text - so a failed
+    or disabled digest only costs tokens, never content.
+    """
+    digest = (state.get("digests") or {}).get(key)
+    if digest:
+        return render_digest(digest)
+    return state.get(key, default) or default
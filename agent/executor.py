@@ -0,0 +1,49 @@
+# agent/executor.py - Dedicated executor for graph work that must stay sync
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_sync_executor() -> ThreadPoolExecutor:
+    """Shared pool for sync graph work - sized by GRAPH_SYNC_WORKERS (default 8)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("GRAPH_SYNC_WORKERS", "8")),
+            thread_name_prefix="graph-sync"
+        )
+    return _executor
+
+
+async def run_sync(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable on the dedicated executor instead of the loop's default one
+
+    The caller's context variables (e.g. the active trace span) carry over to the thread.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_sync_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+
+def offload(node: Callable[[Dict[str, Any]], Any]) -> Callable[[Dict[str, Any]], Any]:
+    """Wrap a sync graph node as an async node that runs on the dedicated executor"""
+
+    @functools.wraps(node)
+    async def async_node(state: Dict[str, Any]) -> Any:
+        return await run_sync(node, state)
+
+    return async_node
+
+
+def shutdown_sync_executor(wait: bool = True) -> None:
+    """Release the executor threads - called on app shutdown"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
@@ -1,107 +1,130 @@
 # agent/graph.py - Enhanced 6-Agent Intelligence System with Error Handling
 
 import json
+import logging
+import re
 import time
 import os
-import requests
-import traceback
-from typing import TypedDict, Dict, Any, List
+import uuid
+from typing import TypedDict, Dict, Any, List, Annotated, Tuple
 from datetime import datetime
 
 from langgraph.graph import StateGraph, END
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import ChatOpenAI
-from langchain.callbacks import LangChainTracer
 
 # Import your external prompts and learning system
 from prompts.research_prompts import ResearchPrompts
 from agent.learning_memory import LearningMemorySystem
-
-print("🔍 LangSmith tracing is enabled")
-print("🚀 Creating Enhanced 6-Agent Intelligence System")
+from agent.executor import offload
+from agent.llm_registry import llm_registry, model_of, provider_of, route_of
+from agent.prompt_cache import build_prompt, prompt_cache_usage, strip_cache_control
+from agent.digest import digests_enabled, parse_digest, upstream_input
+from agent.token_budget import token_budget
+from agent.metrics import llm_usage, observe_llm_call
+from agent.tracing import tracer, trace_node, span_elapsed
+from agent.quota import quota_scope
+from agent.retry import llm_call_policy
+from agent.cascade import model_cascade
+from agent.search import BraveSearchClient
+
+logger = logging.getLogger(__name__)
+
+logger.info("🔍 LangSmith tracing is enabled")
+logger.info("🚀 Creating Enhanced 6-Agent Intelligence System")
 
 # Initialize learning system
 learning_system = LearningMemorySystem()
 
-# Add this function anywhere in your agent/graph.py file (before the agents)
-def web_search(query: str, num_results: int = 10) -> str:
+# Concurrent Brave client for the competitor searches
+search_client = BraveSearchClient()
+
+async def call_llm(key: str, llm, prompt):
+    """Invoke an LLM inside a traced span tagged with the model and token counts
+
+    The call goes through the retry / hedging policy; every request it sends (retries
+    and hedges included) reserves against the shared quota of the route's provider and
+    holds a slot of the adaptive concurrency limit.
     """
-    Search the web using Brave Search API
-    Returns formatted search results for agent analysis
+    provider = provider_of(llm)
+    if provider != "anthropic":
+        prompt = strip_cache_control(prompt)
+    with tracer.span(f"llm:{key}", kind="llm", model=model_of(llm), provider=provider) as span:
+        result = await llm_call_policy.call(key, llm, prompt, span)
+        usage = getattr(result, "usage_metadata", None) or {}
+        span.set(input_tokens=usage.get("input_tokens", 0), output_tokens=usage.get("output_tokens", 0))
+        return result
+
+def record_llm_call(key: str, llm, result, elapsed: float) -> Dict[str, Any]:
+    """Partial update with one LLM call's route, cache usage and token/cost metrics (also exported to /metrics)"""
+    usage = llm_usage(result, model_of(llm), elapsed)
+    observe_llm_call(key, usage)
+    return {
+        "prompt_cache_usage": {key: prompt_cache_usage(result)},
+        "llm_usage": {key: usage},
+        "model_routes": {key: route_of(llm)}
+    }
+
+async def call_llm_cascade(key: str, tier: str, prompt) -> Tuple[Any, Any, Dict[str, Any]]:
+    """(llm, result, extra partial update) for a route, drafting on its fast model first when cascaded
+
+    The draft is scored by the route's quality gate; a weak or failed draft is re-run on
+    the route's own model, and the draft's usage is recorded under "<key>_draft" so the
+    run's cost includes it. The gate's verdict lands in model_cascade.
     """
-    try:
-        api_key = os.getenv("BRAVE_SEARCH_API_KEY")
-        if not api_key:
-            return "Error: BRAVE_SEARCH_API_KEY not found in environment variables"
-        
-        # Brave Search API endpoint
-        url = "https://api.search.brave.com/res/v1/web/search"
-        
-        headers = {
-            "Accept": "application/json",
-            "Accept-Encoding": "gzip",
-            "X-Subscription-Token": api_key
-        }
-        
-        params = {
-            "q": query,
-            "count": num_results,
-            "offset": 0,
-            "mkt": "en-US",
-            "safesearch": "moderate",
-            "freshness": "pd",  # Past day for fresh results
-            "text_decorations": False,
-            "spellcheck": True
-        }
-        
-        print(f"🔍 Searching web for: {query}")
-        
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        # Format results for agent analysis
-        results = []
-        if "web" in data and "results" in data["web"]:
-            for result in data["web"]["results"]:
-                formatted_result = {
-                    "title": result.get("title", ""),
-                    "url": result.get("url", ""),
-                    "description": result.get("description", ""),
-                    "age": result.get("age", ""),
-                    "language": result.get("language", "")
-                }
-                results.append(formatted_result)
-        
-        # Create formatted string for agent analysis
-        formatted_output = f"Web Search Results for: {query}\n\n"
-        for i, result in enumerate(results, 1):
-            formatted_output += f"{i}. {result['title']}\n"
-            formatted_output += f"   URL: {result['url']}\n"
-            formatted_output += f"   Description: {result['description']}\n"
-            formatted_output += f"   Age: {result['age']}\n\n"
-        
-        if not results:
-            formatted_output += "No results found for this query.\n"
-        
-        print(f"✅ Found {len(results)} results")
-        return formatted_output
-        
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Error searching web: {str(e)}"
-        print(f"❌ {error_msg}")
-        return error_msg
-    except Exception as e:
-        error_msg = f"Unexpected error in web search: {str(e)}"
-        print(f"❌ {error_msg}")
-        return error_msg
+    llm = ResearchConfig.get_llm(key, tier)
+    draft_route = f"{key}_draft"
+    if not model_cascade.applies(key) or draft_route not in ResearchConfig.MODEL_ROUTES:
+        return llm, await call_llm(key, llm, prompt), {}
+    draft_llm = ResearchConfig.get_llm(draft_route, tier)
+    if model_of(draft_llm) == model_of(llm):
+        return llm, await call_llm(key, llm, prompt), {}
+    
+    with tracer.span(f"cascade:{key}", kind="cascade", draft_model=model_of(draft_llm)) as span:
+        try:
+            draft = await call_llm(draft_route, draft_llm, prompt)
+        except Exception as e:
+            logger.warning(f"⚠️ {key}: draft on {model_of(draft_llm)} failed ({type(e).__name__}) - escalating")
+            draft = None
+        verdict = {**model_cascade.judge(key, draft), "draft_model": model_of(draft_llm)}
+        span.set(score=verdict["score"], escalated=verdict["escalated"])
+    
+    if not verdict["escalated"]:
+        logger.info(f"🪜 {key}: {model_of(draft_llm)} draft accepted (score {verdict['score']:.2f})")
+        return draft_llm, draft, {"model_cascade": {key: verdict}}
+    
+    logger.info(f"🪜 {key}: draft scored {verdict['score']:.2f} < {verdict['threshold']:.2f} - "
+                f"escalating to {model_of(llm)}")
+    update = {"model_cascade": {key: verdict}}
+    if draft is not None:
+        update.update(record_llm_call(draft_route, draft_llm, draft, span.duration))
+    return llm, await call_llm(key, llm, prompt), update
+
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer for dict state keys written by parallel branches - merges instead of overwriting"""
+    merged = dict(left or {})
+    merged.update(right or {})
+    return merged
+
+def node_failure(node: str, error) -> Dict[str, Dict[str, str]]:
+    """State update recording that a workflow node failed - read back when resuming the run"""
+    return {"failed_nodes": {node: str(error) or type(error).__name__}}
+
+def merge_updates(*updates: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Combine partial updates of dict-valued state keys without one overwriting another"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for update in updates:
+        for key, value in update.items():
+            merged[key] = merge_dicts(merged.get(key), value)
+    return merged
 
 class Level10ResearchState(TypedDict):
     # Input
     business_context: str
     research_type: str
     output_format: str
+    research_tier: str         # express / standard / deep - resolved from research_type
+    execution_plan: List[str]  # Nodes this run was planned with (full workflow when absent)
+    request_priority: str      # interactive / batch - provider quota priority class
+    tenant: str                # Fair-share key for provider quotas
     
     # Core Research Outputs
     psychological_analysis: str
@@ -109,6 +132,7 @@ class Level10ResearchState(TypedDict):
     # NEW - Competitor Intelligence Outputs
     competitor_analysis: str        # Competitor discovery and analysis
     competitive_intelligence: str   # Strategic gap analysis and opportunities
+    competitor_search_results: str  # Prefetched web search data for competitor discovery
     
     # Enhanced Interview Outputs
     psychological_interviews: str      # NEW - emotional depth interviews
@@ -130,8 +154,21 @@ class Level10ResearchState(TypedDict):
     memory_context: Dict[str, Any]
     learning_insights: List[str]
     
-    # Processing metrics
-    processing_times: Dict[str, float]
+    # Processing metrics (merged across parallel branches)
+    processing_times: Annotated[Dict[str, float], merge_dicts]
+    prompt_cache_usage: Annotated[Dict[str, Dict[str, int]], merge_dicts]  # Cache read/write tokens per agent
+    llm_usage: Annotated[Dict[str, Dict[str, Any]], merge_dicts]  # Tokens, tokens/s and estimated cost per agent
+    model_routes: Annotated[Dict[str, Dict[str, Any]], merge_dicts]  # Provider, model, temperature, max_tokens per LLM call
+    model_cascade: Annotated[Dict[str, Dict[str, Any]], merge_dicts]  # Draft score and escalation per cascaded agent
+    
+    # Workflow node -> error, for nodes that caught a failure (resumption re-runs exactly these)
+    failed_nodes: Annotated[Dict[str, str], merge_dicts]
+    
+    # Per-node prompt budget: allowance, tokens sent, and tokens trimmed per input section
+    prompt_budget: Annotated[Dict[str, Dict[str, Any]], merge_dicts]
+    
+    # Structured digests of agent reports - downstream prompts consume these instead of the full text
+    digests: Annotated[Dict[str, Dict[str, List[str]]], merge_dicts]
     
     # Final outputs
     psychology_report: str
@@ -140,44 +177,96 @@ class Level10ResearchState(TypedDict):
     formatted_report: str
     executive_summary: str
 
+# Models used by the routing table
+SONNET_MODEL = "claude-sonnet-4-20250514"
+HAIKU_MODEL = "claude-3-5-haiku-20241022"
+
+# Env overrides for the routing table: {"<route>": {...}} applies to every tier,
+# {"<tier>:<route>": {...}} to one research_type, e.g.
+#   MODEL_ROUTES='{"competitor_analysis": {"model": "gpt-4o-mini", "provider": "openai"}}'
+MODEL_ROUTE_OVERRIDES = json.loads(os.getenv("MODEL_ROUTES", "{}") or "{}")
+
 class ResearchConfig:
-    """Upgraded to Sonnet 4 with optimal settings"""
+    """Per-node model routing - Sonnet 4 where depth matters, Haiku for the lighter steps"""
     
-    @staticmethod
-    def get_llm(task_type: str):
-        """Use Sonnet 4 for better completion and quality"""
-        
-        from langchain_anthropic import ChatAnthropic
-        from langchain.callbacks import LangChainTracer
-        
-        # Sonnet 4 for all agents - better instruction following
-        # Temperature 0.6 - your proven sweet spot
-        # Appropriate tokens for each agent type
-        
-        if task_type == "deep_psychological":
-            llm = ChatAnthropic(
-                model="claude-sonnet-4-20250514",  # Sonnet 4
-                temperature=0.6,
-                max_tokens=6000,  # Deep analysis space
-                callbacks=[LangChainTracer()]
-            )
-        elif task_type == "creative_interviews":
-            llm = ChatAnthropic(
-                model="claude-sonnet-4-20250514",  # Sonnet 4
-                temperature=0.6,
-                max_tokens=5000,  # Full conversations
-                callbacks=[LangChainTracer()]
-            )
-        else:
+    # Route (the node's LLM call key) -> provider, model, temperature, max_tokens.
+    # Research tiers adjust these per research_type (RESEARCH_TIERS[tier]["routes"]).
+    MODEL_ROUTES = {
+        "default": {
             # All other agents
-            llm = ChatAnthropic(
-                model="claude-sonnet-4-20250514",  # Sonnet 4
-                temperature=0.6,
-                max_tokens=4000,  # Focused insights
-                callbacks=[LangChainTracer()]
-            )
-            
-        return llm
+            "provider": "anthropic",
+            "model": SONNET_MODEL,
+            "temperature": 0.6,  # Proven sweet spot
+            "max_tokens": 4000  # Focused insights
+        },
+        "psychological_analysis": {
+            "provider": "anthropic",
+            "model": SONNET_MODEL,
+            "temperature": 0.6,
+            "max_tokens": 6000  # Deep analysis space
+        },
+        "psychological_interviews": {
+            "provider": "anthropic",
+            "model": SONNET_MODEL,
+            "temperature": 0.6,
+            "max_tokens": 5000  # Full conversations
+        },
+        "sales_intelligence_interviews": {
+            "provider": "anthropic",
+            "model": SONNET_MODEL,
+            "temperature": 0.6,
+            "max_tokens": 5000
+        },
+        "competitor_analysis": {
+            # Condenses search results into competitor profiles - summarising, not deep reasoning
+            "provider": "anthropic",
+            "model": HAIKU_MODEL,
+            "temperature": 0.3,
+            "max_tokens": 4000
+        },
+        "digest": {
+            # Condenses reports for downstream agents - extraction, not analysis
+            "provider": "anthropic",
+            "model": HAIKU_MODEL,
+            "temperature": 0.0,
+            "max_tokens": 1200
+        },
+        # Cascade drafts ("<route>_draft"): tried first, escalated to the route's own
+        # model when the quality gate in agent/cascade.py rejects them
+        "psychological_interviews_draft": {
+            "provider": "anthropic",
+            "model": HAIKU_MODEL,
+            "temperature": 0.6,
+            "max_tokens": 5000
+        },
+        "sales_intelligence_interviews_draft": {
+            "provider": "anthropic",
+            "model": HAIKU_MODEL,
+            "temperature": 0.6,
+            "max_tokens": 5000
+        },
+        "campaign_synthesis_draft": {
+            "provider": "anthropic",
+            "model": HAIKU_MODEL,
+            "temperature": 0.6,
+            "max_tokens": 4000
+        },
+    }
+    
+    @staticmethod
+    def resolve_route(route: str, tier: str = None) -> Dict[str, Any]:
+        """Settings for a route: the table entry, then the tier's adjustments, then MODEL_ROUTES env overrides"""
+        tier = tier or DEFAULT_RESEARCH_TIER
+        settings = dict(ResearchConfig.MODEL_ROUTES.get(route, ResearchConfig.MODEL_ROUTES["default"]))
+        settings.update(RESEARCH_TIERS[tier]["routes"].get(route, {}))
+        settings.update(MODEL_ROUTE_OVERRIDES.get(route, {}))
+        settings.update(MODEL_ROUTE_OVERRIDES.get(f"{tier}:{route}", {}))
+        return settings
+    
+    @staticmethod
+    def get_llm(route: str, tier: str = None):
+        """Client for a node's route - clients are cached and shared"""
+        return llm_registry.get(route, **ResearchConfig.resolve_route(route, tier))
 
 def extract_industry(business_context: str) -> str:
     """Extract industry from business context for learning patterns"""
@@ -198,158 +287,142 @@ def extract_industry(business_context: str) -> str:
     else:
         return 'general'
 
-def competitor_discovery_agent(state: Level10ResearchState) -> Level10ResearchState:
-    """Agent 3: Competitor Discovery & Strategic Intelligence"""
-    print("🔍 Agent 3: Competitor Discovery & Strategic Intelligence...")
-    start_time = time.time()
+def build_competitor_search_queries(business_context: str) -> List[str]:
+    """Competitor search queries - depend only on the business context, never on LLM output"""
+    industry = extract_industry(business_context)
+    words = business_context.split()
+    
+    return [
+        f"{industry} companies competitors",
+        f"{words[0] if words else ''} {words[1] if len(words) > 1 else ''} industry leaders",
+        f"top {industry} businesses marketing strategies",
+        f"{industry} market leaders positioning"
+    ]
+
+async def run_competitor_searches(business_context: str) -> str:
+    """Run all competitor search queries concurrently and combine the formatted results"""
+    all_search_results = await search_client.search_many(
+        build_competitor_search_queries(business_context), num_results=5
+    )
+    
+    return "\n\n".join(all_search_results)
+
+async def prefetch_competitor_search(state: Level10ResearchState) -> Dict[str, Any]:
+    """Search prefetch: runs alongside dual analysis so search latency is off the critical path"""
+    logger.info("🌐 Prefetching competitor search results...")
+    
+    failure = {}
+    try:
+        combined_search_data = await run_competitor_searches(state["business_context"])
+    except Exception as e:
+        logger.exception(f"❌ Error in prefetch_competitor_search: {str(e)}")
+        combined_search_data = f"Error searching web: {str(e)}"
+        failure = node_failure("competitor_search", e)
+    
+    elapsed = span_elapsed()
+    logger.info(f"✅ Competitor search prefetch completed ({elapsed:.1f}s)")
+    
+    return {
+        "competitor_search_results": combined_search_data,
+        "processing_times": {"competitor_search": elapsed},
+        **failure
+    }
+
+async def competitor_discovery_agent(state: Level10ResearchState) -> Dict[str, Any]:
+    """Agent 3: Competitor Discovery & Strategic Intelligence
+
+    Runs in parallel with the conversion and interview agents, so it returns only the keys it owns.
+    """
+    logger.info("🔍 Agent 3: Competitor Discovery & Strategic Intelligence...")
     
     try:
-        # Extract industry and business type for competitor search
         business_context = state["business_context"]
-        industry = extract_industry(business_context)
-        
-        # Generate competitor search queries
-        search_queries = [
-            f"{industry} companies competitors",
-            f"{business_context.split()[0]} {business_context.split()[1] if len(business_context.split()) > 1 else ''} industry leaders",
-            f"top {industry} businesses marketing strategies",
-            f"{industry} market leaders positioning"
-        ]
         
-        # Perform web searches
-        all_search_results = []
-        for query in search_queries:
-            search_result = web_search(query, num_results=5)
-            all_search_results.append(search_result)
-        
-        # Combine all search results
-        combined_search_data = "\n\n".join(all_search_results)
+        # Consume prefetched search results; only search inline if the prefetch stage didn't run
+        combined_search_data = state.get("competitor_search_results")
+        if not combined_search_data:
+            combined_search_data = await run_competitor_searches(business_context)
 
-        print(f"🔍 DEBUG: Combined search data length: {len(combined_search_data)} chars")
-        print(f"🔍 DEBUG: First 500 chars of search data: {combined_search_data[:500]}")
+        logger.debug(f"Competitor search data: {len(combined_search_data)} chars")
         
         # Use LLM to analyze competitor intelligence
-        llm = ResearchConfig.get_llm("conversion_intelligence")
-        
-        competitor_prompt = f"""
-BUSINESS CONTEXT:
-{business_context}
-
-PSYCHOLOGICAL INSIGHTS FOR COMPETITIVE ANALYSIS:
-{state.get('psychological_analysis', 'Not available')}
-
-WEB SEARCH RESULTS:
-{combined_search_data}
-
-COMPETITOR DISCOVERY & STRATEGIC INTELLIGENCE ANALYSIS
-
-**OBJECTIVE**: Identify key competitors and analyze their positioning, messaging, and strategic gaps using the psychological insights about our target customers.
-
-**ANALYSIS FRAMEWORK**:
-
-## PART A: COMPETITOR IDENTIFICATION & LANDSCAPE MAPPING
-
-### 1. Direct Competitors
-- Companies offering similar solutions to the same target market
-- Analyze their positioning, messaging, and value propositions
-- Identify market share and competitive strength
-
-### 2. Indirect Competitors  
-- Alternative solutions customers might consider
-- Different approaches to solving the same core problems
-- Substitute products or services
-
-### 3. Competitive Landscape Overview
-- Market positioning map showing where competitors sit
-- Identify crowded vs. uncrowded market spaces
-- Analyze competitive intensity in different segments
-
-## PART B: COMPETITOR MESSAGING & POSITIONING ANALYSIS
-
-### 1. Common Messaging Patterns
-- What themes and angles are competitors using?
-- What value propositions are most common?
-- How do they position against customer pain points?
-
-### 2. Positioning Gaps Analysis
-Using the psychological insights, identify:
-- What customer psychology are competitors missing?
-- Which emotional triggers are they not addressing?
-- What identity transformation opportunities are they ignoring?
-- Which unconscious beliefs are they not targeting?
-
-### 3. Messaging Weaknesses
-- Generic messaging that doesn't resonate deeply
-- Logical arguments that miss emotional drivers
-- Surface-level benefits vs. deeper psychological needs
-- Missed opportunities for identity-based positioning
-
-## PART C: STRATEGIC OPPORTUNITY IDENTIFICATION
-
-### 1. Psychological Positioning Gaps
-Based on customer psychology analysis:
-- What psychological angles are competitors missing?
-- Which identity transformation opportunities are untapped?
-- What unconscious motivations are they not addressing?
-- Which emotional triggers could create competitive advantage?
-
-### 2. Market Positioning Opportunities
-- Underserved customer segments or use cases
-- Unoccupied positioning territories
-- Differentiation opportunities based on psychological insights
-- Blue ocean opportunities in crowded markets
-
-### 3. "World Domination" Strategy Elements
-- Unique psychological positioning that competitors can't copy
-- Identity-based differentiation that creates customer loyalty
-- Emotional moats that make switching psychologically difficult
-- Messaging that hits deeper than competitors' surface-level benefits
-
-## PART D: COMPETITIVE INTELLIGENCE SYNTHESIS
-
-### 1. Competitor Strengths & Weaknesses
-- What are competitors doing well?
-- Where are their strategic vulnerabilities?
-- What resources and capabilities do they have?
-- Where are they vulnerable to disruption?
-
-### 2. Strategic Recommendations
-- How to position against identified competitors
-- What messaging will cut through competitive noise
-- Which psychological angles will create unbeatable advantage
-- How to build competitive moats using customer psychology
-
-### 3. Immediate Tactical Opportunities
-- Quick wins in positioning and messaging
-- Underutilized channels or approaches
-- Competitive gaps that can be exploited immediately
-- Psychological triggers that can be activated for rapid differentiation
-
-**DELIVERABLE REQUIREMENTS**:
-- Identify 5-10 key competitors with analysis
-- Map competitive landscape and positioning gaps
-- Provide specific psychological positioning opportunities
-- Deliver actionable "world domination" strategy recommendations
-- Include specific messaging angles that exploit competitive weaknesses
-
-**ANALYSIS DEPTH**: Minimum 2,000 words of substantive competitive intelligence with psychological strategy integration.
-
-Generate comprehensive competitor intelligence that reveals strategic opportunities for unbeatable market positioning.
-"""
+        llm = ResearchConfig.get_llm("competitor_analysis", state.get("research_tier"))
         
-        result = llm.invoke(competitor_prompt)
-        state["competitor_analysis"] = result.content
-        state["processing_times"]["competitor_analysis"] = time.time() - start_time
+        inputs, budget_report = token_budget.fit("competitor_discovery", {
+            "business_context": business_context,
+            "psychological_analysis": state.get("psychological_analysis") or "Not available",
+            "search_results": combined_search_data
+        }, state.get("execution_plan"))
+        competitor_prompt = build_prompt(ResearchPrompts.get_competitor_intelligence(), **inputs)
         
-        print(f"✅ Competitor Discovery completed ({state['processing_times']['competitor_analysis']:.1f}s)")
+        result = await call_llm("competitor_analysis", llm, competitor_prompt)
+        elapsed = span_elapsed()
+        
+        logger.info(f"✅ Competitor Discovery completed ({elapsed:.1f}s)")
+        
+        return with_digest({
+            "competitor_analysis": result.content,
+            "processing_times": {"competitor_analysis": elapsed},
+            **record_llm_call("competitor_analysis", llm, result, elapsed),
+            "prompt_budget": {"competitor_discovery": budget_report}
+        }, await build_digest(state, "competitor_analysis", result.content))
         
     except Exception as e:
-        print(f"❌ Error in competitor_discovery_agent: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
-        state["competitor_analysis"] = f"Error in competitor analysis: {str(e)}"
-        state["processing_times"]["competitor_analysis"] = time.time() - start_time
+        logger.exception(f"❌ Error in competitor_discovery_agent: {str(e)}")
+        return {
+            "competitor_analysis": f"Error in competitor analysis: {str(e)}",
+            "processing_times": {"competitor_analysis": span_elapsed()},
+            **node_failure("competitor_discovery", e)
+        }
+
+# Nodes whose prompts read upstream digests - the agents running alongside the
+# psychological digest take the full analysis instead
+DIGEST_CONSUMERS = ("campaign_synthesis",)
+
+def digest_consumer_planned(state: Level10ResearchState) -> bool:
+    """Whether this run's plan includes a node that reads digests"""
+    plan = state.get("execution_plan") or RESEARCH_TIERS[state.get("research_tier") or DEFAULT_RESEARCH_TIER]["nodes"]
+    return any(node in plan for node in DIGEST_CONSUMERS)
+
+async def build_digest(state: Level10ResearchState, key: str, text: str) -> Dict[str, Any]:
+    """Partial update carrying a structured digest of one agent's report
+
+    Returns an empty update when digests are disabled, no planned node reads them, the
+    report is an error, or the digest can't be parsed - consumers then get the full text.
+    """
+    if not digests_enabled() or not digest_consumer_planned(state) or not text or text.startswith("Error"):
+        return {}
     
-    return state
+    try:
+        with tracer.span(f"digest:{key}", kind="digest") as span:
+            llm = ResearchConfig.get_llm("digest", state.get("research_tier"))
+            prompt = build_prompt(
+                ResearchPrompts.get_output_digest(),
+                source_name=key.replace("_", " "),
+                source_text=text
+            )
+            result = await call_llm(f"{key}_digest", llm, prompt)
+            digest = parse_digest(result.content)
+    except Exception as e:
+        logger.warning(f"⚠️ Digest of {key} failed, downstream agents get the full text: {str(e)}")
+        return {}
+    
+    if digest is None:
+        logger.warning(f"⚠️ Digest of {key} was not valid JSON, downstream agents get the full text")
+        return {}
+    
+    elapsed = span.duration
+    return {
+        "digests": {key: digest},
+        "processing_times": {f"{key}_digest": elapsed},
+        **record_llm_call(f"{key}_digest", llm, result, elapsed)
+    }
+
+def with_digest(update: Dict[str, Any], digest_update: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold a digest update into an agent's partial update, merging the dict-valued keys"""
+    for key, value in digest_update.items():
+        update[key] = {**update.get(key, {}), **value}
+    return update
 
 def set_research_goal(state: Level10ResearchState) -> Level10ResearchState:
     """Initialize research with goal setting and memory context"""
@@ -363,54 +436,101 @@ def set_research_goal(state: Level10ResearchState) -> Level10ResearchState:
     state["session_id"] = f"research_{int(time.time())}"
     state["memory_context"] = learning_context
     state["processing_times"] = {}  # Initialize processing times
+    state["prompt_cache_usage"] = {}
+    state["llm_usage"] = {}
+    state["model_routes"] = {}
+    state["model_cascade"] = {}
+    state["digests"] = {}
+    state["prompt_budget"] = {}
     
-    print(f"🎯 Research Goal: Enhanced 6-Agent Intelligence System")
-    print(f"🏭 Industry Context: {industry}")
-    print(f"📚 Memory Context: {len(learning_context.get('industry_specific_patterns', {}))} similar research sessions")
-    print(f"💡 Optimization Suggestions: {len(learning_context.get('proven_techniques', []))} suggestions")
+    tier = state.get("research_tier") or DEFAULT_RESEARCH_TIER
+    logger.info(f"🎯 Research Goal: Enhanced 6-Agent Intelligence System ({tier} tier, "
+                f"target {RESEARCH_TIERS[tier]['latency_target_seconds']}s)")
+    logger.info(f"🏭 Industry Context: {industry}")
+    logger.info(f"📚 Memory Context: {len(learning_context.get('industry_specific_patterns', {}))} similar research sessions")
+    logger.info(f"💡 Optimization Suggestions: {len(learning_context.get('proven_techniques', []))} suggestions")
     
     return state
 
-def conduct_dual_analysis_research(state: Level10ResearchState) -> Level10ResearchState:
-    """Agent 1 & 2: Dual analysis - Deep psychological + conversion intelligence"""
+async def conduct_psychological_analysis(state: Level10ResearchState) -> Dict[str, Any]:
+    """Agent 1: Deep psychological intelligence analysis
+
+    Runs alongside the search prefetch stage, so it returns only the keys it owns.
+    """
     
-    print("🧠 Agent 1: Deep Psychological Intelligence Analysis...")
-    start_time = time.time()
+    logger.info("🧠 Agent 1: Deep Psychological Intelligence Analysis...")
     
     try:
-        # First pass: Pure psychological depth
-        psychological_llm = ResearchConfig.get_llm("deep_psychological")
-        
-        psych_prompt = ResearchPrompts.get_deep_psychological_research().format(
-            business_context=state["business_context"],
-            learning_context=json.dumps(state["memory_context"].get("framework_best_practices", {}), indent=2),
-            industry_patterns=json.dumps(state["memory_context"].get("industry_specific_patterns", {}), indent=2)
-        )
-        
-        psychological_result = psychological_llm.invoke(psych_prompt)
-        state["psychological_analysis"] = psychological_result.content
-        state["processing_times"]["psychological_analysis"] = time.time() - start_time
-        
-        print("🎯 Agent 2: Conversion Intelligence Analysis...")
-        start_time = time.time()
-        
-        # Second pass: Conversion intelligence using psychological insights
-        conversion_llm = ResearchConfig.get_llm("conversion_intelligence")
-        
-        conversion_prompt = ResearchPrompts.get_conversion_intelligence_research().format(
-            psychological_analysis=psychological_result.content,
-            business_context=state["business_context"]
-        )
-        
-        conversion_result = conversion_llm.invoke(conversion_prompt)
-        state["conversion_intelligence"] = conversion_result.content
-        state["processing_times"]["conversion_intelligence"] = time.time() - start_time
+        # Pure psychological depth
+        psychological_llm = ResearchConfig.get_llm("psychological_analysis", state.get("research_tier"))
+        
+        inputs, budget_report = token_budget.fit("psych_analysis_agent", {
+            "business_context": state["business_context"],
+            "learning_context": json.dumps(state["memory_context"].get("framework_best_practices", {}), indent=2),
+            "industry_patterns": json.dumps(state["memory_context"].get("industry_specific_patterns", {}), indent=2)
+        }, state.get("execution_plan"))
+        psych_prompt = build_prompt(ResearchPrompts.get_deep_psychological_research(), **inputs)
+        
+        psychological_result = await call_llm("psychological_analysis", psychological_llm, psych_prompt)
+        elapsed = span_elapsed()
+        
+        logger.info(f"✅ Psychological analysis completed ({elapsed:.1f}s, Session: {state['session_id']})")
+        
+        # The digest is built by its own node, alongside the agents that read the full analysis
+        return {
+            "psychological_analysis": psychological_result.content,
+            "processing_times": {"psychological_analysis": elapsed},
+            **record_llm_call("psychological_analysis", psychological_llm, psychological_result, elapsed),
+            "prompt_budget": {"psychological_analysis": budget_report}
+        }
         
-        # Store combined analysis for backward compatibility
-        state["icp_analysis"] = f"""
+    except Exception as e:
+        logger.exception(f"❌ Error in conduct_psychological_analysis: {str(e)}")
+        return {
+            "psychological_analysis": f"Error in psychological analysis: {str(e)}",
+            "processing_times": {"psychological_analysis": span_elapsed()},
+            **node_failure("psych_analysis_agent", e)
+        }
+
+async def psychological_digest_node(state: Level10ResearchState) -> Dict[str, Any]:
+    """Digest of the psychological analysis for campaign synthesis
+
+    Runs in parallel with Agents 2-5, so it adds no round-trip before them.
+    """
+    return await build_digest(state, "psychological_analysis", state.get("psychological_analysis", ""))
+
+async def conduct_conversion_intelligence(state: Level10ResearchState) -> Dict[str, Any]:
+    """Agent 2: Conversion intelligence using the psychological insights
+
+    Runs in parallel with the competitor and interview agents, so it returns only the keys it owns.
+    """
+    
+    logger.info("🎯 Agent 2: Conversion Intelligence Analysis...")
+    
+    try:
+        conversion_llm = ResearchConfig.get_llm("conversion_intelligence", state.get("research_tier"))
+        
+        inputs, budget_report = token_budget.fit("conversion_agent", {
+            "psychological_analysis": state.get("psychological_analysis", ""),
+            "business_context": state["business_context"]
+        }, state.get("execution_plan"))
+        conversion_prompt = build_prompt(ResearchPrompts.get_conversion_intelligence_research(), **inputs)
+        
+        conversion_result = await call_llm("conversion_intelligence", conversion_llm, conversion_prompt)
+        elapsed = span_elapsed()
+        
+        logger.info(f"✅ Conversion intelligence completed ({elapsed:.1f}s)")
+        
+        return with_digest({
+            "conversion_intelligence": conversion_result.content,
+            "processing_times": {"conversion_intelligence": elapsed},
+            **record_llm_call("conversion_intelligence", conversion_llm, conversion_result, elapsed),
+            "prompt_budget": {"conversion_intelligence": budget_report},
+            # Store combined analysis for backward compatibility
+            "icp_analysis": f"""
 # DEEP PSYCHOLOGICAL INTELLIGENCE ANALYSIS
 
-{psychological_result.content}
+{state["psychological_analysis"]}
 
 ---
 
@@ -418,114 +538,144 @@ def conduct_dual_analysis_research(state: Level10ResearchState) -> Level10Resear
 
 {conversion_result.content}
 """
-        
-        print(f"✅ Dual analysis completed (Session: {state['session_id']})")
+        }, await build_digest(state, "conversion_intelligence", conversion_result.content))
         
     except Exception as e:
-        print(f"❌ Error in conduct_dual_analysis_research: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
-        state["psychological_analysis"] = f"Error in psychological analysis: {str(e)}"
-        state["conversion_intelligence"] = f"Error in conversion intelligence: {str(e)}"
-        
-    return state
+        logger.exception(f"❌ Error in conduct_conversion_intelligence: {str(e)}")
+        return {
+            "conversion_intelligence": f"Error in conversion intelligence: {str(e)}",
+            "processing_times": {"conversion_intelligence": span_elapsed()},
+            **node_failure("conversion_agent", e)
+        }
 
-def psychological_interview_agent(state: Level10ResearchState) -> Level10ResearchState:
-    """Agent 4: Enhanced psychological interview agent - emotional depth and authenticity"""
-    print("🎭 Agent 4: Psychological Interview Analysis...")
-    start_time = time.time()
+async def psychological_interview_agent(state: Level10ResearchState) -> Dict[str, Any]:
+    """Agent 4: Enhanced psychological interview agent - emotional depth and authenticity
+
+    Runs as a parallel branch alongside Agent 5, so it returns only the keys it owns.
+    """
+    logger.info("🎭 Agent 4: Psychological Interview Analysis...")
     
     try:
-        llm = ResearchConfig.get_llm("creative_interviews")
-        
         # Check if the method exists
         if not hasattr(ResearchPrompts, 'get_psychological_interviews'):
-            print("❌ Error: get_psychological_interviews method not found in ResearchPrompts")
-            print("Available methods:", [method for method in dir(ResearchPrompts) if not method.startswith('_')])
-            state["psychological_interviews"] = "Error: get_psychological_interviews method not found"
-            state["processing_times"]["psychological_interviews"] = time.time() - start_time
-            return state
-        
-        # Get the prompt - the method expects a single argument
-        prompt = ResearchPrompts.get_psychological_interviews(
-            state["psychological_analysis"]  # Pass just the analysis, not as a dict
+            logger.error("❌ Error: get_psychological_interviews method not found in ResearchPrompts")
+            logger.error(f"Available methods: {[method for method in dir(ResearchPrompts) if not method.startswith('_')]}")
+            return {
+                "psychological_interviews": "Error: get_psychological_interviews method not found",
+                "processing_times": {"psychological_interviews": span_elapsed()},
+                **node_failure("psych_interview_agent", "get_psychological_interviews method not found")
+            }
+        
+        inputs, budget_report = token_budget.fit("psych_interview_agent", {
+            "psychological_analysis": state.get("psychological_analysis", "")
+        }, state.get("execution_plan"))
+        
+        # Render with a placeholder so the static instructions can be sent as a cached prefix
+        prompt = build_prompt(ResearchPrompts.get_psychological_interviews("{psychological_analysis}"), **inputs)
+        
+        llm, result, cascade_update = await call_llm_cascade(
+            "psychological_interviews", state.get("research_tier"), prompt
         )
+        elapsed = span_elapsed()
         
-        result = llm.invoke(prompt)
-        state["psychological_interviews"] = result.content
-        state["processing_times"]["psychological_interviews"] = time.time() - start_time
+        logger.info(f"✅ Psychological Interviews completed ({elapsed:.1f}s)")
         
-        print(f"✅ Psychological Interviews completed ({state['processing_times']['psychological_interviews']:.1f}s)")
+        return with_digest({
+            "psychological_interviews": result.content,
+            "processing_times": {"psychological_interviews": elapsed},
+            **merge_updates(cascade_update, record_llm_call("psychological_interviews", llm, result, elapsed)),
+            "prompt_budget": {"psychological_interviews": budget_report}
+        }, await build_digest(state, "psychological_interviews", result.content))
         
     except Exception as e:
-        print(f"❌ Error in psychological_interview_agent: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
-        state["psychological_interviews"] = f"Error in psychological interviews: {str(e)}"
-        state["processing_times"]["psychological_interviews"] = time.time() - start_time
-    
-    return state
+        logger.exception(f"❌ Error in psychological_interview_agent: {str(e)}")
+        return {
+            "psychological_interviews": f"Error in psychological interviews: {str(e)}",
+            "processing_times": {"psychological_interviews": span_elapsed()},
+            **node_failure("psych_interview_agent", e)
+        }
 
-def sales_intelligence_interview_agent(state: Level10ResearchState) -> Level10ResearchState:
-    """Agent 5: Sales intelligence interview agent - buying psychology and conversion insights"""
-    print("💰 Agent 5: Sales Intelligence Interview Analysis...")
-    start_time = time.time()
+async def sales_intelligence_interview_agent(state: Level10ResearchState) -> Dict[str, Any]:
+    """Agent 5: Sales intelligence interview agent - buying psychology and conversion insights
+
+    Runs as a parallel branch alongside Agent 4, so it returns only the keys it owns.
+    """
+    logger.info("💰 Agent 5: Sales Intelligence Interview Analysis...")
     
     try:
-        llm = ResearchConfig.get_llm("creative_interviews")
-        
         # Check if the method exists
         if not hasattr(ResearchPrompts, 'get_sales_intelligence_interviews'):
-            print("❌ Error: get_sales_intelligence_interviews method not found in ResearchPrompts")
-            print("Available methods:", [method for method in dir(ResearchPrompts) if not method.startswith('_')])
-            state["sales_intelligence_interviews"] = "Error: get_sales_intelligence_interviews method not found"
-            state["processing_times"]["sales_intelligence_interviews"] = time.time() - start_time
-            return state
-        
-        # Get the prompt - the method expects a single argument
-        prompt = ResearchPrompts.get_sales_intelligence_interviews(
-            state["psychological_analysis"]  # Pass just the analysis, not as a dict
+            logger.error("❌ Error: get_sales_intelligence_interviews method not found in ResearchPrompts")
+            logger.error(f"Available methods: {[method for method in dir(ResearchPrompts) if not method.startswith('_')]}")
+            return {
+                "sales_intelligence_interviews": "Error: get_sales_intelligence_interviews method not found",
+                "processing_times": {"sales_intelligence_interviews": span_elapsed()},
+                **node_failure("sales_interview_agent", "get_sales_intelligence_interviews method not found")
+            }
+        
+        inputs, budget_report = token_budget.fit("sales_interview_agent", {
+            "psychological_analysis": state.get("psychological_analysis", "")
+        }, state.get("execution_plan"))
+        
+        # Render with a placeholder so the static instructions can be sent as a cached prefix
+        prompt = build_prompt(ResearchPrompts.get_sales_intelligence_interviews("{psychological_analysis}"), **inputs)
+        
+        llm, result, cascade_update = await call_llm_cascade(
+            "sales_intelligence_interviews", state.get("research_tier"), prompt
         )
+        elapsed = span_elapsed()
         
-        result = llm.invoke(prompt)
-        state["sales_intelligence_interviews"] = result.content
-        state["processing_times"]["sales_intelligence_interviews"] = time.time() - start_time
+        logger.info(f"✅ Sales Intelligence Interviews completed ({elapsed:.1f}s)")
         
-        print(f"✅ Sales Intelligence Interviews completed ({state['processing_times']['sales_intelligence_interviews']:.1f}s)")
+        return with_digest({
+            "sales_intelligence_interviews": result.content,
+            "processing_times": {"sales_intelligence_interviews": elapsed},
+            **merge_updates(cascade_update, record_llm_call("sales_intelligence_interviews", llm, result, elapsed)),
+            "prompt_budget": {"sales_intelligence_interviews": budget_report}
+        }, await build_digest(state, "sales_intelligence_interviews", result.content))
         
     except Exception as e:
-        print(f"❌ Error in sales_intelligence_interview_agent: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
-        state["sales_intelligence_interviews"] = f"Error in sales intelligence interviews: {str(e)}"
-        state["processing_times"]["sales_intelligence_interviews"] = time.time() - start_time
-    
-    return state
+        logger.exception(f"❌ Error in sales_intelligence_interview_agent: {str(e)}")
+        return {
+            "sales_intelligence_interviews": f"Error in sales intelligence interviews: {str(e)}",
+            "processing_times": {"sales_intelligence_interviews": span_elapsed()},
+            **node_failure("sales_interview_agent", e)
+        }
 
-def synthesize_campaign_intelligence(state: Level10ResearchState) -> Level10ResearchState:
+async def synthesize_campaign_intelligence(state: Level10ResearchState) -> Level10ResearchState:
     """Agent 6: Campaign synthesis combining all intelligence"""
     
-    print("🚀 Agent 6: Synthesizing Campaign Intelligence...")
-    start_time = time.time()
+    logger.info("🚀 Agent 6: Synthesizing Campaign Intelligence...")
     
     try:
-        # Get synthesis LLM
-        llm = ResearchConfig.get_llm("synthesis")
-        
-        # Enhanced synthesis using all previous analysis including competitor intelligence
-        prompt = ResearchPrompts.get_campaign_synthesis().format(
-            psychological_analysis=state.get("psychological_analysis", ""),
-            conversion_intelligence=state.get("conversion_intelligence", ""),
-            interview_insights=state.get("psychological_interviews", "") + "\n\n" + state.get("sales_intelligence_interviews", "")
-        )
+        inputs, budget_report = token_budget.fit("campaign_synthesis", {
+            "psychological_analysis": upstream_input(state, "psychological_analysis"),
+            "conversion_intelligence": upstream_input(state, "conversion_intelligence"),
+            "interview_insights": upstream_input(state, "psychological_interviews") + "\n\n" + upstream_input(state, "sales_intelligence_interviews"),
+            "competitor_intelligence": upstream_input(state, "competitor_analysis")
+        }, state.get("execution_plan"))
+        state["prompt_budget"]["campaign_synthesis"] = budget_report
         
         # Add competitor intelligence to the prompt if available
-        if state.get("competitor_analysis"):
-            enhanced_prompt = prompt + f"\n\nCOMPETITOR INTELLIGENCE:\n{state['competitor_analysis']}"
-        else:
-            enhanced_prompt = prompt
+        competitor_intelligence = inputs.pop("competitor_intelligence")
+        competitor_appendix = ""
+        if competitor_intelligence:
+            competitor_appendix = f"\n\nCOMPETITOR INTELLIGENCE:\n{competitor_intelligence}"
         
-        result = llm.invoke(enhanced_prompt)
+        # Enhanced synthesis using all previous analysis (as digests) including competitor intelligence
+        enhanced_prompt = build_prompt(ResearchPrompts.get_campaign_synthesis(), appendix=competitor_appendix, **inputs)
+        
+        llm, result, cascade_update = await call_llm_cascade(
+            "campaign_synthesis", state.get("research_tier"), enhanced_prompt
+        )
         
         state["synthesis_results"] = result.content
-        state["processing_times"]["campaign_synthesis"] = time.time() - start_time
+        state["processing_times"]["campaign_synthesis"] = span_elapsed()
+        for key, value in merge_updates(
+            cascade_update,
+            record_llm_call("campaign_synthesis", llm, result, state["processing_times"]["campaign_synthesis"])
+        ).items():
+            state.setdefault(key, {}).update(value)
         
         # Set legacy field for backward compatibility
         state["interview_insights"] = state.get("psychological_interviews", "")
@@ -537,20 +687,79 @@ def synthesize_campaign_intelligence(state: Level10ResearchState) -> Level10Rese
         state["quality_score"] = calculate_enhanced_quality_score(state)
         state["confidence_score"] = calculate_confidence_score(state)
         
-        print(f"✅ Campaign synthesis completed (Quality: {state['quality_score']:.1%})")
+        logger.info(f"✅ Campaign synthesis completed (Quality: {state['quality_score']:.1%})")
         
     except Exception as e:
-        print(f"❌ Error in synthesize_campaign_intelligence: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Error in synthesize_campaign_intelligence: {str(e)}")
         state["synthesis_results"] = f"Error in campaign synthesis: {str(e)}"
-        state["processing_times"]["campaign_synthesis"] = time.time() - start_time
+        state["processing_times"]["campaign_synthesis"] = span_elapsed()
+        state.update(node_failure("campaign_synthesis", e))
     
     return state
 
+# Section headings the express prompt asks for -> state keys they fill
+EXPRESS_SECTIONS = {
+    "PSYCHOLOGICAL ANALYSIS": "psychological_analysis",
+    "CONVERSION INTELLIGENCE": "conversion_intelligence",
+    "CAMPAIGN SYNTHESIS": "synthesis_results",
+}
+
+def split_express_sections(text: str) -> Dict[str, str]:
+    """Split the express response into its sections - unmatched output lands in synthesis"""
+    pattern = r"^#+\s*(" + "|".join(EXPRESS_SECTIONS) + r")\s*$"
+    parts = re.split(pattern, text, flags=re.MULTILINE | re.IGNORECASE)
+    
+    sections = {key: "" for key in EXPRESS_SECTIONS.values()}
+    for heading, body in zip(parts[1::2], parts[2::2]):
+        sections[EXPRESS_SECTIONS[heading.upper()]] = body.strip()
+    if not any(sections.values()):
+        sections["synthesis_results"] = text.strip()
+    return sections
+
+async def express_research_agent(state: Level10ResearchState) -> Dict[str, Any]:
+    """Express tier: psychology, conversion and campaign synthesis from a single LLM call"""
+    
+    logger.info("⚡ Express Agent: Single-pass market intelligence...")
+    
+    try:
+        llm = ResearchConfig.get_llm("express_research", state.get("research_tier"))
+        
+        inputs, budget_report = token_budget.fit("express_research", {
+            "business_context": state["business_context"],
+            "industry_patterns": json.dumps(state["memory_context"].get("industry_specific_patterns", {}), indent=2)
+        }, state.get("execution_plan"))
+        prompt = build_prompt(ResearchPrompts.get_express_research(), **inputs)
+        
+        result = await call_llm("express_research", llm, prompt)
+        elapsed = span_elapsed()
+        
+        sections = split_express_sections(result.content)
+        scored = {**state, **sections}
+        
+        logger.info(f"✅ Express analysis completed ({elapsed:.1f}s)")
+        
+        return {
+            **sections,
+            "voice_of_customer": extract_voc_patterns(scored),
+            "quality_score": calculate_enhanced_quality_score(scored),
+            "confidence_score": calculate_confidence_score(scored),
+            "processing_times": {"express_research": elapsed},
+            **record_llm_call("express_research", llm, result, elapsed),
+            "prompt_budget": {"express_research": budget_report}
+        }
+        
+    except Exception as e:
+        logger.exception(f"❌ Error in express_research_agent: {str(e)}")
+        return {
+            "synthesis_results": f"Error in express research: {str(e)}",
+            "processing_times": {"express_research": span_elapsed()},
+            **node_failure("express_research", e)
+        }
+
 def learn_from_outcome(state: Level10ResearchState) -> Level10ResearchState:
     """Level 10: Learn from research outcome and update memory"""
     
-    print("🧠 Learning from enhanced 6-agent outcome...")
+    logger.info("🧠 Learning from enhanced 6-agent outcome...")
     
     try:
         # Prepare learning experience (no business-specific details)
@@ -576,23 +785,24 @@ def learn_from_outcome(state: Level10ResearchState) -> Level10ResearchState:
         state["learning_insights"] = [
             f"Enhanced 6-agent system effectiveness improved by {learning_insights.get('improvement_rate', 8)}%",
             f"Multi-interview intelligence optimized for {extract_industry(state['business_context'])}",
-            f"Competitive intelligence integration successful",
-            f"Quality optimization patterns identified across all 6 specialized agents"
+            "Competitive intelligence integration successful",
+            "Quality optimization patterns identified across all 6 specialized agents"
         ]
         
-        print(f"💾 Memory saved: {len(learning_system.industry_patterns)} total sessions")
-        print("📈 Learning completed - Enhanced System Session #" + str(len(learning_system.framework_improvements) + 1))
+        logger.info(f"💾 Memory saved: {len(learning_system.industry_patterns)} total sessions")
+        logger.info("📈 Learning completed - Enhanced System Session #" + str(len(learning_system.framework_improvements) + 1))
         
     except Exception as e:
-        print(f"❌ Error in learn_from_outcome: {str(e)}")
+        logger.exception(f"❌ Error in learn_from_outcome: {str(e)}")
         state["learning_insights"] = ["Error in learning process"]
+        state.update(node_failure("learn", e))
     
     return state
 
 def format_outputs(state: Level10ResearchState) -> Level10ResearchState:
     """Format final outputs with enhanced multi-report structure"""
     
-    print("📄 Formatting enhanced 6-agent multi-report output...")
+    logger.info("📄 Formatting enhanced 6-agent multi-report output...")
     
     try:
         # Calculate total processing time
@@ -605,6 +815,7 @@ def format_outputs(state: Level10ResearchState) -> Level10ResearchState:
 **Session ID:** {state.get('session_id', 'N/A')}
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 **Processing Time:** {total_time:.1f} seconds
+**Research Tier:** {state.get('research_tier') or DEFAULT_RESEARCH_TIER}
 **Analysis Type:** Enhanced 6-Agent Intelligence System with Competitive Intelligence
 
 ## 📊 EXECUTIVE SUMMARY
@@ -673,7 +884,20 @@ This comprehensive analysis combines deep psychological intelligence with conver
 ## 📈 ENHANCED SYSTEM PERFORMANCE METRICS
 
 ### Processing Times by Agent:
-{chr(10).join([f"- **{k.replace('_', ' ').title()}:** {v:.1f}s" for k, v in state.get('processing_times', {}).items()])}
+{chr(10).join([f"- **{k.replace('_', ' ').title()}:** {v:.1f}s" + (f" · {state['model_routes'][k]['model']}" if k in state.get('model_routes', {}) else "") for k, v in state.get('processing_times', {}).items()])}
+
+### Model Cascade (fast draft, escalated below the quality gate):
+{chr(10).join([f"- **{k.replace('_', ' ').title()}:** {v['draft_model']} draft scored {v['score']:.2f} · " + ("escalated" if v['escalated'] else "accepted") for k, v in state.get('model_cascade', {}).items()]) or "- No cascaded agents in this run"}
+
+### Prompt Cache Reads by Agent:
+{chr(10).join([f"- **{k.replace('_', ' ').title()}:** {v.get('cache_read_tokens', 0):,} cached / {v.get('input_tokens', 0):,} input tokens" for k, v in state.get('prompt_cache_usage', {}).items()]) or "- No prompt cache data recorded"}
+
+### Token Usage & Cost by Agent:
+{chr(10).join([f"- **{k.replace('_', ' ').title()}:** {v['input_tokens']:,} in / {v['output_tokens']:,} out ({v['cache_read_tokens']:,} cached) · {v['output_tokens_per_second']:.1f} tok/s · ${v['cost_usd']:.4f}" for k, v in state.get('llm_usage', {}).items()]) or "- No token usage recorded"}
+- **Estimated Run Cost:** ${sum(v.get('cost_usd', 0.0) for v in state.get('llm_usage', {}).values()):.4f}
+
+### Prompt Budget Trims:
+{chr(10).join([f"- **{k.replace('_', ' ').title()}:** " + ", ".join(f"{section} -{cut:,}" for section, cut in v['trimmed'].items()) + f" tokens (budget {v['budget']:,})" for k, v in state.get('prompt_budget', {}).items() if v.get('trimmed')]) or "- All prompt inputs fit their budgets"}
 
 ### Quality Indicators:
 - **Overall Quality:** {state.get('quality_score', 0):.1%}
@@ -732,13 +956,13 @@ This comprehensive analysis combines deep psychological intelligence with conver
         # Set the psychology_report for the API endpoint
         state["psychology_report"] = formatted_report
         
-        print("✅ Enhanced 6-agent multi-report formatting completed")
+        logger.info("✅ Enhanced 6-agent multi-report formatting completed")
         
     except Exception as e:
-        print(f"❌ Error in format_outputs: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Error in format_outputs: {str(e)}")
         state["formatted_report"] = f"Error in formatting outputs: {str(e)}"
         state["psychology_report"] = state["formatted_report"]
+        state.update(node_failure("format_outputs", e))
     
     return state
 
@@ -819,40 +1043,143 @@ def calculate_confidence_score(state: Level10ResearchState) -> float:
     
     return min(base_confidence, 0.92)
 
-def create_enhanced_intelligence_workflow():
-    """Create the enhanced 6-agent intelligence workflow"""
+# Node name -> (node callable, upstream nodes it waits for). Edges are derived from this
+# table, so the full workflow and every planned subset share one definition.
+# Node names must differ from Level10ResearchState keys - LangGraph rejects a node named after a channel.
+# LLM and search nodes are native async; the remaining sync nodes run on the dedicated executor.
+WORKFLOW_NODES = {
+    "set_goal": (offload(set_research_goal), []),
+    "psych_analysis_agent": (conduct_psychological_analysis, ["set_goal"]),                # Agent 1
+    "psychological_digest": (psychological_digest_node, ["psych_analysis_agent"]),        # Digest for Agent 6
+    "competitor_search": (prefetch_competitor_search, ["set_goal"]),                       # Search prefetch for Agent 3
+    "conversion_agent": (conduct_conversion_intelligence, ["psych_analysis_agent"]),      # Agent 2
+    "competitor_discovery": (competitor_discovery_agent, ["psych_analysis_agent", "competitor_search"]),  # Agent 3
+    "psych_interview_agent": (psychological_interview_agent, ["psych_analysis_agent"]),  # Agent 4
+    "sales_interview_agent": (sales_intelligence_interview_agent, ["psych_analysis_agent"]),  # Agent 5
+    "campaign_synthesis": (synthesize_campaign_intelligence, [
+        "psychological_digest", "conversion_agent", "competitor_discovery",
+        "psych_interview_agent", "sales_interview_agent"
+    ]),                                                                                  # Agent 6
+    "learn": (offload(learn_from_outcome), ["campaign_synthesis"]),
+    "express_research": (express_research_agent, ["set_goal"]),                         # Express tier only
+    "format_outputs": (offload(format_outputs), ["learn"]),
+}
+
+# research_type tiers - each selects the nodes it may run and adjusts model routes (e.g. max_tokens).
+# Latency targets are end-to-end wall-clock goals for a full (non-targeted) run:
+#   express  ~2 min  - one merged LLM call, no web search or interviews
+#   standard ~5 min  - psychology, conversion, competitors and synthesis at reduced depth
+#   deep     ~10 min - the complete six-agent pipeline at full token budgets
+RESEARCH_TIERS = {
+    "express": {
+        "nodes": ["set_goal", "express_research", "format_outputs"],
+        "routes": {"express_research": {"max_tokens": 4000}},
+        "latency_target_seconds": 120,
+        "description": "Single-pass brief: psychology, conversion angles and a 30-day plan"
+    },
+    "standard": {
+        "nodes": [
+            "set_goal", "psych_analysis_agent", "psychological_digest", "competitor_search",
+            "conversion_agent", "competitor_discovery", "campaign_synthesis", "learn", "format_outputs"
+        ],
+        "routes": {
+            "psychological_analysis": {"max_tokens": 4000},
+            "conversion_intelligence": {"max_tokens": 3000},
+            "competitor_analysis": {"max_tokens": 3000},
+            "campaign_synthesis": {"max_tokens": 3000},
+            "campaign_synthesis_draft": {"max_tokens": 3000}
+        },
+        "latency_target_seconds": 300,
+        "description": "Psychology, conversion, competitor intelligence and synthesis - no interview simulations"
+    },
+    "deep": {
+        "nodes": [name for name in WORKFLOW_NODES if name != "express_research"],
+        "routes": {},
+        "latency_target_seconds": 600,
+        "description": "Full six-agent pipeline including both interview agents"
+    },
+}
+
+DEFAULT_RESEARCH_TIER = "deep"
+
+# Legacy research_type values -> tier
+RESEARCH_TYPE_ALIASES = {"comprehensive": "deep"}
+
+def resolve_research_tier(research_type: str = None) -> str:
+    """Tier name for a request's research_type - unknown values raise ValueError"""
+    if not research_type:
+        return DEFAULT_RESEARCH_TIER
+    tier = RESEARCH_TYPE_ALIASES.get(research_type.lower(), research_type.lower())
+    if tier not in RESEARCH_TIERS:
+        raise ValueError(
+            f"Unknown research_type: {research_type} (expected one of: {', '.join(RESEARCH_TIERS)})"
+        )
+    return tier
+
+def resolve_plan_nodes(nodes: List[str] = None, tier: str = DEFAULT_RESEARCH_TIER) -> List[str]:
+    """Close a node selection over its upstream dependencies, in workflow order
+
+    Only nodes in the tier are considered - dependencies outside it are skipped.
+    set_goal and format_outputs are always part of a plan; learn only runs when the
+    plan reaches campaign_synthesis. None selects the tier's full workflow.
+    """
+    available = RESEARCH_TIERS[tier]["nodes"]
+    if nodes is None:
+        return list(available)
+    
+    selected = set()
+    pending = list(nodes) + ["set_goal"]
+    while pending:
+        name = pending.pop()
+        if name in selected:
+            continue
+        if name not in available:
+            raise ValueError(f"Workflow node {name} is not part of the {tier} tier")
+        selected.add(name)
+        if name != "format_outputs":
+            pending.extend(dep for dep in WORKFLOW_NODES[name][1] if dep in available)
     
-    print("🏗️ Building Enhanced 6-Agent Intelligence Graph...")
+    if "campaign_synthesis" in selected:
+        selected.add("learn")
+    selected.add("format_outputs")
     
+    return [name for name in available if name in selected]
+
+def create_enhanced_intelligence_workflow(checkpointer=None, nodes: List[str] = None,
+                                          tier: str = DEFAULT_RESEARCH_TIER):
+    """Create the enhanced 6-agent intelligence workflow
+
+    Pass a checkpointer to persist state after every node so failed or interrupted
+    runs can resume from the last completed node (requires a thread_id per run).
+    Pass nodes to build only those nodes plus what they depend on, and tier to
+    restrict the graph to a research tier's node set.
+    """
+    
+    logger.info("🏗️ Building Enhanced 6-Agent Intelligence Graph...")
+    
+    selected = resolve_plan_nodes(nodes, tier)
     workflow = StateGraph(Level10ResearchState)
     
-    # Enhanced 6-agent workflow
-    workflow.add_node("set_goal", set_research_goal)
-    workflow.add_node("dual_analysis", conduct_dual_analysis_research)        # Agents 1 & 2
-    workflow.add_node("competitor_discovery", competitor_discovery_agent)     # Agent 3 (NEW)
-    workflow.add_node("psychological_interviews", psychological_interview_agent)     # Agent 4
-    workflow.add_node("sales_intelligence_interviews", sales_intelligence_interview_agent)  # Agent 5
-    workflow.add_node("campaign_synthesis", synthesize_campaign_intelligence)       # Agent 6
-    workflow.add_node("learn", learn_from_outcome)
-    workflow.add_node("format_outputs", format_outputs)
-    
-    # Enhanced workflow sequence
+    for name in selected:
+        workflow.add_node(name, trace_node(name, quota_scope(WORKFLOW_NODES[name][0])))
+    
+    # Every node waits for all of its upstream nodes, so independent agents run in parallel
     workflow.set_entry_point("set_goal")
-    workflow.add_edge("set_goal", "dual_analysis")
-    workflow.add_edge("dual_analysis", "competitor_discovery")  # NEW
-    workflow.add_edge("competitor_discovery", "psychological_interviews")  # UPDATED
-    workflow.add_edge("psychological_interviews", "sales_intelligence_interviews")
-    workflow.add_edge("sales_intelligence_interviews", "campaign_synthesis")
-    workflow.add_edge("campaign_synthesis", "learn")
-    workflow.add_edge("learn", "format_outputs")
+    for name in selected[1:]:
+        upstream = [dep for dep in WORKFLOW_NODES[name][1] if dep in selected]
+        if name == "format_outputs" and not upstream:
+            # Partial plans without learn: format once every terminal node has finished
+            depended_on = {dep for node in selected for dep in WORKFLOW_NODES[node][1]}
+            upstream = [node for node in selected if node not in depended_on and node != "format_outputs"]
+        workflow.add_edge(upstream[0] if len(upstream) == 1 else upstream, name)
     workflow.add_edge("format_outputs", END)
     
-    print("✅ Enhanced 6-Agent Intelligence Graph created successfully")
-    print("🔄 Workflow: Goal → Dual Analysis → Competitor Discovery → Psych Interviews → Sales Interviews → Synthesis → Learn → Output")
+    logger.info("✅ Enhanced 6-Agent Intelligence Graph created successfully")
+    logger.info(f"🔄 Workflow: {' → '.join(selected)}")
     
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
-# Create the enhanced intelligence graph instance
+# Create the enhanced intelligence graph instance (the API builds a checkpointed one at startup)
 graph = create_enhanced_intelligence_workflow()
 
 # Test function for quality validation
@@ -869,13 +1196,10 @@ async def test_enhanced_intelligence_quality(business_context: str, expected_qua
         "output_format": "psychology_report"
     }
     
-    start_time = time.time()
-    
-    # Run the enhanced intelligence system
-    result = await graph.ainvoke(test_state)
-    
-    end_time = time.time()
-    processing_time = end_time - start_time
+    # Run the enhanced intelligence system under its own trace run
+    with tracer.run(f"test_{uuid.uuid4().hex}"), tracer.span("test_run", kind="run") as span:
+        result = await graph.ainvoke(test_state)
+    processing_time = span.duration
     
     # Analyze results
     quality_score = result.get("quality_score", 0)
@@ -908,7 +1232,7 @@ async def test_enhanced_intelligence_quality(business_context: str, expected_qua
         "session_id": result.get("session_id", "unknown")
     }
     
-    print(f"📊 ENHANCED 6-AGENT SYSTEM TEST RESULTS:")
+    print("📊 ENHANCED 6-AGENT SYSTEM TEST RESULTS:")
     print(f"   Overall: {'✅ PASSED' if overall_passed else '❌ FAILED'}")
     print(f"   Quality: {quality_score:.1%} ({'✅' if quality_passed else '❌'})")
     print(f"   Confidence: {confidence_score:.1%} ({'✅' if confidence_passed else '❌'})")
@@ -0,0 +1,93 @@
+# agent/http_layer.py - Shared pooled HTTP transport for all outbound I/O
+
+import logging
+import os
+from typing import Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - HTTP/2 support is optional
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ANTHROPIC_HOST = "api.anthropic.com"
+BRAVE_SEARCH_HOST = "api.search.brave.com"
+OPENAI_HOST = "api.openai.com"
+
+# Read timeout for LLM calls - long generations stream for minutes, far past the default
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "600"))
+
+
+class HTTPLayer:
+    """One managed HTTP layer: a keep-alive pool per upstream host
+
+    Each host gets its own pooled client so connection limits and timeouts are enforced per host.
+    HTTP/2 is used when the h2 package is installed (HTTP_ENABLE_HTTP2=false turns it
+    off), and httpx advertises and transparently decodes gzip responses.
+    """
+
+    # Per-host pool limits - (max_connections, max_keepalive_connections)
+    HOST_LIMITS = {
+        ANTHROPIC_HOST: (int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "100")),
+                         int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))),
+        OPENAI_HOST: (int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "100")),
+                      int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))),
+        BRAVE_SEARCH_HOST: (int(os.getenv("HTTP_BRAVE_MAX_CONNECTIONS", "20")),
+                            int(os.getenv("HTTP_BRAVE_MAX_KEEPALIVE", "10"))),
+    }
+    # Per-host request timeouts (seconds) - LLM hosts get LLM_TIMEOUT, the rest HTTP_DEFAULT_TIMEOUT
+    HOST_TIMEOUTS = {ANTHROPIC_HOST: LLM_TIMEOUT, OPENAI_HOST: LLM_TIMEOUT}
+    DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "30"))
+    DEFAULT_LIMITS = (int(os.getenv("HTTP_DEFAULT_MAX_CONNECTIONS", "20")),
+                      int(os.getenv("HTTP_DEFAULT_MAX_KEEPALIVE", "5")))
+
+    def __init__(self,
+                 keepalive_expiry: Optional[float] = None,
+                 http2: Optional[bool] = None):
+        self.keepalive_expiry = keepalive_expiry or float(
+            os.getenv("HTTP_KEEPALIVE_EXPIRY", os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "120"))
+        )
+        if http2 is None:
+            http2 = os.getenv("HTTP_ENABLE_HTTP2", "true").lower() == "true"
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def limits_for(self, host: str) -> httpx.Limits:
+        max_connections, max_keepalive = self.HOST_LIMITS.get(host, self.DEFAULT_LIMITS)
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def client_for(self, host: str) -> httpx.AsyncClient:
+        """Shared pooled client for one upstream host, built on first use"""
+        client = self._clients.get(host)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits_for(host),
+                timeout=httpx.Timeout(self.HOST_TIMEOUTS.get(host, self.DEFAULT_TIMEOUT), connect=10.0)
+            )
+            self._clients[host] = client
+        return client
+
+    async def start(self) -> None:
+        """Build the pools for the known upstream hosts ahead of the first request"""
+        for host in self.HOST_LIMITS:
+            self.client_for(host)
+        logger.info(f"🌐 HTTP layer ready (HTTP/2: {self.http2}, LLM timeout: {LLM_TIMEOUT:.0f}s)")
+
+    async def aclose(self) -> None:
+        """Close every pooled connection"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+# Shared HTTP layer - started and closed by the FastAPI app lifecycle in main.py
+http_layer = HTTPLayer()
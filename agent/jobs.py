@@ -0,0 +1,267 @@
+# agent/jobs.py - Background research jobs with a bounded worker pool
+
+import asyncio
+import ipaddress
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+import httpx
+
+from agent.executor import run_sync
+from agent.storage import data_path
+
+logger = logging.getLogger(__name__)
+
+# Optional comma-separated allow-list of webhook hosts - when set, no other host is accepted
+WEBHOOK_ALLOWED_HOSTS = {
+    host.strip().lower() for host in os.getenv("RESEARCH_WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()
+}
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no free slot - carries a Retry-After hint"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Research job queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+async def validate_webhook_url(webhook_url: str) -> None:
+    """Reject webhook URLs that could reach internal services - raises ValueError
+
+    Only http(s) is accepted, the host must be on RESEARCH_WEBHOOK_ALLOWED_HOSTS when
+    that is set, and every address the host resolves to must be public.
+    """
+    parsed = urlparse(webhook_url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError("webhook_url must be an absolute http(s) URL")
+    host = parsed.hostname.lower()
+    if WEBHOOK_ALLOWED_HOSTS and host not in WEBHOOK_ALLOWED_HOSTS:
+        raise ValueError(f"webhook_url host {host} is not in RESEARCH_WEBHOOK_ALLOWED_HOSTS")
+
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, parsed.port or (443 if parsed.scheme == "https" else 80), type=socket.SOCK_STREAM
+        )
+    except OSError:
+        raise ValueError(f"webhook_url host {host} does not resolve")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"webhook_url host {host} resolves to a non-public address")
+
+
+class JobStore:
+    """SQLite-backed job records that survive restarts"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("RESEARCH_JOB_DB") or data_path("research_jobs.db")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS research_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    webhook_url TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+
+    def create(self, job_id: str, request: Dict[str, Any], webhook_url: Optional[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO research_jobs (job_id, status, request, webhook_url, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, "queued", json.dumps(request), webhook_url, time.time())
+            )
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = json.dumps(fields["result"], default=str)
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE research_jobs SET {assignments} WHERE job_id = ?",
+                (*fields.values(), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM research_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["request"] = json.loads(job["request"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def with_status(self, *statuses: str) -> List[Dict[str, Any]]:
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id FROM research_jobs WHERE status IN ({placeholders}) ORDER BY created_at",
+                statuses
+            ).fetchall()
+        return [self.get(row["job_id"]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResearchJobQueue:
+    """Bounded in-process queue drained by a fixed number of async workers
+
+    Job state lives in the JobStore, so status and results outlive the process.
+    Jobs still queued or running at shutdown are picked up again on the next start;
+    the runner receives the job id so interrupted runs can resume from their checkpoints.
+    Stored jobs that don't fit in the in-memory queue are pulled in by the workers as
+    the queue drains.
+    """
+
+    def __init__(self,
+                 runner: Callable[[Dict[str, Any], str], Awaitable[Dict[str, Any]]],
+                 store: Optional[JobStore] = None,
+                 workers: Optional[int] = None,
+                 max_queued: Optional[int] = None):
+        self.runner = runner
+        self.store = store
+        self.workers = workers or int(os.getenv("RESEARCH_JOB_WORKERS", "4"))
+        self.max_queued = max_queued or int(os.getenv("RESEARCH_JOB_QUEUE_SIZE", "20"))
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._durations: List[float] = []
+        self._pending: Set[str] = set()  # Job ids in the in-memory queue or running
+
+    async def start(self) -> None:
+        self.store = self.store or JobStore()
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+        # Jobs interrupted mid-run go back on the queue and resume from their last checkpoint
+        for job in await run_sync(self.store.with_status, "running"):
+            await run_sync(self.store.update, job["job_id"], status="queued")
+        await self._refill()
+
+        logger.info(f"📬 Research job queue ready ({self.workers} workers, {self.max_queued} slots)")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.store is not None:
+            self.store.close()
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up, from recent job durations"""
+        recent = self._durations[-20:]
+        average = sum(recent) / len(recent) if recent else 60.0
+        return max(1, int(average / self.workers))
+
+    async def submit(self, request: Dict[str, Any], webhook_url: Optional[str] = None) -> str:
+        if self._queue is None:
+            raise RuntimeError("Research job queue is not started")
+        if self._queue.full():
+            raise QueueFullError(self.retry_after())
+
+        if webhook_url:
+            await validate_webhook_url(webhook_url)
+
+        job_id = uuid.uuid4().hex
+        await run_sync(self.store.create, job_id, request, webhook_url)
+        try:
+            self._enqueue(job_id)
+        except asyncio.QueueFull:
+            # Another submission took the last slot while the record was being written
+            await run_sync(self.store.update, job_id, status="rejected", finished_at=time.time())
+            raise QueueFullError(self.retry_after())
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await run_sync(self.store.get, job_id)
+
+    def _enqueue(self, job_id: str) -> None:
+        self._queue.put_nowait(job_id)
+        self._pending.add(job_id)
+
+    async def _refill(self) -> None:
+        """Move stored "queued" jobs into free queue slots, oldest first"""
+        for job in await run_sync(self.store.with_status, "queued"):
+            if self._queue.full():
+                break
+            if job["job_id"] not in self._pending:
+                self._enqueue(job["job_id"])
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                logger.exception(f"❌ Research job worker {worker_id} error: {str(e)}")
+            finally:
+                self._pending.discard(job_id)
+                self._queue.task_done()
+
+            if self._queue.empty():
+                try:
+                    await self._refill()
+                except Exception as e:
+                    logger.error(f"❌ Research job worker {worker_id} could not refill the queue: {str(e)}")
+
+    async def _run_job(self, job_id: str) -> None:
+        job = await run_sync(self.store.get, job_id)
+        if job is None or job["status"] != "queued":
+            return
+
+        started_at = time.time()
+        await run_sync(self.store.update, job_id, status="running", started_at=started_at)
+        logger.info(f"📬 Research job {job_id} started")
+
+        try:
+            result = await self.runner(job["request"], job_id)
+            await run_sync(self.store.update, job_id, status="completed", result=result, finished_at=time.time())
+            logger.info(f"✅ Research job {job_id} completed ({time.time() - started_at:.1f}s)")
+        except Exception as e:
+            logger.exception(f"❌ Research job {job_id} failed: {str(e)}")
+            await run_sync(self.store.update, job_id, status="failed", error=str(e), finished_at=time.time())
+
+        self._durations.append(time.time() - started_at)
+        if job.get("webhook_url"):
+            await self._notify(job["webhook_url"], job_id)
+
+    async def _notify(self, webhook_url: str, job_id: str) -> None:
+        """POST the finished job's status to its completion webhook
+
+        The URL is validated again (DNS may have changed since submission) and sent on a
+        short-lived client without redirects, so webhook hosts never join the provider pools.
+        """
+        job = await run_sync(self.store.get, job_id)
+        payload = {
+            "job_id": job_id,
+            "status": job["status"],
+            "error": job["error"],
+            "result": job["result"]
+        }
+        try:
+            await validate_webhook_url(webhook_url)
+            async with httpx.AsyncClient(timeout=10.0, follow_redirects=False) as client:
+                response = await client.post(webhook_url, json=payload)
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"❌ Webhook delivery failed for job {job_id}: {str(e)}")
@@ -0,0 +1,155 @@
+# agent/llm_registry.py - Shared, reusable LLM clients
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import anthropic
+import httpx
+from langchain_anthropic import ChatAnthropic
+from langchain_openai import ChatOpenAI
+from langchain.callbacks import LangChainTracer
+from langchain_core.language_models import BaseChatModel
+
+from agent.http_layer import http_layer, ANTHROPIC_HOST, OPENAI_HOST, LLM_TIMEOUT
+
+PROVIDERS = ("anthropic", "openai")
+
+
+def provider_of(llm: Any) -> str:
+    """Provider a chat model talks to - anything that isn't an OpenAI client is treated as Anthropic"""
+    return "openai" if isinstance(llm, ChatOpenAI) else "anthropic"
+
+
+def model_of(llm: Any) -> str:
+    return getattr(llm, "model", None) or getattr(llm, "model_name", "") or ""
+
+
+def route_of(llm: Any) -> Dict[str, Any]:
+    """Provider, model, temperature and max_tokens a client was built with"""
+    return {
+        "provider": provider_of(llm),
+        "model": model_of(llm),
+        "temperature": getattr(llm, "temperature", None),
+        "max_tokens": getattr(llm, "max_tokens", None)
+    }
+
+
+class LLMClientRegistry:
+    """Process-wide cache of chat model clients keyed by task type, provider, model and settings
+
+    Every client built here shares one tracer and its provider's pool from the shared
+    HTTP layer, so repeated node calls reuse warm keep-alive connections instead of
+    opening a new pool (and new TLS handshakes) per call.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple, BaseChatModel] = {}
+        self._lock = threading.Lock()
+        self._tracer: Optional[LangChainTracer] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """Connection pool size and keep-alive settings for LLM traffic
+
+        Set via LLM_POOL_MAX_CONNECTIONS, LLM_POOL_MAX_KEEPALIVE and LLM_POOL_KEEPALIVE_EXPIRY.
+        """
+        return http_layer.limits_for(ANTHROPIC_HOST)
+
+    @property
+    def tracer(self) -> LangChainTracer:
+        """One LangSmith tracer shared by every client"""
+        if self._tracer is None:
+            self._tracer = LangChainTracer()
+        return self._tracer
+
+    @property
+    def callbacks(self) -> List[LangChainTracer]:
+        """LangSmith tracer unless LANGSMITH_TRACER_ENABLED=false (e.g. load tests against mock providers)"""
+        if os.getenv("LANGSMITH_TRACER_ENABLED", "true").lower() == "false":
+            return []
+        return [self.tracer]
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Pooled Anthropic client from the shared HTTP layer"""
+        return http_layer.client_for(ANTHROPIC_HOST)
+
+    def get(self, task_type: str, model: str, temperature: float, max_tokens: int,
+            provider: str = "anthropic", **settings: Any) -> BaseChatModel:
+        """Return the cached client for these settings, building it on first use
+
+        SDK-level retries are off by default - agent/retry.py owns retries and backoff,
+        and the adaptive limiter needs to see every 429 rather than the SDK absorbing it.
+        """
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unknown LLM provider: {provider} (expected one of: {', '.join(PROVIDERS)})")
+        settings.setdefault("max_retries", 0)
+        key = (task_type, provider, model, temperature, max_tokens, tuple(sorted(settings.items())))
+
+        with self._lock:
+            llm = self._clients.get(key)
+            if llm is not None:
+                self.hits += 1
+                return llm
+
+            self.misses += 1
+            if provider == "openai":
+                llm = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    callbacks=self.callbacks,
+                    stream_usage=True,
+                    http_async_client=http_layer.client_for(OPENAI_HOST),
+                    **settings
+                )
+            else:
+                llm = ChatAnthropic(
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    callbacks=self.callbacks,
+                    **settings
+                )
+                self._attach_http_client(llm)
+            self._clients[key] = llm
+            return llm
+
+    def _attach_http_client(self, llm: ChatAnthropic) -> None:
+        """Point the model's async Anthropic client at the shared connection pool
+
+        Timeout and headers are carried over explicitly - otherwise the SDK would fall
+        back to the pooled client's defaults and drop the model's own settings.
+        """
+        llm._async_client = anthropic.AsyncAnthropic(
+            api_key=llm.anthropic_api_key.get_secret_value(),
+            base_url=llm.anthropic_api_url,
+            max_retries=llm.max_retries,
+            timeout=llm.default_request_timeout or LLM_TIMEOUT,
+            default_headers=llm.default_headers,
+            http_client=self.http_client
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Registry size, reuse counters and pool settings"""
+        limits = self.limits
+        return {
+            "clients": len(self._clients),
+            "hits": self.hits,
+            "misses": self.misses,
+            "max_connections": limits.max_connections,
+            "max_keepalive_connections": limits.max_keepalive_connections,
+            "keepalive_expiry": limits.keepalive_expiry
+        }
+
+    def clear(self) -> None:
+        """Drop cached clients - the connection pool itself is owned by the HTTP layer"""
+        with self._lock:
+            self._clients.clear()
+
+
+# Shared registry used by ResearchConfig.get_llm
+llm_registry = LLMClientRegistry()
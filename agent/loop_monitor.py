@@ -0,0 +1,59 @@
+# agent/loop_monitor.py - Event-loop lag probe for the API process
+
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+from agent.metrics import observe_loop_lag
+
+
+class EventLoopLagMonitor:
+    """Sleeps a fixed interval in a loop and records how late each wakeup was
+
+    Lag is time the loop spent on other callbacks past the scheduled wakeup - blocking
+    work on the loop (sync I/O, CPU-heavy rendering) shows up here before it shows up
+    as request latency. Interval via EVENT_LOOP_LAG_INTERVAL (seconds, default 0.25).
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or float(os.getenv("EVENT_LOOP_LAG_INTERVAL", "0.25"))
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - scheduled, 0.0)
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            observe_loop_lag(lag, self.max_lag)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2)
+        }
+
+
+# Shared monitor started with the API
+loop_monitor = EventLoopLagMonitor()
@@ -0,0 +1,204 @@
+# agent/metrics.py - Per-node token usage, cost and throughput, exported for Prometheus
+
+from typing import Any, Dict
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, ProcessCollector, generate_latest, CONTENT_TYPE_LATEST
+)
+
+# USD per million tokens: (input, output, cache read, cache write). Matched by longest model prefix.
+MODEL_PRICING = {
+    "claude-opus-4": (15.00, 75.00, 1.50, 18.75),
+    "claude-sonnet-4": (3.00, 15.00, 0.30, 3.75),
+    "claude-3-7-sonnet": (3.00, 15.00, 0.30, 3.75),
+    "claude-3-5-sonnet": (3.00, 15.00, 0.30, 3.75),
+    "claude-3-5-haiku": (0.80, 4.00, 0.08, 1.00),
+    "claude-3-haiku": (0.25, 1.25, 0.03, 0.30),
+    "gpt-4o": (2.50, 10.00, 1.25, 2.50),
+    "gpt-4o-mini": (0.15, 0.60, 0.075, 0.15),
+}
+DEFAULT_PRICING = MODEL_PRICING["claude-sonnet-4"]
+
+METRICS_REGISTRY = CollectorRegistry()
+
+# process_resident_memory_bytes, CPU seconds and open fds for the serving process
+ProcessCollector(registry=METRICS_REGISTRY)
+
+LLM_TOKENS = Counter(
+    "research_llm_tokens_total", "LLM tokens by node, model and kind",
+    ["node", "model", "kind"], registry=METRICS_REGISTRY
+)
+LLM_COST = Counter(
+    "research_llm_cost_usd_total", "Estimated LLM spend in USD",
+    ["node", "model"], registry=METRICS_REGISTRY
+)
+LLM_CALL_SECONDS = Histogram(
+    "research_llm_call_seconds", "LLM call latency",
+    ["node"], registry=METRICS_REGISTRY,
+    buckets=(1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+)
+LLM_OUTPUT_TOKENS_PER_SECOND = Histogram(
+    "research_llm_output_tokens_per_second", "Output token throughput per LLM call",
+    ["node"], registry=METRICS_REGISTRY,
+    buckets=(5, 10, 20, 30, 40, 50, 60, 80, 100, 150)
+)
+LLM_RETRIES = Counter(
+    "research_llm_retries_total", "LLM call retries by node and error type",
+    ["node", "error"], registry=METRICS_REGISTRY
+)
+LLM_HEDGES = Counter(
+    "research_llm_hedges_total", "Hedged LLM requests by node and which attempt won",
+    ["node", "outcome"], registry=METRICS_REGISTRY
+)
+CASCADE_DRAFTS = Counter(
+    "research_model_cascade_total", "Cascaded LLM drafts by route and whether they were escalated",
+    ["node", "outcome"], registry=METRICS_REGISTRY
+)
+CASCADE_SCORE = Histogram(
+    "research_model_cascade_score", "Quality-gate score of cascaded drafts",
+    ["node"], registry=METRICS_REGISTRY,
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+)
+RUN_SECONDS = Histogram(
+    "research_run_seconds", "End-to-end research run latency",
+    ["tier"], registry=METRICS_REGISTRY,
+    buckets=(15, 30, 60, 90, 120, 180, 300, 450, 600, 900)
+)
+RUN_COST = Histogram(
+    "research_run_cost_usd", "Estimated LLM spend per research run",
+    ["tier"], registry=METRICS_REGISTRY,
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0)
+)
+RUNS = Counter(
+    "research_runs_total", "Research runs by tier and outcome",
+    ["tier", "status"], registry=METRICS_REGISTRY
+)
+QUOTA_WAIT_SECONDS = Histogram(
+    "research_quota_wait_seconds", "Time provider calls waited for rate-limit budget",
+    ["provider", "priority"], registry=METRICS_REGISTRY,
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+)
+CONCURRENCY_LIMIT = Gauge(
+    "research_concurrency_limit", "Current adaptive in-flight limit per provider",
+    ["limiter"], registry=METRICS_REGISTRY
+)
+CONCURRENCY_IN_FLIGHT = Gauge(
+    "research_concurrency_in_flight", "Provider calls currently in flight",
+    ["limiter"], registry=METRICS_REGISTRY
+)
+CONCURRENCY_CHANGES = Counter(
+    "research_concurrency_limit_changes_total", "Adaptive limit increases and decreases",
+    ["limiter", "direction"], registry=METRICS_REGISTRY
+)
+EVENT_LOOP_LAG = Histogram(
+    "research_event_loop_lag_seconds", "Delay between a scheduled event-loop wakeup and when it ran",
+    registry=METRICS_REGISTRY,
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+EVENT_LOOP_LAG_MAX = Gauge(
+    "research_event_loop_lag_max_seconds", "Worst event-loop lag since the process started",
+    registry=METRICS_REGISTRY
+)
+
+
+def model_pricing(model: str):
+    matches = [prefix for prefix in MODEL_PRICING if (model or "").startswith(prefix)]
+    return MODEL_PRICING[max(matches, key=len)] if matches else DEFAULT_PRICING
+
+
+def llm_usage(result: Any, model: str, elapsed: float) -> Dict[str, Any]:
+    """Token counts, throughput and estimated cost for one LLM response
+
+    input_tokens is the full prompt size, cached portions included (LangChain's
+    convention); cost prices the cached and uncached portions separately.
+    """
+    usage = getattr(result, "usage_metadata", None) or {}
+    raw_usage = (getattr(result, "response_metadata", None) or {}).get("usage") or {}
+
+    if usage:
+        details = usage.get("input_token_details") or {}
+        input_tokens = usage.get("input_tokens", 0) or 0
+        output_tokens = usage.get("output_tokens", 0) or 0
+        cache_read = details.get("cache_read", 0) or 0
+        cache_creation = details.get("cache_creation", 0) or 0
+    else:
+        # Raw Anthropic usage reports uncached input only
+        cache_read = raw_usage.get("cache_read_input_tokens", 0) or 0
+        cache_creation = raw_usage.get("cache_creation_input_tokens", 0) or 0
+        input_tokens = (raw_usage.get("input_tokens", 0) or 0) + cache_read + cache_creation
+        output_tokens = raw_usage.get("output_tokens", 0) or 0
+
+    input_price, output_price, read_price, write_price = model_pricing(model)
+    uncached = max(input_tokens - cache_read - cache_creation, 0)
+    cost = (uncached * input_price + output_tokens * output_price
+            + cache_read * read_price + cache_creation * write_price) / 1_000_000
+
+    return {
+        "model": model,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_read_tokens": cache_read,
+        "cache_creation_tokens": cache_creation,
+        "seconds": round(elapsed, 3),
+        "output_tokens_per_second": round(output_tokens / elapsed, 1) if elapsed > 0 else 0.0,
+        "cost_usd": round(cost, 6)
+    }
+
+
+def observe_llm_call(node: str, usage: Dict[str, Any]):
+    model = usage["model"]
+    for kind in ("input", "output", "cache_read", "cache_creation"):
+        LLM_TOKENS.labels(node, model, kind).inc(usage[f"{kind}_tokens"])
+    LLM_COST.labels(node, model).inc(usage["cost_usd"])
+    LLM_CALL_SECONDS.labels(node).observe(usage["seconds"])
+    if usage["output_tokens"]:
+        LLM_OUTPUT_TOKENS_PER_SECOND.labels(node).observe(usage["output_tokens_per_second"])
+
+
+def observe_llm_retry(node: str, error: str):
+    LLM_RETRIES.labels(node, error).inc()
+
+
+def observe_llm_hedge(node: str, outcome: str):
+    LLM_HEDGES.labels(node, outcome).inc()
+
+
+def observe_cascade(node: str, score: float, escalated: bool):
+    CASCADE_DRAFTS.labels(node, "escalated" if escalated else "accepted").inc()
+    CASCADE_SCORE.labels(node).observe(score)
+
+
+def run_cost(final_state: Dict[str, Any]) -> float:
+    return sum(usage.get("cost_usd", 0.0) for usage in (final_state.get("llm_usage") or {}).values())
+
+
+def observe_run(final_state: Dict[str, Any], elapsed: float, status: str = "completed"):
+    """Record one finished (or failed) research run"""
+    tier = final_state.get("research_tier") or "unknown"
+    RUNS.labels(tier, status).inc()
+    if status == "completed":
+        RUN_SECONDS.labels(tier).observe(elapsed)
+        RUN_COST.labels(tier).observe(run_cost(final_state))
+
+
+def observe_quota_wait(provider: str, priority: str, waited: float):
+    QUOTA_WAIT_SECONDS.labels(provider, priority).observe(waited)
+
+
+def observe_concurrency(limiter: str, limit: float, in_flight: int):
+    CONCURRENCY_LIMIT.labels(limiter).set(limit)
+    CONCURRENCY_IN_FLIGHT.labels(limiter).set(in_flight)
+
+
+def observe_concurrency_change(limiter: str, direction: str):
+    CONCURRENCY_CHANGES.labels(limiter, direction).inc()
+
+
+def observe_loop_lag(lag: float, worst: float):
+    EVENT_LOOP_LAG.observe(lag)
+    EVENT_LOOP_LAG_MAX.set(worst)
+
+
+def render_metrics():
+    """(body, content type) for the /metrics endpoint"""
+    return generate_latest(METRICS_REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,101 @@
+# agent/planner.py - Compute only the nodes a requested output needs
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from agent.graph import DEFAULT_RESEARCH_TIER, resolve_plan_nodes, create_enhanced_intelligence_workflow
+
+# Requested artifact -> state keys it needs (None means the full report)
+ARTIFACT_TARGETS = {
+    "full_json": None,
+    "psychology_report": None,
+    "campaign_ready": None,
+    "psychological_analysis": ["psychological_analysis"],
+    "conversion_intelligence": ["conversion_intelligence"],
+    "competitor_analysis": ["competitor_analysis"],
+    "interviews": ["psychological_interviews", "sales_intelligence_interviews"],
+    "synthesis": ["synthesis_results"],
+}
+
+# State key -> node that produces it
+KEY_PRODUCERS = {
+    "psychological_analysis": "psych_analysis_agent",
+    "conversion_intelligence": "conversion_agent",
+    "icp_analysis": "conversion_agent",
+    "competitor_search_results": "competitor_search",
+    "competitor_analysis": "competitor_discovery",
+    "psychological_interviews": "psych_interview_agent",
+    "sales_intelligence_interviews": "sales_interview_agent",
+    "synthesis_results": "campaign_synthesis",
+    "interview_insights": "campaign_synthesis",
+    "voice_of_customer": "campaign_synthesis",
+    "quality_score": "campaign_synthesis",
+    "confidence_score": "campaign_synthesis",
+    "learning_insights": "learn",
+    "executive_summary": "format_outputs",
+    "formatted_report": "format_outputs",
+    "psychology_report": "format_outputs",
+    "campaign_insights": "format_outputs",
+}
+
+# Tier-specific producers that replace KEY_PRODUCERS entries
+TIER_KEY_PRODUCERS = {
+    "express": {
+        "psychological_analysis": "express_research",
+        "conversion_intelligence": "express_research",
+        "synthesis_results": "express_research",
+        "voice_of_customer": "express_research",
+        "quality_score": "express_research",
+        "confidence_score": "express_research",
+    },
+}
+
+
+def target_keys(output_format: str, targets: Optional[List[str]] = None) -> Optional[List[str]]:
+    """State keys a request asks for - explicit targets win over the output format"""
+    if targets:
+        return list(targets)
+    return ARTIFACT_TARGETS.get(output_format)
+
+
+def plan_nodes(output_format: str, targets: Optional[List[str]] = None,
+               tier: str = DEFAULT_RESEARCH_TIER) -> List[str]:
+    """Minimal ordered node list that produces the requested artifact or state keys
+
+    Raises ValueError for unknown keys or keys the tier cannot produce.
+    """
+    keys = target_keys(output_format, targets)
+    if keys is None:
+        return resolve_plan_nodes(None, tier)
+
+    producers = {**KEY_PRODUCERS, **TIER_KEY_PRODUCERS.get(tier, {})}
+    unknown = [key for key in keys if key not in producers]
+    if unknown:
+        raise ValueError(f"Unknown target state keys: {', '.join(unknown)}")
+    return resolve_plan_nodes([producers[key] for key in keys], tier)
+
+
+class ExecutionPlanner:
+    """Builds and caches one compiled graph per distinct (tier, plan)"""
+
+    def __init__(self, checkpointer=None):
+        self.checkpointer = checkpointer
+        self._graphs: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+        self._lock = threading.Lock()
+
+    def graph_for(self, nodes: Optional[List[str]] = None, tier: str = DEFAULT_RESEARCH_TIER):
+        key = (tier, tuple(resolve_plan_nodes(nodes, tier)))
+        with self._lock:
+            compiled = self._graphs.get(key)
+            if compiled is None:
+                compiled = create_enhanced_intelligence_workflow(
+                    checkpointer=self.checkpointer, nodes=list(key[1]), tier=tier
+                )
+                self._graphs[key] = compiled
+            return compiled
+
+    def plan(self, output_format: str, targets: Optional[List[str]] = None,
+             tier: str = DEFAULT_RESEARCH_TIER):
+        """(node list, compiled graph) for a request"""
+        nodes = plan_nodes(output_format, targets, tier)
+        return nodes, self.graph_for(nodes, tier)
@@ -0,0 +1,58 @@
+# agent/prompt_cache.py - Anthropic prompt caching for the static prompt templates
+
+import os
+from typing import Any, Dict, List, Union
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from prompts.research_prompts import ResearchPrompts
+
+
+def prompt_caching_enabled() -> bool:
+    return os.getenv("PROMPT_CACHE_ENABLED", "true").lower() == "true"
+
+
+def build_prompt(template: str, appendix: str = "", **values: Any) -> Union[str, List[BaseMessage]]:
+    """Messages with the template's static instructions as a cached system prefix
+
+    The fixed instruction block goes first, marked with cache_control so Anthropic can
+    reuse it across requests; the per-request context (and any appendix) follows in the
+    user turn. With PROMPT_CACHE_ENABLED=false the original single-string prompt is sent.
+    """
+    if not prompt_caching_enabled():
+        return template.format(**values) + appendix
+
+    instructions, context_template = ResearchPrompts.split_cacheable(template)
+    return [
+        SystemMessage(content=[{
+            "type": "text",
+            "text": instructions,
+            "cache_control": {"type": "ephemeral"}
+        }]),
+        HumanMessage(content=context_template.format(**values) + appendix)
+    ]
+
+
+def strip_cache_control(prompt: Union[str, List[BaseMessage]]) -> Union[str, List[BaseMessage]]:
+    """Plain-text copy of a build_prompt result for providers without Anthropic cache markers"""
+    if isinstance(prompt, str):
+        return prompt
+    return [
+        type(message)(content=message.content if isinstance(message.content, str) else "\n".join(
+            block.get("text", "") for block in message.content if isinstance(block, dict)
+        ))
+        for message in prompt
+    ]
+
+
+def prompt_cache_usage(result: Any) -> Dict[str, int]:
+    """Cache read/write token counts reported for one LLM response"""
+    usage = getattr(result, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    raw_usage = (getattr(result, "response_metadata", None) or {}).get("usage") or {}
+
+    return {
+        "input_tokens": usage.get("input_tokens", raw_usage.get("input_tokens", 0)) or 0,
+        "cache_read_tokens": details.get("cache_read", raw_usage.get("cache_read_input_tokens", 0)) or 0,
+        "cache_creation_tokens": details.get("cache_creation", raw_usage.get("cache_creation_input_tokens", 0)) or 0
+    }
@@ -0,0 +1,291 @@
+# agent/quota.py - Process-wide provider quota scheduler with priority classes and tenant fair sharing
+
+import asyncio
+import contextlib
+import contextvars
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from agent.metrics import observe_quota_wait
+
+# Lower value is served first; batch work waiting longer than the aging limit is served as interactive
+PRIORITY_CLASSES = {"interactive": 0, "batch": 1}
+DEFAULT_PRIORITY = "interactive"
+DEFAULT_TENANT = "default"
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("quota_priority", default=DEFAULT_PRIORITY)
+_tenant: contextvars.ContextVar[str] = contextvars.ContextVar("quota_tenant", default=DEFAULT_TENANT)
+
+
+def resolve_priority(priority: Optional[str], default: str = DEFAULT_PRIORITY) -> str:
+    """Validate a request's priority class - raises ValueError for unknown values"""
+    priority = (priority or default).lower()
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority '{priority}' - expected one of {', '.join(PRIORITY_CLASSES)}")
+    return priority
+
+
+def current_priority() -> str:
+    """Priority class bound to the current context by quota_context()"""
+    return _priority.get()
+
+
+class TokenBucket:
+    """Continuously refilled allowance of `per_minute` units - 0 means unlimited
+
+    The level may go negative when a call used more than it reserved; later
+    requests then wait until the debt is refilled.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` (capped at capacity, so oversized requests still run) is available"""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        return max(min(amount, self.capacity) - self.level, 0.0) / self.rate
+
+    def take(self, amount: float):
+        if not self.unlimited:
+            self._refill(time.monotonic())
+            self.level -= amount
+
+    def give(self, amount: float):
+        if not self.unlimited:
+            self._refill(time.monotonic())
+            self.level = min(self.capacity, self.level + amount)
+
+
+class Reservation:
+    """One granted request slot plus its token reservation - set `used` once the call reports usage"""
+
+    __slots__ = ("provider", "tokens", "priority", "tenant", "waited", "used")
+
+    def __init__(self, provider: str, tokens: int, priority: str, tenant: str, waited: float):
+        self.provider = provider
+        self.tokens = tokens
+        self.priority = priority
+        self.tenant = tenant
+        self.waited = waited
+        self.used: Optional[int] = None
+
+
+class _Waiter:
+    __slots__ = ("priority", "tenant", "tokens", "enqueued", "seq", "future")
+
+    def __init__(self, priority: str, tenant: str, tokens: int, seq: int, future: asyncio.Future):
+        self.priority = priority
+        self.tenant = tenant
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.seq = seq
+        self.future = future
+
+
+class ProviderQuota:
+    """Requests-per-minute and tokens-per-minute budgets for one provider
+
+    Waiting calls are granted strictly by priority class, then by start-time fair
+    queuing across tenants (each tenant's virtual clock advances by the tokens it was
+    granted, so a tenant firing many large calls can't crowd out a light one), then
+    FIFO within a tenant. The next call in that order blocks the ones behind it until
+    it fits, so large reservations are never starved by a stream of small ones.
+    """
+
+    def __init__(self, name: str, rpm: float = 0, tpm: float = 0, aging: float = 120.0):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.aging = aging
+        self._queues: Dict[Tuple[str, str], Deque[_Waiter]] = {}
+        self._virtual: Dict[str, float] = {}
+        self._clock = 0.0
+        self._seq = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.granted = 0
+        self.max_wait = 0.0
+
+    @property
+    def unlimited(self) -> bool:
+        return self.requests.unlimited and self.tokens.unlimited
+
+    async def acquire(self, tokens: int, priority: str, tenant: str) -> Reservation:
+        """Wait for a request slot and `tokens` of budget - cancellation leaves the queue cleanly"""
+        if self.unlimited:
+            self.granted += 1
+            return Reservation(self.name, tokens, priority, tenant, 0.0)
+
+        self._seq += 1
+        waiter = _Waiter(priority, tenant, tokens, self._seq, asyncio.get_running_loop().create_future())
+        self._queues.setdefault((priority, tenant), deque()).append(waiter)
+        self._dispatch()
+        try:
+            waited = await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as the caller gave up - hand the budget back
+                self.requests.give(1)
+                self.tokens.give(tokens)
+            self._dispatch()
+            raise
+
+        self.max_wait = max(self.max_wait, waited)
+        observe_quota_wait(self.name, priority, waited)
+        return Reservation(self.name, tokens, priority, tenant, waited)
+
+    def settle(self, reservation: Reservation, used: int):
+        """Refund an over-reservation (or charge an under-reservation) once actual usage is known"""
+        if used < reservation.tokens:
+            self.tokens.give(reservation.tokens - used)
+        elif used > reservation.tokens:
+            self.tokens.take(used - reservation.tokens)
+        if not self.unlimited:
+            self._dispatch()
+
+    def _next_waiter(self, now: float) -> Optional[_Waiter]:
+        best, best_key = None, None
+        for key in list(self._queues):
+            queue = self._queues[key]
+            while queue and queue[0].future.done():
+                queue.popleft()
+            if not queue:
+                del self._queues[key]
+                continue
+
+            head = queue[0]
+            priority = PRIORITY_CLASSES[head.priority]
+            if now - head.enqueued > self.aging:
+                priority = 0
+            order = (priority, max(self._virtual.get(head.tenant, 0.0), self._clock), head.seq)
+            if best_key is None or order < best_key:
+                best, best_key = head, order
+        return best
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        while True:
+            waiter = self._next_waiter(now)
+            if waiter is None:
+                return
+            wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(waiter.tokens, now))
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+
+            self._queues[(waiter.priority, waiter.tenant)].popleft()
+            self.requests.take(1)
+            self.tokens.take(waiter.tokens)
+            start = max(self._virtual.get(waiter.tenant, 0.0), self._clock)
+            self._clock = start
+            self._virtual[waiter.tenant] = start + max(waiter.tokens, 1)
+            if len(self._virtual) > 1000:
+                # Tenants at or behind the clock are indistinguishable from new ones
+                self._virtual = {tenant: at for tenant, at in self._virtual.items() if at > self._clock}
+            self.granted += 1
+            waiter.future.set_result(now - waiter.enqueued)
+
+    def stats(self) -> Dict[str, Any]:
+        queued: Dict[str, int] = {}
+        for (priority, _), queue in self._queues.items():
+            queued[priority] = queued.get(priority, 0) + sum(1 for waiter in queue if not waiter.future.done())
+        return {
+            "rpm": self.requests.capacity or None,
+            "tpm": self.tokens.capacity or None,
+            "requests_available": None if self.requests.unlimited else round(self.requests.level, 1),
+            "tokens_available": None if self.tokens.unlimited else round(self.tokens.level),
+            "queued": queued,
+            "granted": self.granted,
+            "max_wait_seconds": round(self.max_wait, 3)
+        }
+
+
+class QuotaScheduler:
+    """Shared quotas for every outbound provider call in the process
+
+    Budgets come from ANTHROPIC_RPM / ANTHROPIC_TPM, OPENAI_RPM / OPENAI_TPM and BRAVE_RPM
+    (0 or unset = unlimited);
+    QUOTA_BATCH_AGING_SECONDS (default 120) bounds how long batch work can be held back.
+    The caller's priority class and tenant come from quota_context().
+    """
+
+    def __init__(self):
+        aging = float(os.getenv("QUOTA_BATCH_AGING_SECONDS", "120"))
+        self.providers: Dict[str, ProviderQuota] = {
+            "anthropic": ProviderQuota(
+                "anthropic",
+                rpm=float(os.getenv("ANTHROPIC_RPM", "0")),
+                tpm=float(os.getenv("ANTHROPIC_TPM", "0")),
+                aging=aging
+            ),
+            "openai": ProviderQuota(
+                "openai",
+                rpm=float(os.getenv("OPENAI_RPM", "0")),
+                tpm=float(os.getenv("OPENAI_TPM", "0")),
+                aging=aging
+            ),
+            "brave": ProviderQuota("brave", rpm=float(os.getenv("BRAVE_RPM", "0")), aging=aging),
+        }
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, provider: str, tokens: int = 0) -> AsyncIterator[Reservation]:
+        """Hold one request and `tokens` of budget for the block
+
+        Set reservation.used to the tokens actually billed; if the call fails before
+        reporting usage the full reservation is charged.
+        """
+        quota = self.providers[provider]
+        reservation = await quota.acquire(tokens, _priority.get(), _tenant.get())
+        try:
+            yield reservation
+        finally:
+            quota.settle(reservation, reservation.tokens if reservation.used is None else reservation.used)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: quota.stats() for name, quota in self.providers.items()}
+
+
+@contextlib.contextmanager
+def quota_context(priority: Optional[str] = None, tenant: Optional[str] = None) -> Iterator[None]:
+    """Bind the priority class and tenant that provider calls in this context are scheduled under"""
+    priority_token = _priority.set(priority or DEFAULT_PRIORITY)
+    tenant_token = _tenant.set(tenant or DEFAULT_TENANT)
+    try:
+        yield
+    finally:
+        _priority.reset(priority_token)
+        _tenant.reset(tenant_token)
+
+
+def quota_scope(node: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an async graph node so its provider calls run under the run's priority and tenant"""
+
+    async def scoped_node(state: Dict[str, Any]) -> Any:
+        with quota_context(state.get("request_priority"), state.get("tenant")):
+            return await node(state)
+
+    scoped_node.__name__ = getattr(node, "__name__", "node")
+    scoped_node.__doc__ = node.__doc__
+    return scoped_node
+
+
+# Shared scheduler for LLM and search calls
+quota_scheduler = QuotaScheduler()
@@ -0,0 +1,120 @@
+# agent/report_cache.py - Full-report cache keyed on the normalized request
+
+import functools
+import hashlib
+import inspect
+import os
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from agent.cache import TieredCache
+
+# Final-state keys whose "Error ..." values mean the run should not be cached
+REPORT_SECTION_KEYS = [
+    "psychological_analysis",
+    "conversion_intelligence",
+    "competitor_analysis",
+    "psychological_interviews",
+    "sales_intelligence_interviews",
+    "synthesis_results",
+    "formatted_report",
+]
+
+
+# Workflow node -> report sections it writes; a cached run must have every planned one filled in
+NODE_SECTIONS = {
+    "psych_analysis_agent": ["psychological_analysis"],
+    "conversion_agent": ["conversion_intelligence"],
+    "competitor_discovery": ["competitor_analysis"],
+    "psych_interview_agent": ["psychological_interviews"],
+    "sales_interview_agent": ["sales_intelligence_interviews"],
+    "campaign_synthesis": ["synthesis_results"],
+    "express_research": ["psychological_analysis", "conversion_intelligence", "synthesis_results"],
+    "format_outputs": ["formatted_report"],
+}
+
+
+def planned_sections(result: Dict[str, Any]) -> List[str]:
+    """Report sections the run's execution plan should have produced - formatted_report always"""
+    sections = ["formatted_report"]
+    for node in result.get("execution_plan") or []:
+        sections.extend(key for key in NODE_SECTIONS.get(node, []) if key not in sections)
+    return sections
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    """Every planned section is a non-empty string and no section reports an error"""
+    if any(str(result.get(key, "")).startswith("Error") for key in REPORT_SECTION_KEYS):
+        return False
+    return all(isinstance(result.get(key), str) and result[key].strip() for key in planned_sections(result))
+
+
+def normalize_business_context(business_context: str) -> str:
+    """Collapse whitespace variants so retries of the same context share a cache entry"""
+    return " ".join(unicodedata.normalize("NFC", business_context).split())
+
+
+@functools.lru_cache(maxsize=1)
+def prompt_version() -> str:
+    """Fingerprint of the prompt-bearing modules - any prompt edit invalidates cached reports"""
+    import agent.digest
+    import agent.graph
+    import prompts.research_prompts
+
+    digest = hashlib.sha256()
+    for module in (prompts.research_prompts, agent.graph, agent.digest):
+        digest.update(inspect.getsource(module).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def report_cache_key(business_context: str, research_type: str, plan: str = "full") -> str:
+    raw = "\x1f".join([normalize_business_context(business_context), research_type, plan, prompt_version()])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def plan_signature(nodes: List[str], full_nodes: List[str]) -> str:
+    """Cache namespace for an execution plan - "full" for the complete workflow"""
+    return "full" if list(nodes) == list(full_nodes) else ",".join(nodes)
+
+
+class ReportCache:
+    """Caches the final graph state for identical research requests
+
+    Failed or incomplete runs (any section starting with "Error", or a planned section
+    missing or empty) are never stored, so a retry always re-runs the graph.
+    """
+
+    def __init__(self, cache: Optional[TieredCache] = None):
+        self.enabled = os.getenv("REPORT_CACHE_ENABLED", "true").lower() == "true"
+        self.cache = cache or TieredCache(
+            "reports",
+            max_entries=int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "64")),
+            max_disk_entries=int(os.getenv("REPORT_CACHE_MAX_DISK_ENTRIES", "1000")),
+            ttl=float(os.getenv("REPORT_CACHE_TTL", "86400"))
+        )
+
+    def get(self, business_context: str, research_type: str, plan: str = "full") -> Optional[Dict[str, Any]]:
+        """Cached final state - partial plans also accept a cached full run"""
+        if not self.enabled:
+            return None
+        cached = self.cache.get(report_cache_key(business_context, research_type, plan))
+        if cached is None and plan != "full":
+            cached = self.cache.get(report_cache_key(business_context, research_type))
+        return cached
+
+    def set(self, business_context: str, research_type: str, result: Dict[str, Any],
+            plan: str = "full") -> bool:
+        """Store a finished run - returns False when the run is not cacheable"""
+        if not self.enabled:
+            return False
+        if not is_cacheable(result):
+            return False
+        self.cache.set(report_cache_key(business_context, research_type, plan), result)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, **self.cache.stats()}
+
+
+# Shared report cache used by the API endpoints
+report_cache = ReportCache()
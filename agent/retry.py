@@ -0,0 +1,241 @@
+# agent/retry.py - Deadline-bounded retries and hedged requests for LLM calls
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from agent.concurrency import AdaptiveLimiter, is_overload, LLM_LIMITERS
+from agent.llm_registry import provider_of
+from agent.metrics import observe_llm_hedge, observe_llm_retry
+from agent.quota import quota_scheduler
+from agent.token_budget import estimate_prompt_tokens
+from agent.tracing import percentile
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth another attempt: timeouts, conflicts, rate limits and server-side failures
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504, 529)
+
+# Anthropic SDK errors that carry no status code but are transient
+RETRYABLE_ERROR_NAMES = ("APIConnectionError", "APITimeoutError")
+
+
+def is_retryable(error: BaseException) -> bool:
+    if is_overload(error) or isinstance(error, httpx.TransportError):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status in RETRYABLE_STATUS_CODES
+
+
+def billed_tokens(result: Any) -> int:
+    """Tokens a response counts against the provider's TPM budget - cache reads are excluded"""
+    usage = getattr(result, "usage_metadata", None) or {}
+    cache_read = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+    return usage.get("input_tokens", 0) - cache_read + usage.get("output_tokens", 0)
+
+
+def retry_after(error: BaseException) -> float:
+    """Seconds the provider asked us to wait (retry-after header), 0 if none"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class LLMCallPolicy:
+    """Retries with full-jitter backoff inside a per-call deadline, plus optional hedging
+
+    Every provider request - first attempt, retry or hedge - reserves its estimated
+    prompt plus max_tokens against the provider's shared quota and holds a slot of the
+    adaptive concurrency limit, so retries and hedges are budgeted like any other call.
+    Each attempt streams the response so time-to-first-token is observable. When an
+    attempt has produced no token by the LLM_HEDGE_PERCENTILE of recent first-token
+    times for that agent, a duplicate request is started; whichever streams a token
+    first is kept and the other is cancelled. Hedges are capped at LLM_HEDGE_MAX_RATIO
+    of calls so a provider-wide slowdown can't double the load, and none are sent while
+    the provider's limiter is backing off from a 429 / 529 / timeout or has no free slot.
+
+    Settings: LLM_RETRY_ATTEMPTS (3), LLM_RETRY_BASE_DELAY (1s), LLM_RETRY_MAX_DELAY (20s),
+    LLM_CALL_DEADLINE (300s across all attempts), LLM_HEDGE_ENABLED (true),
+    LLM_HEDGE_PERCENTILE (95), LLM_HEDGE_MIN_SAMPLES (20), LLM_HEDGE_MAX_RATIO (0.1).
+    """
+
+    def __init__(self):
+        self.max_attempts = int(os.getenv("LLM_RETRY_ATTEMPTS", "3"))
+        self.base_delay = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+        self.max_delay = float(os.getenv("LLM_RETRY_MAX_DELAY", "20"))
+        self.deadline = float(os.getenv("LLM_CALL_DEADLINE", "300"))
+        self.hedge_enabled = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+        self.hedge_percentile = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+        self.hedge_min_samples = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+        self.hedge_max_ratio = float(os.getenv("LLM_HEDGE_MAX_RATIO", "0.1"))
+        self._first_token: Dict[str, deque] = defaultdict(lambda: deque(maxlen=200))
+        self.calls = 0
+        self.hedges = 0
+        self.retries = 0
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Full jitter: uniform(0, min(max_delay, base * 2^(attempt-1))), never below retry-after"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return max(random.uniform(0, ceiling), retry_after(error))
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Seconds to wait for a first token before hedging - None until enough samples exist"""
+        samples = self._first_token[key]
+        if not self.hedge_enabled or len(samples) < self.hedge_min_samples:
+            return None
+        if self.hedges >= self.hedge_max_ratio * self.calls:
+            return None
+        return percentile(sorted(samples), self.hedge_percentile)
+
+    async def call(self, key: str, llm, prompt: Any, span=None) -> Any:
+        """Run one LLM request under the policy - raises the last error once retries or the deadline run out"""
+        self.calls += 1
+        deadline = time.monotonic() + self.deadline
+        reserved = estimate_prompt_tokens(prompt) + (getattr(llm, "max_tokens", 0) or 0)
+        quota_waits: List[float] = []
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result, hedged = await self._hedged(key, llm, prompt, deadline, reserved, quota_waits)
+                if span is not None:
+                    span.set(attempts=attempt, hedged=hedged, quota_wait=round(sum(quota_waits), 3))
+                return result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = self.backoff(attempt, e)
+                if attempt >= self.max_attempts or not is_retryable(e) or time.monotonic() + delay >= deadline:
+                    if span is not None:
+                        span.set(attempts=attempt, quota_wait=round(sum(quota_waits), 3))
+                    raise
+                self.retries += 1
+                observe_llm_retry(key, type(e).__name__)
+                logger.warning(f"🔁 {key}: {type(e).__name__} - retrying in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{self.max_attempts})")
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def hedge_allowed(limiter: AdaptiveLimiter) -> bool:
+        """Hedges add load - never while the limiter recovers from an overload cut or is full"""
+        return not limiter.backing_off and not limiter.saturated
+
+    async def _hedged(self, key: str, llm, prompt: Any, deadline: float,
+                      reserved: int, quota_waits: List[float]) -> Tuple[Any, bool]:
+        """(result, whether a hedge was fired) for one attempt, hedging a straggler if allowed"""
+        limiter = LLM_LIMITERS[provider_of(llm)]
+        primary_token = asyncio.Event()
+        primary = asyncio.ensure_future(self._attempt(key, llm, prompt, deadline, primary_token, reserved, quota_waits))
+        hedge_after = self.hedge_delay(key)
+        if hedge_after is None or limiter.backing_off:
+            return await primary, False
+
+        token_wait = asyncio.ensure_future(primary_token.wait())
+        try:
+            done, _ = await asyncio.wait({primary, token_wait}, timeout=hedge_after,
+                                         return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        finally:
+            token_wait.cancel()
+        if done:
+            return await primary, False
+        if not self.hedge_allowed(limiter):
+            # Overload or saturation since the attempt started - wait for the primary instead
+            observe_llm_hedge(key, "suppressed")
+            return await primary, False
+
+        self.hedges += 1
+        logger.info(f"🪝 {key}: no first token after {hedge_after:.1f}s - sending a hedged request")
+        hedge_token = asyncio.Event()
+        hedge = asyncio.ensure_future(self._attempt(key, llm, prompt, deadline, hedge_token, reserved, quota_waits))
+        return await self._race(key, [(primary, primary_token, "primary"), (hedge, hedge_token, "hedge")]), True
+
+    async def _race(self, key: str, contenders: List[Tuple[asyncio.Future, asyncio.Event, str]]) -> Any:
+        """Keep the first attempt to stream a token (or finish), cancel the rest"""
+        pending = list(contenders)
+        try:
+            while True:
+                for task, token, label in pending:
+                    if token.is_set() or (task.done() and not task.cancelled() and task.exception() is None):
+                        for other, _, _ in pending:
+                            if other is not task:
+                                other.cancel()
+                        observe_llm_hedge(key, f"{label}_won")
+                        return await task
+
+                failed = [contender for contender in pending if contender[0].done()]
+                pending = [contender for contender in pending if not contender[0].done()]
+                if not pending:
+                    return await failed[-1][0]
+                if failed and len(pending) == 1:
+                    # The other attempt failed before streaming anything - this one is all we have
+                    observe_llm_hedge(key, f"{pending[0][2]}_won")
+                    return await pending[0][0]
+
+                signals = [asyncio.ensure_future(token.wait()) for _, token, _ in pending]
+                try:
+                    await asyncio.wait([task for task, _, _ in pending] + signals,
+                                       return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    for signal in signals:
+                        signal.cancel()
+        finally:
+            for task, _, _ in contenders:
+                if not task.done():
+                    task.cancel()
+
+    async def _attempt(self, key: str, llm, prompt: Any, deadline: float, first_token: asyncio.Event,
+                       reserved: int, quota_waits: List[float]) -> Any:
+        """One provider request under its own quota reservation and concurrency slot
+
+        The reservation is settled to the billed tokens once the response reports usage;
+        a failed request is charged the full reservation.
+        """
+        provider = provider_of(llm)
+        async with quota_scheduler.reserve(provider, reserved) as reservation:
+            quota_waits.append(reservation.waited)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError(f"{key}: LLM call deadline of {self.deadline:.0f}s exceeded")
+            async with LLM_LIMITERS[provider].slot(key):
+                result = await asyncio.wait_for(self._stream(key, llm, prompt, first_token), remaining)
+            reservation.used = billed_tokens(result)
+            return result
+
+    async def _stream(self, key: str, llm, prompt: Any, first_token: asyncio.Event) -> Any:
+        """Stream one response, aggregating chunks - usage metadata is summed across them"""
+        start = time.monotonic()
+        result = None
+        async for chunk in llm.astream(prompt):
+            if chunk.content and not first_token.is_set():
+                first_token.set()
+                self._first_token[key].append(time.monotonic() - start)
+            result = chunk if result is None else result + chunk
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "first_token_p50": {
+                key: round(percentile(sorted(samples), 50), 3) for key, samples in self._first_token.items() if samples
+            },
+            "hedge_after": {key: self.hedge_delay(key) for key in self._first_token}
+        }
+
+
+# Shared policy used by call_llm
+llm_call_policy = LLMCallPolicy()
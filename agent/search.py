@@ -0,0 +1,193 @@
+# agent/search.py - Async Brave Search client
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from agent.cache import TieredCache
+from agent.executor import run_sync
+from agent.http_layer import http_layer, BRAVE_SEARCH_HOST
+from agent.tracing import tracer
+from agent.quota import quota_scheduler
+from agent.concurrency import search_limiter
+
+logger = logging.getLogger(__name__)
+
+# Overridable so load tests can point search at a local stand-in
+BRAVE_SEARCH_URL = os.getenv("BRAVE_SEARCH_URL", "https://api.search.brave.com/res/v1/web/search")
+
+# Length of each Brave freshness window in seconds
+FRESHNESS_WINDOWS = {
+    "pd": 86400,        # Past day
+    "pw": 86400 * 7,    # Past week
+    "pm": 86400 * 31,   # Past month
+    "py": 86400 * 365,  # Past year
+}
+
+
+def build_search_params(query: str, num_results: int = 10, freshness: Optional[str] = None) -> Dict[str, Any]:
+    """Brave query parameters shared by the sync and async search paths"""
+    return {
+        "q": query,
+        "count": num_results,
+        "offset": 0,
+        "mkt": "en-US",
+        "safesearch": "moderate",
+        "freshness": freshness or os.getenv("BRAVE_SEARCH_FRESHNESS", "pd"),  # Past day for fresh results
+        "text_decorations": False,
+        "spellcheck": True
+    }
+
+
+def search_cache_key(params: Dict[str, Any]) -> str:
+    """Cache key over the query and every parameter that shapes the results"""
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def search_cache_ttl(freshness: str) -> float:
+    """Cache lifetime as a fraction of the freshness window (SEARCH_CACHE_TTL_FRACTION, default 1/4)
+
+    Results for a past-day search stay cached for 6 hours, so a cached answer is never
+    meaningfully staler than what the freshness filter already allows.
+    """
+    window = FRESHNESS_WINDOWS.get(freshness, FRESHNESS_WINDOWS["pd"])
+    return window * float(os.getenv("SEARCH_CACHE_TTL_FRACTION", "0.25"))
+
+
+# Shared search-result cache - hot queries in memory, the rest on disk
+search_cache = TieredCache(
+    "search",
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "512")),
+    max_disk_entries=int(os.getenv("SEARCH_CACHE_MAX_DISK_ENTRIES", "20000")),
+    ttl=search_cache_ttl("pd")
+)
+
+
+def build_search_headers(api_key: str) -> Dict[str, str]:
+    """Brave request headers"""
+    return {
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip",
+        "X-Subscription-Token": api_key
+    }
+
+
+def format_search_results(query: str, data: Dict[str, Any]) -> str:
+    """Format a Brave API response into the string agents consume"""
+    results = []
+    if "web" in data and "results" in data["web"]:
+        for result in data["web"]["results"]:
+            formatted_result = {
+                "title": result.get("title", ""),
+                "url": result.get("url", ""),
+                "description": result.get("description", ""),
+                "age": result.get("age", ""),
+                "language": result.get("language", "")
+            }
+            results.append(formatted_result)
+
+    # Create formatted string for agent analysis
+    formatted_output = f"Web Search Results for: {query}\n\n"
+    for i, result in enumerate(results, 1):
+        formatted_output += f"{i}. {result['title']}\n"
+        formatted_output += f"   URL: {result['url']}\n"
+        formatted_output += f"   Description: {result['description']}\n"
+        formatted_output += f"   Age: {result['age']}\n\n"
+
+    if not results:
+        formatted_output += "No results found for this query.\n"
+
+    logger.info(f"✅ Found {len(results)} results")
+    return formatted_output
+
+
+class BraveSearchClient:
+    """Concurrent Brave Search client with per-request timeouts and bounded concurrency
+
+    Every query resolves to a formatted string - failures and timeouts become error
+    strings in their own slot so one slow query never stalls or sinks the others.
+    Successful results are cached per query and parameters for a TTL tied to the
+    freshness window; errors are never cached.
+    """
+
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None):
+        self._api_key = api_key
+        self.timeout = timeout or float(os.getenv("BRAVE_SEARCH_TIMEOUT", "8"))
+        self.max_concurrency = max_concurrency or int(os.getenv("BRAVE_SEARCH_MAX_CONCURRENCY", "4"))
+
+    @property
+    def api_key(self) -> Optional[str]:
+        """Resolved per call so keys loaded after import are still picked up"""
+        return self._api_key or os.getenv("BRAVE_SEARCH_API_KEY")
+
+    async def search(self, query: str, num_results: int = 10,
+                     client: Optional[httpx.AsyncClient] = None) -> str:
+        """Run one query - returns formatted results or an error string"""
+        with tracer.span("search:brave", kind="search", query=query) as span:
+            result = await self._search(query, num_results, client, span)
+            span.set(error=result.startswith("Error"), result_chars=len(result))
+            return result
+
+    async def _search(self, query: str, num_results: int,
+                      client: Optional[httpx.AsyncClient], span) -> str:
+        if not self.api_key:
+            return "Error: BRAVE_SEARCH_API_KEY not found in environment variables"
+
+        client = client or http_layer.client_for(BRAVE_SEARCH_HOST)
+        params = build_search_params(query, num_results)
+        cache_key = search_cache_key(params)
+
+        cached = await run_sync(search_cache.get, cache_key)
+        span.set(cached=cached is not None)
+        if cached is not None:
+            logger.info(f"⚡ Search cache hit for: {query}")
+            return cached
+
+        logger.info(f"🔍 Searching web for: {query}")
+
+        try:
+            async with quota_scheduler.reserve("brave") as reservation, search_limiter.slot():
+                span.set(quota_wait=round(reservation.waited, 3))
+                response = await asyncio.wait_for(
+                    client.get(
+                        BRAVE_SEARCH_URL,
+                        headers=build_search_headers(self.api_key),
+                        params=params,
+                        timeout=self.timeout
+                    ),
+                    timeout=self.timeout
+                )
+                # Inside the slot so 429s reach the limiter
+                response.raise_for_status()
+            formatted_output = format_search_results(query, response.json())
+            await run_sync(search_cache.set, cache_key, formatted_output, search_cache_ttl(params["freshness"]))
+            return formatted_output
+
+        except asyncio.TimeoutError:
+            error_msg = f"Error searching web: timed out after {self.timeout:.0f}s for query '{query}'"
+        except httpx.HTTPError as e:
+            error_msg = f"Error searching web: {str(e)}"
+        except Exception as e:
+            error_msg = f"Unexpected error in web search: {str(e)}"
+
+        logger.error(f"❌ {error_msg}")
+        return error_msg
+
+    async def search_many(self, queries: List[str], num_results: int = 10) -> List[str]:
+        """Run queries concurrently - results keep the order of the queries"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        client = http_layer.client_for(BRAVE_SEARCH_HOST)
+
+        async def bounded_search(query: str) -> str:
+            async with semaphore:
+                return await self.search(query, num_results, client=client)
+
+        return await asyncio.gather(*(bounded_search(query) for query in queries))
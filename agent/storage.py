@@ -0,0 +1,10 @@
+# agent/storage.py - Local on-disk locations for persistent state
+
+import os
+
+
+def data_path(filename: str) -> str:
+    """Path for a persistent local file under RESEARCH_DATA_DIR (default .data/)"""
+    data_dir = os.getenv("RESEARCH_DATA_DIR", ".data")
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, filename)
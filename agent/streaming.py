@@ -0,0 +1,165 @@
+# agent/streaming.py - Server-sent events for live graph progress
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# State keys that become report sections on the dashboard
+SECTION_KEYS = [
+    "psychological_analysis",
+    "conversion_intelligence",
+    "competitor_analysis",
+    "psychological_interviews",
+    "sales_intelligence_interviews",
+    "synthesis_results",
+]
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Text delta from a chat model chunk - Anthropic chunks may carry content blocks"""
+    content = getattr(chunk, "content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") for block in content
+        if isinstance(block, dict) and block.get("type") in ("text", "text_delta")
+    )
+
+
+async def stream_graph_events(graph, inputs: Dict[str, Any],
+                              config: Optional[Dict[str, Any]] = None,
+                              on_complete: Optional[Callable[[Dict[str, Any]], Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Translate LangGraph's event stream into node_start / attempt / token / node_end / complete events
+
+    Every LLM request a node makes - cascade draft, escalation, retry or hedge - is its
+    own chat model run. Each one opens an attempt event, and tokens are only forwarded
+    for the node's latest attempt, tagged with its number, so a rejected draft or a
+    losing request never mixes into the live text; node_end carries the accepted output.
+
+    on_complete, if given, is awaited with the final state before the complete event -
+    it is skipped when the root run's end event (and so the final state) was never seen.
+    """
+    node_names = {name for name in graph.nodes if not name.startswith("__")}
+    node_started: Dict[str, float] = {}
+    # Node -> (attempt number, run_id) of the LLM request its live section follows
+    live_attempts: Dict[str, Tuple[int, str]] = {}
+    run_start = time.time()
+    final_state: Optional[Dict[str, Any]] = None
+
+    async for event in graph.astream_events(inputs, config=config, version="v2"):
+        kind = event["event"]
+        name = event.get("name")
+        node = event.get("metadata", {}).get("langgraph_node")
+
+        if kind == "on_chain_start" and name in node_names and node == name:
+            node_started[name] = time.time()
+            live_attempts.pop(name, None)
+            yield {"event": "node_start", "node": name, "elapsed": time.time() - run_start}
+
+        elif kind == "on_chat_model_start" and node:
+            attempt = live_attempts.get(node, (0, None))[0] + 1
+            live_attempts[node] = (attempt, event["run_id"])
+            yield {"event": "attempt", "node": node, "attempt": attempt, "run_id": event["run_id"]}
+
+        elif kind == "on_chat_model_stream" and node:
+            attempt, run_id = live_attempts.get(node, (0, None))
+            if event["run_id"] != run_id:
+                continue
+            text = _chunk_text(event["data"].get("chunk"))
+            if text:
+                yield {"event": "token", "node": node, "attempt": attempt, "run_id": run_id, "text": text}
+
+        elif kind == "on_chain_end" and name in node_names and node == name:
+            output = event["data"].get("output") or {}
+            if not isinstance(output, dict):
+                output = {}
+            yield {
+                "event": "node_end",
+                "node": name,
+                "duration": time.time() - node_started.get(name, run_start),
+                "elapsed": time.time() - run_start,
+                "processing_times": output.get("processing_times", {}),
+                "llm_usage": output.get("llm_usage", {}),
+                "model_routes": output.get("model_routes", {}),
+                "sections": {key: output[key] for key in SECTION_KEYS if isinstance(output.get(key), str)}
+            }
+
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            # Root run finished - its output is the final graph state
+            final_state = event["data"].get("output")
+
+    if final_state is None:
+        # The root run's end event never arrived - there is no report to store or record
+        logger.warning("⚠️ Graph stream ended without a final state - skipping on_complete")
+        final_state = {}
+    elif on_complete is not None:
+        await on_complete(final_state)
+    yield complete_event(final_state, time.time() - run_start)
+
+
+def complete_event(final_state: Dict[str, Any], elapsed: float, cached: bool = False) -> Dict[str, Any]:
+    """Final event carrying the finished report"""
+    return {
+        "event": "complete",
+        "session_id": final_state.get("session_id"),
+        "report": final_state.get("psychology_report", ""),
+        "quality_score": final_state.get("quality_score"),
+        "confidence_score": final_state.get("confidence_score"),
+        "processing_times": final_state.get("processing_times", {}),
+        "llm_usage": final_state.get("llm_usage", {}),
+        "model_routes": final_state.get("model_routes", {}),
+        "model_cascade": final_state.get("model_cascade", {}),
+        "elapsed": elapsed,
+        "cached": cached
+    }
+
+
+async def cached_event_stream(final_state: Dict[str, Any]) -> AsyncIterator[str]:
+    """SSE body for a report served from the cache - a single complete event"""
+    item = complete_event(final_state, 0.0, cached=True)
+    yield format_sse(item.pop("event"), item)
+
+
+async def research_event_stream(graph, inputs: Dict[str, Any],
+                                config: Optional[Dict[str, Any]] = None,
+                                heartbeat_seconds: float = 15.0,
+                                on_complete: Optional[Callable[[Dict[str, Any]], Any]] = None) -> AsyncIterator[str]:
+    """SSE body for a research run, with heartbeats so proxies don't drop idle connections"""
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def produce():
+        try:
+            async for item in stream_graph_events(graph, inputs, config=config, on_complete=on_complete):
+                await queue.put(item)
+        except Exception as e:
+            await queue.put({"event": "error", "detail": str(e)})
+        finally:
+            await queue.put(done)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if item is done:
+                break
+            event = item.pop("event")
+            yield format_sse(event, item)
+    finally:
+        # Client disconnects close the generator - stop the run with it
+        if not producer.done():
+            producer.cancel()
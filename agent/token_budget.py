@@ -0,0 +1,180 @@
+# agent/token_budget.py - Per-run prompt token budget with deterministic trimming
+
+import logging
+import math
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Word pieces and punctuation - a local approximation of Claude's BPE tokenizer
+_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Average characters per token, used when a hard character cut is needed
+CHARS_PER_TOKEN = 4
+
+TRIM_MARKER = "\n\n[... trimmed to fit the prompt budget]"
+
+# Workflow node -> share of the run budget, hard cap on variable prompt input, and its input sections.
+# Sections are (priority, cap, floor): lower priority numbers are more valuable and are cut
+# last; a section is never cut below its floor. Static (cached) instructions are not counted.
+NODE_BUDGETS = {
+    "psych_analysis_agent": {
+        "share": 6, "max_tokens": 6000,
+        "sections": {
+            "business_context": (1, 4000, 1500),
+            "industry_patterns": (2, 1500, 0),
+            "learning_context": (3, 1500, 0),
+        }
+    },
+    "conversion_agent": {
+        "share": 6, "max_tokens": 6000,
+        "sections": {
+            "business_context": (1, 3000, 1000),
+            "psychological_analysis": (2, 4000, 1500),
+        }
+    },
+    "competitor_discovery": {
+        "share": 9, "max_tokens": 9000,
+        "sections": {
+            "business_context": (1, 2000, 800),
+            "psychological_analysis": (2, 3000, 1000),
+            "search_results": (3, 5000, 1000),
+        }
+    },
+    "psych_interview_agent": {
+        "share": 4, "max_tokens": 4000,
+        "sections": {"psychological_analysis": (1, 4000, 1500)}
+    },
+    "sales_interview_agent": {
+        "share": 4, "max_tokens": 4000,
+        "sections": {"psychological_analysis": (1, 4000, 1500)}
+    },
+    "campaign_synthesis": {
+        "share": 12, "max_tokens": 12000,
+        "sections": {
+            "psychological_analysis": (1, 3500, 1000),
+            "conversion_intelligence": (2, 3000, 800),
+            "interview_insights": (3, 3500, 800),
+            "competitor_intelligence": (4, 2500, 500),
+        }
+    },
+    "express_research": {
+        "share": 5, "max_tokens": 5000,
+        "sections": {
+            "business_context": (1, 4000, 1500),
+            "industry_patterns": (2, 1500, 0),
+        }
+    },
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count - long words count as several pieces, punctuation as one"""
+    if not text:
+        return 0
+    return sum(
+        max(1, math.ceil(len(piece) / CHARS_PER_TOKEN)) if piece[0].isalnum() or piece[0] == "_" else 1
+        for piece in _PIECE_PATTERN.findall(text)
+    )
+
+
+def estimate_prompt_tokens(prompt: Any) -> int:
+    """estimate_tokens over a string prompt or every text block of a message list"""
+    if isinstance(prompt, str):
+        return estimate_tokens(prompt)
+    total = 0
+    for message in prompt:
+        content = getattr(message, "content", "")
+        if isinstance(content, str):
+            total += estimate_tokens(content)
+        else:
+            total += sum(estimate_tokens(block.get("text", "")) for block in content if isinstance(block, dict))
+    return total
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the head of text within max_tokens, cutting at paragraph, then line, then word boundaries"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    limit = max_tokens - estimate_tokens(TRIM_MARKER)
+    kept = ""
+    for separator in ("\n\n", "\n"):
+        for block in text.split(separator):
+            candidate = f"{kept}{separator}{block}" if kept else block
+            if estimate_tokens(candidate) > limit:
+                break
+            kept = candidate
+        if kept:
+            return kept + TRIM_MARKER
+
+    # A single oversized line - hard cut at the last whitespace before the estimate
+    cut = text[:max(limit, 0) * CHARS_PER_TOKEN]
+    while cut and estimate_tokens(cut) > limit:
+        cut = cut[:int(len(cut) * 0.9)]
+    return cut.rsplit(None, 1)[0] + TRIM_MARKER if " " in cut else cut + TRIM_MARKER
+
+
+class TokenBudget:
+    """Splits a per-run prompt token budget across the planned nodes and fits their inputs
+
+    Each node gets the run budget weighted by its share among the nodes in the plan,
+    never more than its own cap. Inputs are first held to their section caps, then the
+    lowest-priority sections are cut toward their floors until the node fits.
+    """
+
+    def __init__(self, run_budget: Optional[int] = None):
+        # Default: every node gets exactly its cap
+        default_budget = sum(spec["max_tokens"] for spec in NODE_BUDGETS.values())
+        self.run_budget = run_budget or int(os.getenv("PROMPT_TOKEN_BUDGET", str(default_budget)))
+
+    def node_budget(self, node: str, plan: Optional[List[str]] = None) -> int:
+        spec = NODE_BUDGETS[node]
+        planned = [name for name in (plan or NODE_BUDGETS) if name in NODE_BUDGETS] or [node]
+        total_share = sum(NODE_BUDGETS[name]["share"] for name in planned)
+        return min(spec["max_tokens"], int(self.run_budget * spec["share"] / total_share))
+
+    def fit(self, node: str, sections: Dict[str, str],
+            plan: Optional[List[str]] = None) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """(trimmed sections, budget report) for one node's prompt inputs"""
+        spec = NODE_BUDGETS[node]
+        budget = self.node_budget(node, plan)
+        sizes = {key: estimate_tokens(text) for key, text in sections.items()}
+        targets = {
+            key: min(size, spec["sections"].get(key, (99, size, 0))[1])
+            for key, size in sizes.items()
+        }
+
+        overflow = sum(targets.values()) - budget
+        by_value = sorted(targets, key=lambda key: spec["sections"].get(key, (99, 0, 0))[0], reverse=True)
+        for key in by_value:
+            if overflow <= 0:
+                break
+            floor = spec["sections"].get(key, (99, 0, 0))[2]
+            cut = min(overflow, max(targets[key] - floor, 0))
+            targets[key] -= cut
+            overflow -= cut
+
+        fitted = {
+            key: text if targets[key] >= sizes[key] else trim_to_tokens(text, targets[key])
+            for key, text in sections.items()
+        }
+        trimmed = {key: sizes[key] - targets[key] for key in sections if targets[key] < sizes[key]}
+        report = {
+            "budget": budget,
+            "input_tokens": sum(estimate_tokens(text) for text in fitted.values()),
+            "original_tokens": sum(sizes.values()),
+            "trimmed": trimmed
+        }
+        if trimmed:
+            logger.info(f"✂️ {node}: trimmed {', '.join(f'{key} (-{cut})' for key, cut in trimmed.items())} "
+                        f"to fit {budget} token budget")
+        return fitted, report
+
+
+# Shared budget used by the graph nodes
+token_budget = TokenBudget()
@@ -0,0 +1,313 @@
+# agent/tracing.py - In-process spans for nodes, LLM calls and searches
+
+import contextlib
+import contextvars
+import hashlib
+import json
+import logging
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+
+from agent.storage import data_path
+
+logger = logging.getLogger(__name__)
+
+# Active run id and innermost open span for the current task / thread
+_current_run: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("trace_run_id", default=None)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("trace_span", default=None)
+
+
+def span_elapsed() -> float:
+    """Seconds since the innermost open span started - the node's own span inside a node body"""
+    span = _current_span.get()
+    return span.duration if span is not None else 0.0
+
+
+class Span:
+    """One timed operation within a research run"""
+
+    __slots__ = ("run_id", "span_id", "parent_id", "name", "kind", "start", "end", "attributes", "error")
+
+    def __init__(self, run_id: str, name: str, kind: str,
+                 parent_id: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.run_id = run_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.attributes = dict(attributes or {})
+        self.error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.time()) - self.start
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start,
+            "end": self.end,
+            "duration": round(self.duration, 4),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """OTLP/HTTP JSON payload - the run id is hashed into the 16-byte trace id"""
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+        "scopeSpans": [{
+            "scope": {"name": "agent.tracing"},
+            "spans": [{
+                "traceId": hashlib.sha256(span.run_id.encode("utf-8")).hexdigest()[:32],
+                "spanId": span.span_id,
+                "parentSpanId": span.parent_id or "",
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(int(span.start * 1e9)),
+                "endTimeUnixNano": str(int((span.end or span.start) * 1e9)),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in {**span.attributes, "run_id": span.run_id, "span.kind": span.kind}.items()
+                ],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1}
+            } for span in spans]
+        }]
+    }]}
+
+
+class SpanExporter:
+    """Background thread that batches finished spans to a JSON-lines file or an OTLP collector
+
+    TRACE_EXPORT selects the target: "jsonl" (default, TRACE_JSONL_PATH), "otlp"
+    (OTEL_EXPORTER_OTLP_ENDPOINT, default http://localhost:4318) or "none".
+    The JSON-lines file is rotated once it reaches TRACE_JSONL_MAX_MB (default 50),
+    keeping TRACE_JSONL_BACKUPS (default 3) older files as traces.jsonl.1, .2, ...
+    Export never blocks the graph - spans are dropped if the queue is full.
+    """
+
+    def __init__(self, target: Optional[str] = None, batch_size: int = 64, flush_interval: float = 2.0):
+        self.target = (target or os.getenv("TRACE_EXPORT", "jsonl")).lower()
+        self.path = os.getenv("TRACE_JSONL_PATH") or data_path("traces.jsonl")
+        self.endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318").rstrip("/") + "/v1/traces"
+        self.service_name = os.getenv("OTEL_SERVICE_NAME", "market-research-intelligence")
+        self.max_bytes = int(float(os.getenv("TRACE_JSONL_MAX_MB", "50")) * 1024 * 1024)
+        self.backups = int(os.getenv("TRACE_JSONL_BACKUPS", "3"))
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=10000)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        if self.target == "none":
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size and time.time() < deadline:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.time(), 0.01)))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.warning(f"⚠️ Span export to {self.target} failed: {str(e)}")
+
+    def _write(self, batch: List[Span]):
+        if self.target == "otlp":
+            requests.post(self.endpoint, json=to_otlp(batch, self.service_name), timeout=5).raise_for_status()
+        else:
+            self._rotate_if_full()
+            with open(self.path, "a", encoding="utf-8") as handle:
+                for span in batch:
+                    handle.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+    def _rotate_if_full(self):
+        """Shift traces.jsonl -> .1 -> .2 ... once it reaches max_bytes, dropping the oldest"""
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+        except OSError:
+            return
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Tracer:
+    """Creates spans, keeps recent runs in memory and aggregates latency per span name"""
+
+    def __init__(self, exporter: Optional[SpanExporter] = None,
+                 max_runs: int = 200, samples_per_name: int = 1000):
+        self.exporter = exporter or SpanExporter()
+        self.max_runs = max_runs
+        self._runs: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._durations: Dict[str, deque] = defaultdict(lambda: deque(maxlen=samples_per_name))
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def run(self, run_id: str) -> Iterator[str]:
+        """Bind a run id to the current context - spans opened inside belong to it"""
+        token = _current_run.set(run_id)
+        try:
+            yield run_id
+        finally:
+            _current_run.reset(token)
+
+    @contextlib.contextmanager
+    def span(self, name: str, kind: str = "internal", run_id: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+        """Time a block as a child of the current span; exceptions mark the span as failed"""
+        parent = _current_span.get()
+        run_id = run_id or _current_run.get() or (parent.run_id if parent else "untraced")
+        span = Span(run_id, name, kind, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end = time.time()
+            self._finish(span)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self._durations[span.name].append(span.duration)
+            spans = self._runs.setdefault(span.run_id, [])
+            spans.append(span)
+            self._runs.move_to_end(span.run_id)
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+        self.exporter.export(span)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/p99 latency (seconds) per span name over recent samples"""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._durations.items()}
+        return {
+            name: {
+                "count": len(values),
+                "p50": round(percentile(values, 50), 4),
+                "p95": round(percentile(values, 95), 4),
+                "p99": round(percentile(values, 99), 4),
+                "max": round(values[-1], 4)
+            }
+            for name, values in samples.items() if values
+        }
+
+    def spans_for(self, run_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            spans = list(self._runs.get(run_id, []))
+        return [span.to_dict() for span in sorted(spans, key=lambda s: s.start)]
+
+    def critical_path(self, run_id: str) -> List[Dict[str, Any]]:
+        """Chain of node spans that determined the run's wall-clock time
+
+        Walks back from the node that finished last, each step taking the node that
+        finished last before the current one started - the branch that gated it.
+        """
+        with self._lock:
+            nodes = [span for span in self._runs.get(run_id, []) if span.kind == "node" and span.end]
+        if not nodes:
+            return []
+
+        current = max(nodes, key=lambda span: span.end)
+        path = [current]
+        while True:
+            upstream = [span for span in nodes if span.end <= current.start + 0.001 and span is not current]
+            if not upstream:
+                break
+            current = max(upstream, key=lambda span: span.end)
+            path.append(current)
+
+        path.reverse()
+        run_start = path[0].start
+        return [{
+            "node": span.name,
+            "start_offset": round(span.start - run_start, 3),
+            "duration": round(span.duration, 3),
+            "share": round(span.duration / max(path[-1].end - run_start, 1e-9), 3)
+        } for span in path]
+
+
+def trace_node(name: str, node: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an async graph node in a span keyed to the run's thread id
+
+    Without a thread id the run bound by tracer.run() is used, and failing that a
+    fresh id - session ids are only second-resolution and would merge concurrent runs.
+    """
+
+    # Not functools.wraps: LangGraph passes the run config only to nodes whose own
+    # signature asks for it, and __wrapped__ would expose the inner (state-only) one
+    async def traced_node(state: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Any:
+        configurable = (config or {}).get("configurable", {})
+        run_id = configurable.get("thread_id") or _current_run.get() or uuid.uuid4().hex
+        with tracer.run(run_id), tracer.span(name, kind="node", tier=state.get("research_tier") or ""):
+            return await node(state)
+
+    traced_node.__name__ = getattr(node, "__name__", name)
+    traced_node.__doc__ = node.__doc__
+    return traced_node
+
+
+# Shared tracer for the graph, LLM and search spans
+tracer = Tracer()
@@ -0,0 +1,7 @@
+# benchmarks - Offline benchmarks for the research graph's own overhead
+#
+# LLM and search providers are replaced by deterministic stubs (benchmarks/stubs.py),
+# so results measure orchestration, state handling and rendering - not provider latency.
+#
+#   python -m benchmarks --output benchmarks/results/latest.json
+#   python -m benchmarks --baseline benchmarks/results/main.json
@@ -0,0 +1,126 @@
+# benchmarks/__main__.py - Run the offline benchmark suite and write JSON results
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict
+
+# Keep benchmark spans in memory only - set before the agent modules are imported
+os.environ.setdefault("TRACE_EXPORT", "none")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Numeric leaves keyed by dotted path, for comparing two result files"""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = float(value)
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """Print p50/p95 and throughput deltas vs a baseline - returns the number of regressions"""
+    now, before = flatten(current["results"]), flatten(baseline["results"])
+    regressions = 0
+    for path in sorted(now):
+        if path not in before or not before[path]:
+            continue
+        if not path.endswith((".p50", ".p95", "runs_per_second")):
+            continue
+        change = (now[path] - before[path]) / before[path]
+        worse = -change if path.endswith("runs_per_second") else change
+        flag = "❌" if worse > threshold else "  "
+        regressions += worse > threshold
+        print(f"{flag} {path}: {before[path]:.3f} -> {now[path]:.3f} ({change:+.1%})")
+    return regressions
+
+
+async def run_suite(args) -> Dict[str, Any]:
+    from benchmarks.stubs import StubProfile
+    from benchmarks import suite
+
+    zero_latency = StubProfile(output_tokens={"default": args.output_tokens} if args.output_tokens else None)
+    realistic = StubProfile(
+        llm_latency=args.llm_latency,
+        search_latency=args.search_latency,
+        output_tokens={"default": args.output_tokens} if args.output_tokens else None
+    )
+
+    print(f"⏱️ Node overhead ({args.runs} runs, zero-latency stubs)...")
+    node_overhead = await suite.bench_node_overhead(zero_latency, args.runs, args.tier)
+    print("⏱️ State handling...")
+    state_handling = await suite.bench_state_handling(zero_latency, args.runs, args.tier)
+    print(f"⏱️ format_outputs rendering at {args.format_sizes} chars per section...")
+    format_outputs = suite.bench_format_outputs(args.format_sizes, args.runs)
+    print(f"⏱️ Throughput at concurrency {args.concurrency}...")
+    throughput = await suite.bench_throughput(realistic, args.concurrency, args.tier)
+
+    return {
+        "schema": 1,
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tier": args.tier,
+            "zero_latency_profile": zero_latency.describe(),
+            "throughput_profile": realistic.describe()
+        },
+        "results": {
+            "node_overhead": node_overhead,
+            "state_handling": state_handling,
+            "format_outputs_ms": format_outputs,
+            "throughput": throughput
+        }
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the research graph")
+    parser.add_argument("--runs", type=int, default=20, help="Sequential runs per overhead benchmark")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--tier", default="deep", choices=["express", "standard", "deep"])
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Stub LLM latency (s) for the throughput run")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="Stub search latency (s) for the throughput run")
+    parser.add_argument("--output-tokens", type=int, default=None, help="Override stub output size for every task")
+    parser.add_argument("--format-sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--output", default="benchmarks/results/latest.json")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_suite(args))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(results, baseline, args.threshold)
+        print(f"{'❌' if regressions else '✅'} {regressions} regression(s) beyond {args.threshold:.0%}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+# benchmarks/stubs.py - Deterministic LLM and search stand-ins for offline benchmarks
+
+import asyncio
+import contextlib
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from agent.token_budget import estimate_tokens
+
+# Fixed vocabulary so stub output is identical from run to run
+_VOCABULARY = (
+    "customers feel frustrated with slow onboarding and want proof that the switch "
+    "pays off quickly while peers quietly judge every purchase decision they make"
+).split()
+
+# Output size per model route when the profile doesn't override it (approximate tokens)
+DEFAULT_OUTPUT_TOKENS = {
+    "psychological_analysis": 4000,
+    "conversion_intelligence": 2500,
+    "competitor_analysis": 2500,
+    "psychological_interviews": 3000,
+    "sales_intelligence_interviews": 3000,
+    "campaign_synthesis": 2500,
+    "express_research": 2500,
+    "digest": 300,
+    "default": 2500,
+}
+
+
+def filler_text(tokens: int, offset: int = 0) -> str:
+    """Roughly `tokens` tokens of deterministic prose, broken into paragraphs"""
+    words = [_VOCABULARY[(offset + i) % len(_VOCABULARY)] for i in range(max(tokens, 1))]
+    paragraphs = [" ".join(words[i:i + 60]) + "." for i in range(0, len(words), 60)]
+    return "\n\n".join(paragraphs)
+
+
+def prompt_text(prompt: Any) -> str:
+    """Flatten a string or message-list prompt for token estimation"""
+    if isinstance(prompt, str):
+        return prompt
+    parts = []
+    for message in prompt:
+        content = getattr(message, "content", "")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content if isinstance(block, dict))
+    return "\n".join(parts)
+
+
+class StubLLM:
+    """Chat model stand-in: fixed latency, fixed-size output, realistic usage metadata"""
+
+    def __init__(self, task_type: str, latency: float, output_tokens: int, model: str = "stub-model"):
+        self.task_type = task_type
+        self.latency = latency
+        self.output_tokens = output_tokens
+        self.model = model
+
+    def _content(self) -> str:
+        if self.task_type == "digest":
+            return json.dumps({
+                field: [filler_text(12, offset=i).rstrip(".") for i in range(4)]
+                for field in ("archetypes", "pains", "objections", "triggers", "quotes", "opportunities")
+            })
+        if self.task_type == "express_research":
+            third = self.output_tokens // 3
+            return "\n\n".join(
+                f"## {heading}\n\n{filler_text(third, offset=i)}"
+                for i, heading in enumerate(("PSYCHOLOGICAL ANALYSIS", "CONVERSION INTELLIGENCE", "CAMPAIGN SYNTHESIS"))
+            )
+        return filler_text(self.output_tokens)
+
+    async def ainvoke(self, prompt: Any, *args: Any, **kwargs: Any) -> AIMessage:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        input_tokens = estimate_tokens(prompt_text(prompt))
+        content = self._content()
+        output_tokens = estimate_tokens(content)
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens
+            }
+        )
+
+
+    async def astream(self, prompt: Any, *args: Any, **kwargs: Any) -> AsyncIterator[AIMessageChunk]:
+        """The whole response as one chunk - call_llm streams so it can time the first token"""
+        message = await self.ainvoke(prompt)
+        yield AIMessageChunk(content=message.content, usage_metadata=message.usage_metadata)
+
+
+class StubProfile:
+    """Latency and output-size settings for one benchmark configuration"""
+
+    def __init__(self,
+                 llm_latency: float = 0.0,
+                 search_latency: float = 0.0,
+                 output_tokens: Optional[Dict[str, int]] = None,
+                 search_result_tokens: int = 800):
+        self.llm_latency = llm_latency
+        self.search_latency = search_latency
+        self.output_tokens = {**DEFAULT_OUTPUT_TOKENS, **(output_tokens or {})}
+        self.search_result_tokens = search_result_tokens
+        self.llm_calls = 0
+        self.search_calls = 0
+
+    def get_llm(self, route: str, tier: Optional[str] = None) -> StubLLM:
+        self.llm_calls += 1
+        tokens = self.output_tokens.get(route, self.output_tokens["default"])
+        return StubLLM(route, self.llm_latency, tokens)
+
+    async def search(self, query: str, num_results: int = 10, client: Any = None) -> str:
+        if self.search_latency:
+            await asyncio.sleep(self.search_latency)
+        self.search_calls += 1
+        return f"🔍 Search Results for: {query}\n\n{filler_text(self.search_result_tokens)}"
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "llm_latency": self.llm_latency,
+            "search_latency": self.search_latency,
+            "output_tokens": self.output_tokens,
+            "search_result_tokens": self.search_result_tokens
+        }
+
+
+@contextlib.contextmanager
+def stub_providers(profile: StubProfile) -> Iterator[StubProfile]:
+    """Swap ResearchConfig.get_llm and the Brave client's search for the profile's stubs
+
+    Stub calls are classified as the "anthropic" provider, so for the duration the
+    shared quota and AIMD limiter for it are replaced by unlimited ones and hedging is
+    off - otherwise the numbers measure limiter admission rather than orchestration.
+    Span export is switched off so benchmark runs never land in the real trace file;
+    finished spans stay in memory for tracer.spans_for().
+    """
+    import agent.graph as graph_module
+    from agent.concurrency import AdaptiveLimiter, LLM_LIMITERS
+    from agent.quota import ProviderQuota, quota_scheduler
+    from agent.retry import llm_call_policy
+    from agent.tracing import tracer
+
+    original_get_llm = graph_module.ResearchConfig.__dict__["get_llm"]
+    original_quota = quota_scheduler.providers["anthropic"]
+    original_limiter = LLM_LIMITERS["anthropic"]
+    original_hedge = llm_call_policy.hedge_enabled
+    original_export = tracer.exporter.target
+
+    graph_module.ResearchConfig.get_llm = staticmethod(profile.get_llm)
+    graph_module.search_client.search = profile.search
+    quota_scheduler.providers["anthropic"] = ProviderQuota("anthropic")
+    LLM_LIMITERS["anthropic"] = AdaptiveLimiter("stub", initial=1_000_000, minimum=1_000_000, maximum=1_000_000)
+    llm_call_policy.hedge_enabled = False
+    tracer.exporter.target = "none"
+    try:
+        yield profile
+    finally:
+        graph_module.ResearchConfig.get_llm = original_get_llm
+        del graph_module.search_client.search
+        quota_scheduler.providers["anthropic"] = original_quota
+        LLM_LIMITERS["anthropic"] = original_limiter
+        llm_call_policy.hedge_enabled = original_hedge
+        tracer.exporter.target = original_export
@@ -0,0 +1,188 @@
+# benchmarks/suite.py - Orchestration-overhead benchmarks for the research graph
+
+import asyncio
+import contextlib
+import copy
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterator, List
+
+from langgraph.checkpoint.memory import MemorySaver
+
+import agent.graph as graph_module
+from agent.graph import create_enhanced_intelligence_workflow, DEFAULT_RESEARCH_TIER
+from agent.tracing import tracer, percentile
+from benchmarks.stubs import StubProfile, stub_providers, filler_text
+
+BENCH_CONTEXT = (
+    "B2B SaaS onboarding platform for mid-market HR teams. Customers are HR directors "
+    "frustrated with manual paperwork, slow new-hire ramp-up and compliance risk."
+)
+
+
+def summarize(values: List[float], scale: float = 1000.0) -> Dict[str, float]:
+    """count / mean / p50 / p95 / p99 / max, scaled (default seconds -> ms)"""
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered) * scale, 3),
+        "p50": round(percentile(ordered, 50) * scale, 3),
+        "p95": round(percentile(ordered, 95) * scale, 3),
+        "p99": round(percentile(ordered, 99) * scale, 3),
+        "max": round(ordered[-1] * scale, 3)
+    }
+
+
+def bench_inputs(tier: str) -> Dict[str, Any]:
+    return {
+        "business_context": BENCH_CONTEXT,
+        "research_type": tier,
+        "output_format": "full_json",
+        "research_tier": tier
+    }
+
+
+@contextlib.contextmanager
+def quiet() -> Iterator[None]:
+    """Discard the graph's progress prints and agent log lines - entered once per benchmark, never per concurrent run"""
+    agent_logger = logging.getLogger("agent")
+    level = agent_logger.level
+    # agent.* loggers inherit this level, so nothing below it reaches the root handlers
+    agent_logger.setLevel(logging.CRITICAL + 1)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        agent_logger.setLevel(level)
+
+
+async def run_graph(graph, tier: str, run_id: str) -> float:
+    """One graph run - returns wall seconds"""
+    start = time.perf_counter()
+    await graph.ainvoke(bench_inputs(tier), {"configurable": {"thread_id": run_id}})
+    return time.perf_counter() - start
+
+
+async def bench_node_overhead(profile: StubProfile, runs: int, tier: str = DEFAULT_RESEARCH_TIER) -> Dict[str, Any]:
+    """Per-node time not spent inside (stubbed) LLM or search calls, plus graph-level overhead
+
+    Graph overhead is wall time minus the node spans on the critical path - the
+    scheduling, state merging and channel work LangGraph does between nodes.
+    """
+    graph = create_enhanced_intelligence_workflow(tier=tier)
+    per_node: Dict[str, List[float]] = {}
+    graph_overhead: List[float] = []
+
+    with stub_providers(profile), quiet():
+        for i in range(runs):
+            run_id = f"bench_overhead_{time.time_ns()}_{i}"
+            wall = await run_graph(graph, tier, run_id)
+
+            spans = tracer.spans_for(run_id)
+            provider_time: Dict[str, float] = {}
+            for span in spans:
+                if span["kind"] in ("llm", "search") and span["parent_id"]:
+                    provider_time[span["parent_id"]] = provider_time.get(span["parent_id"], 0.0) + span["duration"]
+            for span in spans:
+                if span["kind"] == "node":
+                    overhead = span["duration"] - provider_time.get(span["span_id"], 0.0)
+                    per_node.setdefault(span["name"], []).append(max(overhead, 0.0))
+
+            critical = sum(step["duration"] for step in tracer.critical_path(run_id))
+            graph_overhead.append(max(wall - critical, 0.0))
+
+    return {
+        "runs": runs,
+        "tier": tier,
+        "node_overhead_ms": {name: summarize(values) for name, values in per_node.items()},
+        "graph_overhead_ms": summarize(graph_overhead)
+    }
+
+
+async def bench_state_handling(profile: StubProfile, runs: int, tier: str = DEFAULT_RESEARCH_TIER) -> Dict[str, Any]:
+    """Cost of carrying and checkpointing state: runs with and without an in-memory checkpointer"""
+    plain = create_enhanced_intelligence_workflow(tier=tier)
+    checkpointed = create_enhanced_intelligence_workflow(checkpointer=MemorySaver(), tier=tier)
+
+    plain_times, checkpointed_times = [], []
+    final_state: Dict[str, Any] = {}
+    with stub_providers(profile), quiet():
+        for i in range(runs):
+            plain_times.append(await run_graph(plain, tier, f"bench_state_plain_{time.time_ns()}_{i}"))
+            run_id = f"bench_state_ckpt_{time.time_ns()}_{i}"
+            checkpointed_times.append(await run_graph(checkpointed, tier, run_id))
+        final_state = (await checkpointed.aget_state({"configurable": {"thread_id": run_id}})).values
+
+    serialize_times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        encoded = json.dumps(final_state, default=str)
+        serialize_times.append(time.perf_counter() - start)
+
+    plain_summary, checkpointed_summary = summarize(plain_times), summarize(checkpointed_times)
+    return {
+        "runs": runs,
+        "plain_run_ms": plain_summary,
+        "checkpointed_run_ms": checkpointed_summary,
+        "checkpoint_overhead_ms_p50": round(checkpointed_summary["p50"] - plain_summary["p50"], 3),
+        "final_state_bytes": len(encoded.encode("utf-8")),
+        "final_state_json_ms": summarize(serialize_times)
+    }
+
+
+def bench_format_outputs(section_sizes: List[int], repeats: int) -> Dict[str, Any]:
+    """format_outputs rendering time with every report section at the given size (characters)"""
+    results = {}
+    for size in section_sizes:
+        text = filler_text(size // 5)[:size]
+        state = {
+            "business_context": BENCH_CONTEXT,
+            "session_id": "bench",
+            "research_tier": DEFAULT_RESEARCH_TIER,
+            "memory_context": {},
+            "quality_score": 0.9,
+            "confidence_score": 0.85,
+            "learning_insights": [],
+            "processing_times": {f"node_{i}": 1.0 for i in range(12)},
+            "prompt_cache_usage": {},
+            "llm_usage": {},
+            "prompt_budget": {},
+            **{key: text for key in (
+                "psychological_analysis", "conversion_intelligence", "competitor_analysis",
+                "psychological_interviews", "sales_intelligence_interviews", "synthesis_results"
+            )}
+        }
+
+        timings = []
+        with quiet():
+            for _ in range(repeats):
+                run_state = copy.copy(state)
+                start = time.perf_counter()
+                graph_module.format_outputs(run_state)
+                timings.append(time.perf_counter() - start)
+        results[str(size)] = summarize(timings)
+    return results
+
+
+async def bench_throughput(profile: StubProfile, concurrency_levels: List[int],
+                           tier: str = DEFAULT_RESEARCH_TIER) -> Dict[str, Any]:
+    """End-to-end runs/second and latency with N graph runs in flight at once"""
+    graph = create_enhanced_intelligence_workflow(tier=tier)
+    results = {}
+    with stub_providers(profile), quiet():
+        for level in concurrency_levels:
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*(
+                run_graph(graph, tier, f"bench_tp_{level}_{time.time_ns()}_{i}") for i in range(level)
+            ))
+            wall = time.perf_counter() - start
+            results[str(level)] = {
+                "wall_s": round(wall, 4),
+                "runs_per_second": round(level / wall, 3),
+                "latency_ms": summarize(list(latencies))
+            }
+    return results
@@ -0,0 +1,10 @@
+# loadtest - HTTP load tests for the API against local provider stand-ins
+#
+# Starts uvicorn main:app (single process, as in the Procfile) wired to the mock
+# Anthropic and Brave servers in loadtest/mock_providers.py, drives a client profile
+# from loadtest/profiles.py and reports latency percentiles, error rates, memory
+# growth and event-loop lag.
+#
+#   python -m loadtest --profile smoke
+#   python -m loadtest --profile mixed --mock-llm-latency 4 --output loadtest/results/mixed.json
+#   python -m loadtest --profile steady --base-url http://staging:8000   # existing deployment, no mocks
@@ -0,0 +1,454 @@
+# loadtest/__main__.py - Drive the API with concurrent clients and report capacity numbers
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+from agent.tracing import percentile
+from loadtest.profiles import PROFILES, BUSINESS_CONTEXTS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SAMPLE_PATTERN = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$')
+
+
+def summarize(values: List[float], scale: float = 1000.0) -> Dict[str, float]:
+    """count / mean / p50 / p95 / p99 / max, scaled (default seconds -> ms)"""
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered) * scale, 1),
+        "p50": round(percentile(ordered, 50) * scale, 1),
+        "p95": round(percentile(ordered, 95) * scale, 1),
+        "p99": round(percentile(ordered, 99) * scale, 1),
+        "max": round(ordered[-1] * scale, 1)
+    }
+
+
+# ---------------------------------------------------------------------------
+# Processes under test
+# ---------------------------------------------------------------------------
+
+def wait_until_ready(url: str, process: Optional[subprocess.Popen], timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode} before becoming ready")
+        try:
+            if httpx.get(url, timeout=2).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+
+def start_uvicorn(target: str, port: int, env: Dict[str, str], log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w", encoding="utf-8")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", target, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+@contextlib.contextmanager
+def services(args) -> Iterator[str]:
+    """Start the mock providers and the app (unless --base-url is given) - yields the app URL"""
+    if args.base_url:
+        yield args.base_url.rstrip("/")
+        return
+
+    os.makedirs(args.log_dir, exist_ok=True)
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+    mock_env = {
+        **os.environ,
+        "MOCK_LLM_LATENCY": str(args.mock_llm_latency),
+        "MOCK_LLM_TTFT": str(args.mock_llm_ttft),
+        "MOCK_LLM_ERROR_RATE": str(args.mock_llm_error_rate),
+        "MOCK_SEARCH_LATENCY": str(args.mock_search_latency),
+        "MOCK_SEARCH_ERROR_RATE": str(args.mock_search_error_rate),
+    }
+    if args.mock_output_tokens:
+        mock_env["MOCK_LLM_OUTPUT_TOKENS"] = str(args.mock_output_tokens)
+
+    data_dir = tempfile.mkdtemp(prefix="loadtest_data_")
+    app_env = {
+        **os.environ,
+        "ANTHROPIC_API_KEY": "mock-key",
+        "ANTHROPIC_API_URL": mock_url,
+        "ANTHROPIC_BASE_URL": mock_url,
+        "BRAVE_SEARCH_API_KEY": "mock-key",
+        "BRAVE_SEARCH_URL": f"{mock_url}/res/v1/web/search",
+        "RESEARCH_DATA_DIR": data_dir,
+        "REPORT_CACHE_ENABLED": "false",
+        "TRACE_EXPORT": "none",
+        "LANGCHAIN_TRACING_V2": "false",
+        "LANGSMITH_TRACER_ENABLED": "false",
+    }
+
+    processes = []
+    try:
+        mock = start_uvicorn("loadtest.mock_providers:app", args.mock_port, mock_env,
+                             os.path.join(args.log_dir, "mock_providers.log"))
+        processes.append(mock)
+        wait_until_ready(f"{mock_url}/mock/stats", mock)
+
+        app_url = f"http://127.0.0.1:{args.app_port}"
+        api = start_uvicorn("main:app", args.app_port, app_env, os.path.join(args.log_dir, "app.log"))
+        processes.append(api)
+        wait_until_ready(f"{app_url}/", api)
+        print(f"🚀 App on {app_url} (pid {api.pid}), mock providers on {mock_url} - logs in {args.log_dir}")
+        yield app_url
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+# ---------------------------------------------------------------------------
+# Server-side metrics
+# ---------------------------------------------------------------------------
+
+def parse_metrics(text: str) -> Dict[str, float]:
+    """Prometheus text format -> {'name{labels}': value}"""
+    samples = {}
+    for line in text.splitlines():
+        match = _SAMPLE_PATTERN.match(line.strip())
+        if match:
+            samples[match.group(1) + (match.group(2) or "")] = float(match.group(3))
+    return samples
+
+
+def histogram_quantile(before: Dict[str, float], after: Dict[str, float], name: str, q: float) -> Optional[float]:
+    """Quantile of the observations made between two scrapes, interpolated within buckets"""
+    buckets = []
+    for key, value in after.items():
+        match = re.fullmatch(rf'{name}_bucket\{{le="([^"]+)"\}}', key)
+        if match:
+            buckets.append((float(match.group(1)), value - before.get(key, 0.0)))
+    buckets.sort()
+    if not buckets or buckets[-1][1] <= 0:
+        return None
+
+    rank = q * buckets[-1][1]
+    lower_bound, lower_count = 0.0, 0.0
+    for bound, count in buckets:
+        if count >= rank:
+            if bound == float("inf"):
+                return lower_bound
+            span = count - lower_count
+            return lower_bound + (bound - lower_bound) * ((rank - lower_count) / span if span else 1.0)
+        lower_bound, lower_count = bound, count
+    return lower_bound
+
+
+def counter_delta(before: Dict[str, float], after: Dict[str, float], name: str, label: str = "") -> float:
+    """Increase between two scrapes of every series of a counter, optionally only those carrying `label`"""
+    return sum(
+        value - before.get(key, 0.0) for key, value in after.items()
+        if key.startswith(f"{name}{{") and label in key
+    )
+
+
+async def scrape(client: httpx.AsyncClient) -> Dict[str, float]:
+    try:
+        response = await client.get("/metrics", timeout=10)
+        return parse_metrics(response.text) if response.status_code == 200 else {}
+    except httpx.HTTPError:
+        return {}
+
+
+async def sample_memory(client: httpx.AsyncClient, samples: List[float], stop: asyncio.Event, interval: float):
+    """Resident memory of the app process over the run, read from its own /metrics"""
+    while not stop.is_set():
+        rss = (await scrape(client)).get("process_resident_memory_bytes")
+        if rss:
+            samples.append(rss)
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+
+
+# ---------------------------------------------------------------------------
+# Virtual users
+# ---------------------------------------------------------------------------
+
+class Results:
+    """Per-endpoint latencies, outcomes and error samples"""
+
+    def __init__(self):
+        self.latency: Dict[str, List[float]] = {}
+        self.first_event: List[float] = []
+        self.outcomes: Dict[str, Dict[str, int]] = {}
+        self.errors: List[str] = []
+
+    def record(self, endpoint: str, outcome: str, elapsed: float, error: str = ""):
+        counts = self.outcomes.setdefault(endpoint, {})
+        counts[outcome] = counts.get(outcome, 0) + 1
+        if outcome == "ok":
+            self.latency.setdefault(endpoint, []).append(elapsed)
+        elif error and len(self.errors) < 50:
+            self.errors.append(f"{endpoint}: {error}")
+
+
+def report_errors(body: Dict[str, Any]) -> List[str]:
+    """Agent failures surface as 'Error ...' report sections, not HTTP errors"""
+    return [key for key, value in body.items()
+            if isinstance(value, str) and value.startswith("Error")]
+
+
+def payload_for(profile: Dict[str, Any], request_number: int) -> Dict[str, Any]:
+    context = BUSINESS_CONTEXTS[request_number % len(BUSINESS_CONTEXTS)]
+    return {
+        "business_context": f"{context} (load test request {request_number})",
+        "research_type": profile["research_type"],
+        "output_format": "full_json",
+        "bypass_cache": True
+    }
+
+
+async def call_research(client: httpx.AsyncClient, payload: Dict[str, Any], results: Results):
+    start = time.perf_counter()
+    response = await client.post("/research", json=payload)
+    elapsed = time.perf_counter() - start
+    if response.status_code != 200:
+        results.record("research", f"http_{response.status_code}", elapsed, response.text[:200])
+        return
+    failed = report_errors(response.json())
+    results.record("research", "report_error" if failed else "ok", elapsed, ", ".join(failed))
+
+
+async def call_stream(client: httpx.AsyncClient, payload: Dict[str, Any], results: Results):
+    start = time.perf_counter()
+    first_event, event, outcome, detail = None, None, "incomplete", ""
+    async with client.stream("POST", "/research/stream", json=payload) as response:
+        if response.status_code != 200:
+            results.record("stream", f"http_{response.status_code}", time.perf_counter() - start)
+            return
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+                if first_event is None:
+                    first_event = time.perf_counter() - start
+            elif line.startswith("data: ") and event in ("complete", "error"):
+                outcome = "ok" if event == "complete" else "stream_error"
+                detail = line[6:200] if event == "error" else ""
+    if first_event is not None:
+        results.first_event.append(first_event)
+    results.record("stream", outcome, time.perf_counter() - start, detail)
+
+
+async def call_job(client: httpx.AsyncClient, payload: Dict[str, Any], results: Results, poll_interval: float):
+    start = time.perf_counter()
+    response = await client.post("/research/jobs", json=payload)
+    if response.status_code == 429:
+        results.record("jobs", "rejected", time.perf_counter() - start)
+        return
+    if response.status_code != 202:
+        results.record("jobs", f"http_{response.status_code}", time.perf_counter() - start, response.text[:200])
+        return
+
+    status_url = response.json()["status_url"]
+    while True:
+        await asyncio.sleep(poll_interval)
+        status = (await client.get(status_url)).json()
+        if status["status"] in ("completed", "failed"):
+            break
+    outcome = "ok" if status["status"] == "completed" else "job_failed"
+    results.record("jobs", outcome, time.perf_counter() - start, status.get("error") or "")
+
+
+async def virtual_user(user: int, client: httpx.AsyncClient, profile: Dict[str, Any],
+                       deadline: Optional[float], results: Results, counter: Iterator[int], args):
+    rng = random.Random(args.seed + user)
+    endpoints, weights = zip(*profile["mix"].items())
+    done = 0
+    while (deadline is None and done < profile["requests_per_client"]) or (deadline and time.time() < deadline):
+        endpoint = rng.choices(endpoints, weights)[0]
+        payload = payload_for(profile, next(counter))
+        start = time.perf_counter()
+        try:
+            if endpoint == "stream":
+                await call_stream(client, payload, results)
+            elif endpoint == "jobs":
+                await call_job(client, payload, results, args.poll_interval)
+            else:
+                await call_research(client, payload, results)
+        except httpx.HTTPError as e:
+            results.record(endpoint, type(e).__name__, time.perf_counter() - start, str(e)[:200])
+        done += 1
+        if profile.get("think_time"):
+            await asyncio.sleep(profile["think_time"] * rng.uniform(0.5, 1.5))
+
+
+async def run_profile(app_url: str, name: str, profile: Dict[str, Any], args) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=profile["clients"] * 2, max_keepalive_connections=profile["clients"])
+    timeout = httpx.Timeout(args.request_timeout, connect=10)
+    async with httpx.AsyncClient(base_url=app_url, limits=limits, timeout=timeout) as client:
+        before = await scrape(client)
+        memory: List[float] = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_memory(client, memory, stop, args.memory_interval))
+
+        results = Results()
+        counter = iter(range(10 ** 9))
+        duration = profile.get("duration")
+        deadline = time.time() + duration if duration else None
+        print(f"🔥 {name}: {profile['description']}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            virtual_user(user, client, profile, deadline, results, counter, args)
+            for user in range(profile["clients"])
+        ))
+        wall = time.perf_counter() - start
+
+        stop.set()
+        await sampler
+        after = await scrape(client)
+
+    total = sum(sum(counts.values()) for counts in results.outcomes.values())
+    ok = sum(counts.get("ok", 0) for counts in results.outcomes.values())
+    lag = {
+        f"p{int(q * 100)}": round(value * 1000, 2) if value is not None else None
+        for q in (0.5, 0.95, 0.99)
+        for value in [histogram_quantile(before, after, "research_event_loop_lag_seconds", q)]
+    }
+    lag["max"] = round(after.get("research_event_loop_lag_max_seconds", 0.0) * 1000, 2)
+    drafts = counter_delta(before, after, "research_model_cascade_total")
+    escalated = counter_delta(before, after, "research_model_cascade_total", 'outcome="escalated"')
+
+    rss_start = memory[0] if memory else before.get("process_resident_memory_bytes", 0.0)
+    rss_end = after.get("process_resident_memory_bytes") or (memory[-1] if memory else 0.0)
+    mb = 1024 * 1024
+    return {
+        "profile": name,
+        "config": {key: value for key, value in profile.items() if key != "description"},
+        "wall_s": round(wall, 2),
+        "requests": total,
+        "succeeded": ok,
+        "error_rate": round(1 - ok / total, 4) if total else 0.0,
+        "throughput_rps": round(total / wall, 3) if wall else 0.0,
+        "endpoints": {
+            endpoint: {
+                "outcomes": counts,
+                "error_rate": round(1 - counts.get("ok", 0) / sum(counts.values()), 4),
+                "latency_ms": summarize(results.latency.get(endpoint, []))
+            }
+            for endpoint, counts in results.outcomes.items()
+        },
+        "stream_first_event_ms": summarize(results.first_event),
+        "memory_mb": {
+            "start": round(rss_start / mb, 1),
+            "end": round(rss_end / mb, 1),
+            "peak": round(max(memory + [rss_end]) / mb, 1),
+            "growth": round((rss_end - rss_start) / mb, 1)
+        },
+        "event_loop_lag_ms": lag,
+        "model_cascade": {
+            "drafts": int(drafts),
+            "escalated": int(escalated),
+            "escalation_rate": round(escalated / drafts, 4) if drafts else None
+        },
+        "error_samples": results.errors[:10]
+    }
+
+
+def print_summary(report: Dict[str, Any]):
+    print(f"\n📊 {report['profile']}: {report['requests']} requests in {report['wall_s']}s "
+          f"({report['throughput_rps']} req/s), error rate {report['error_rate']:.1%}")
+    for endpoint, stats in report["endpoints"].items():
+        latency = stats["latency_ms"]
+        print(f"   {endpoint:<9} p50 {latency.get('p50', '-')}ms  p95 {latency.get('p95', '-')}ms  "
+              f"p99 {latency.get('p99', '-')}ms  outcomes {stats['outcomes']}")
+    if report["stream_first_event_ms"].get("count"):
+        print(f"   stream first event p50 {report['stream_first_event_ms']['p50']}ms "
+              f"p95 {report['stream_first_event_ms']['p95']}ms")
+    memory, lag = report["memory_mb"], report["event_loop_lag_ms"]
+    print(f"   memory {memory['start']} -> {memory['end']} MB (peak {memory['peak']}, growth {memory['growth']:+})")
+    print(f"   event-loop lag p50 {lag['p50']}ms  p99 {lag['p99']}ms  max {lag['max']}ms")
+    cascade = report["model_cascade"]
+    if cascade["drafts"]:
+        print(f"   model cascade {cascade['escalated']}/{cascade['drafts']} drafts escalated "
+              f"({cascade['escalation_rate']:.1%})")
+    for error in report["error_samples"][:3]:
+        print(f"   ❌ {error}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="HTTP load test for the research API")
+    parser.add_argument("--profile", nargs="+", default=["smoke"], choices=sorted(PROFILES))
+    parser.add_argument("--clients", type=int, help="Override the profile's concurrent users")
+    parser.add_argument("--duration", type=float, help="Override the profile's duration (seconds)")
+    parser.add_argument("--research-type", choices=["express", "standard", "deep"], help="Override the profile's tier")
+    parser.add_argument("--base-url", help="Test an already running deployment instead of starting the app and mocks")
+    parser.add_argument("--app-port", type=int, default=8765)
+    parser.add_argument("--mock-port", type=int, default=8766)
+    parser.add_argument("--mock-llm-latency", type=float, default=2.0, help="Mock LLM call duration (s)")
+    parser.add_argument("--mock-llm-ttft", type=float, default=0.4, help="Mock time to first streamed token (s)")
+    parser.add_argument("--mock-llm-error-rate", type=float, default=0.0, help="Share of LLM calls answered with 429")
+    parser.add_argument("--mock-output-tokens", type=int, default=0, help="Mock output size for every call (0 = per task)")
+    parser.add_argument("--mock-search-latency", type=float, default=0.3)
+    parser.add_argument("--mock-search-error-rate", type=float, default=0.0)
+    parser.add_argument("--request-timeout", type=float, default=900.0)
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Job status polling interval (s)")
+    parser.add_argument("--memory-interval", type=float, default=5.0, help="RSS sampling interval (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--log-dir", default="loadtest/results/logs")
+    parser.add_argument("--output", default="loadtest/results/latest.json")
+    args = parser.parse_args()
+
+    reports = []
+    with services(args) as app_url:
+        for name in args.profile:
+            profile = dict(PROFILES[name])
+            if args.clients:
+                profile["clients"] = args.clients
+            if args.duration:
+                profile["duration"] = args.duration
+            if args.research_type:
+                profile["research_type"] = args.research_type
+            report = asyncio.run(run_profile(app_url, name, profile, args))
+            print_summary(report)
+            reports.append(report)
+
+    results = {
+        "schema": 1,
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "target": args.base_url or "uvicorn main:app (single process) + mock providers",
+            "mock_providers": None if args.base_url else {
+                "llm_latency": args.mock_llm_latency,
+                "llm_ttft": args.mock_llm_ttft,
+                "llm_error_rate": args.mock_llm_error_rate,
+                "output_tokens": args.mock_output_tokens or "per-task",
+                "search_latency": args.mock_search_latency,
+                "search_error_rate": args.mock_search_error_rate
+            }
+        },
+        "profiles": reports
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"💾 Results written to {args.output}")
+    return 1 if any(report["error_rate"] > 0 for report in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
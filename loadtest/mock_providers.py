@@ -0,0 +1,253 @@
+# loadtest/mock_providers.py - Local Anthropic Messages and Brave Search stand-ins
+#
+#   uvicorn loadtest.mock_providers:app --port 8766
+#
+# Behaviour is set through MOCK_* environment variables (see MockSettings) so the
+# harness can start it as a plain uvicorn subprocess.
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+from typing import Any, Dict, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from agent.token_budget import estimate_tokens
+from benchmarks.stubs import DEFAULT_OUTPUT_TOKENS, filler_text
+
+# Smallest prefix Anthropic will cache, per model family (tokens)
+MIN_CACHEABLE_TOKENS = {"claude-3-5-haiku": 2048, "claude-3-haiku": 2048}
+DEFAULT_MIN_CACHEABLE_TOKENS = 1024
+
+# Ephemeral cache lifetime (seconds) - refreshed on every hit, like the real API
+CACHE_TTL = 300
+
+
+class MockSettings:
+    """Latency, output size and failure injection for the mock providers"""
+
+    def __init__(self):
+        self.llm_latency = float(os.getenv("MOCK_LLM_LATENCY", "2.0"))
+        self.llm_jitter = float(os.getenv("MOCK_LLM_JITTER", "0.25"))
+        self.llm_ttft = float(os.getenv("MOCK_LLM_TTFT", "0.4"))
+        self.llm_error_rate = float(os.getenv("MOCK_LLM_ERROR_RATE", "0.0"))
+        self.weak_draft_rate = float(os.getenv("MOCK_WEAK_DRAFT_RATE", "0.2"))  # Haiku reports missing sections
+        self.output_tokens = int(os.getenv("MOCK_LLM_OUTPUT_TOKENS", "0"))  # 0 = per-task defaults
+        self.search_latency = float(os.getenv("MOCK_SEARCH_LATENCY", "0.3"))
+        self.search_error_rate = float(os.getenv("MOCK_SEARCH_ERROR_RATE", "0.0"))
+        self.random = random.Random(int(os.getenv("MOCK_SEED", "7")))
+
+    def latency(self, base: float) -> float:
+        """base +/- jitter (a fraction of base)"""
+        return max(base * (1 + self.random.uniform(-self.llm_jitter, self.llm_jitter)), 0.0)
+
+    def fails(self, rate: float) -> bool:
+        return rate > 0 and self.random.random() < rate
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "llm_latency": self.llm_latency,
+            "llm_jitter": self.llm_jitter,
+            "llm_ttft": self.llm_ttft,
+            "llm_error_rate": self.llm_error_rate,
+            "weak_draft_rate": self.weak_draft_rate,
+            "output_tokens": self.output_tokens or "per-task",
+            "search_latency": self.search_latency,
+            "search_error_rate": self.search_error_rate
+        }
+
+
+settings = MockSettings()
+app = FastAPI(title="Mock providers")
+
+# (model, cached prefix hash) -> expiry
+_prompt_cache: Dict[Tuple[str, str], float] = {}
+stats = {"messages": 0, "streams": 0, "searches": 0, "llm_errors": 0, "search_errors": 0}
+
+
+def block_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return "\n".join(block.get("text", "") for block in content or [] if isinstance(block, dict))
+
+
+def split_prompt(body: Dict[str, Any]) -> Tuple[str, str]:
+    """(cacheable prefix, remaining prompt text) - the prefix runs up to the last cache_control block"""
+    system = body.get("system") or []
+    blocks = [{"type": "text", "text": system}] if isinstance(system, str) else list(system)
+    for message in body.get("messages", []):
+        content = message.get("content")
+        blocks.extend([{"type": "text", "text": content}] if isinstance(content, str) else content or [])
+
+    marked = [i for i, block in enumerate(blocks) if isinstance(block, dict) and block.get("cache_control")]
+    cut = marked[-1] + 1 if marked else 0
+    return block_text(blocks[:cut]), block_text(blocks[cut:])
+
+
+def prompt_usage(model: str, prefix: str, rest: str) -> Dict[str, int]:
+    """Anthropic-style usage: input_tokens excludes cache reads and writes"""
+    prefix_tokens, rest_tokens = estimate_tokens(prefix), estimate_tokens(rest)
+    minimum = next((size for family, size in MIN_CACHEABLE_TOKENS.items() if model.startswith(family)),
+                   DEFAULT_MIN_CACHEABLE_TOKENS)
+    if not prefix or prefix_tokens < minimum:
+        return {"input_tokens": prefix_tokens + rest_tokens,
+                "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+
+    key = (model, hashlib.sha256(prefix.encode("utf-8")).hexdigest())
+    now = time.time()
+    hit = _prompt_cache.get(key, 0) > now
+    _prompt_cache[key] = now + CACHE_TTL
+    return {
+        "input_tokens": rest_tokens,
+        "cache_creation_input_tokens": 0 if hit else prefix_tokens,
+        "cache_read_input_tokens": prefix_tokens if hit else 0
+    }
+
+
+# Prompt marker -> (route, headings its report is expected to contain)
+SECTIONED_PROMPTS = {
+    "ENHANCED CUSTOMER INTERVIEW SIMULATION": ("psychological_interviews", (
+        "INTERVIEW 1", "INTERVIEW 2", "INTERVIEW 3", "PSYCHOLOGICAL INTERVIEW ANALYSIS")),
+    "SALES INTELLIGENCE INTERVIEW SIMULATION": ("sales_intelligence_interviews", (
+        "INTERVIEW 1", "INTERVIEW 2", "INTERVIEW 3", "SALES INTELLIGENCE EXTRACTION")),
+    "COMPREHENSIVE CAMPAIGN SYNTHESIS": ("campaign_synthesis", (
+        "CORE POSITIONING STRATEGY", "CONVERSION CAMPAIGN FRAMEWORK", "MESSAGING ARCHITECTURE",
+        "IMPLEMENTATION ROADMAP")),
+}
+
+
+def sectioned_text(headings: Tuple[str, ...], tokens: int, weak: bool) -> str:
+    """A report with the route's headings and the markers the cascade's quality gate looks for -
+    a weak one stops halfway, like a draft that gave up early"""
+    if weak:
+        headings = headings[:len(headings) // 2]
+    share = tokens // len(headings)
+    return "\n\n".join(
+        f"## {heading}\n\n{filler_text(share, offset=i)} The contradiction behind each objection is a "
+        f"hypothesis worth testing, and every defense hides the real pain."
+        for i, heading in enumerate(headings)
+    )
+
+
+def response_text(prompt: str, max_tokens: int, model: str = "") -> str:
+    """Digest prompts get JSON, express and cascaded prompts get their section headings, the rest get prose"""
+    if "STRUCTURED DIGEST" in prompt:
+        return json.dumps({
+            field: [filler_text(12, offset=i).rstrip(".") for i in range(4)]
+            for field in ("archetypes", "pains", "objections", "triggers", "quotes", "opportunities")
+        })
+
+    for marker, (route, headings) in SECTIONED_PROMPTS.items():
+        if marker in prompt:
+            tokens = min(settings.output_tokens or DEFAULT_OUTPUT_TOKENS[route], max_tokens)
+            weak = "haiku" in model and settings.fails(settings.weak_draft_rate)
+            return sectioned_text(headings, tokens, weak)
+
+    route = "express_research" if "EXPRESS MARKET INTELLIGENCE" in prompt else "default"
+    tokens = min(settings.output_tokens or DEFAULT_OUTPUT_TOKENS[route], max_tokens)
+    if route == "express_research":
+        third = tokens // 3
+        return "\n\n".join(
+            f"## {heading}\n\n{filler_text(third, offset=i)}"
+            for i, heading in enumerate(("PSYCHOLOGICAL ANALYSIS", "CONVERSION INTELLIGENCE", "CAMPAIGN SYNTHESIS"))
+        )
+    return filler_text(tokens)
+
+
+def rate_limited() -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"type": "error", "error": {"type": "rate_limit_error", "message": "Mock rate limit"}},
+        headers={"retry-after": "1"}
+    )
+
+
+def sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_message(message: Dict[str, Any], text: str, total_latency: float):
+    """Anthropic streaming events - first token after MOCK_LLM_TTFT, the rest spread over the call"""
+    usage = message["usage"]
+    start = {**message, "content": [], "stop_reason": None,
+             "usage": {**usage, "output_tokens": 1}}
+    yield sse("message_start", {"type": "message_start", "message": start})
+    yield sse("content_block_start", {"type": "content_block_start", "index": 0,
+                                      "content_block": {"type": "text", "text": ""}})
+
+    ttft = min(settings.llm_ttft, total_latency)
+    await asyncio.sleep(ttft)
+    words = text.split(" ")
+    chunks = [" ".join(words[i:i + 25]) + " " for i in range(0, len(words), 25)]
+    pause = max(total_latency - ttft, 0.0) / max(len(chunks), 1)
+    for chunk in chunks:
+        yield sse("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                          "delta": {"type": "text_delta", "text": chunk}})
+        if pause:
+            await asyncio.sleep(pause)
+
+    yield sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+    yield sse("message_delta", {"type": "message_delta",
+                                "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                "usage": {"output_tokens": usage["output_tokens"]}})
+    yield sse("message_stop", {"type": "message_stop"})
+
+
+@app.post("/v1/messages")
+async def messages(request: Request):
+    """Anthropic Messages API - plain JSON or SSE when the body sets stream"""
+    body = await request.json()
+    if settings.fails(settings.llm_error_rate):
+        stats["llm_errors"] += 1
+        return rate_limited()
+
+    model = body.get("model", "mock-model")
+    prefix, rest = split_prompt(body)
+    text = response_text(f"{prefix}\n{rest}", int(body.get("max_tokens", 4096)), model)
+    message = {
+        "id": f"msg_mock_{uuid.uuid4().hex[:20]}",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {**prompt_usage(model, prefix, rest), "output_tokens": estimate_tokens(text)}
+    }
+    latency = settings.latency(settings.llm_latency)
+
+    if body.get("stream"):
+        stats["streams"] += 1
+        return StreamingResponse(stream_message(message, text, latency), media_type="text/event-stream")
+
+    stats["messages"] += 1
+    await asyncio.sleep(latency)
+    return message
+
+
+@app.get("/res/v1/web/search")
+async def web_search(q: str = "", count: int = 10):
+    """Brave web search - count results of fixed prose for the query"""
+    await asyncio.sleep(settings.latency(settings.search_latency))
+    if settings.fails(settings.search_error_rate):
+        stats["search_errors"] += 1
+        return JSONResponse(status_code=429, content={"type": "ErrorResponse", "error": {"code": "RATE_LIMITED"}})
+
+    stats["searches"] += 1
+    return {"web": {"results": [{
+        "title": f"{q} - result {i + 1}",
+        "url": f"https://example.com/{hashlib.md5(q.encode('utf-8')).hexdigest()[:8]}/{i}",
+        "description": filler_text(40, offset=i),
+        "age": "1 day ago",
+        "language": "en"
+    } for i in range(count)]}}
+
+
+@app.get("/mock/stats")
+async def mock_stats() -> Dict[str, Any]:
+    return {**stats, "cached_prefixes": len(_prompt_cache), "settings": settings.describe()}
@@ -0,0 +1,38 @@
+# loadtest/profiles.py - Concurrent-client profiles for the load-test harness
+
+from typing import Any, Dict
+
+# clients: concurrent virtual users. Each runs requests_per_client requests, or keeps
+# going until duration (seconds) is up. mix weights the endpoint each request hits;
+# think_time is the pause between one user's requests.
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "smoke": {
+        "description": "Two users, one express request each - checks the harness end to end",
+        "clients": 2, "requests_per_client": 1, "think_time": 0.0,
+        "research_type": "express", "mix": {"research": 1.0}
+    },
+    "steady": {
+        "description": "Ten users on the standard tier for two minutes",
+        "clients": 10, "duration": 120, "think_time": 1.0,
+        "research_type": "standard", "mix": {"research": 1.0}
+    },
+    "burst": {
+        "description": "Fifty express requests at once - connection, pool and loop headroom",
+        "clients": 50, "requests_per_client": 1, "think_time": 0.0,
+        "research_type": "express", "mix": {"research": 1.0}
+    },
+    "mixed": {
+        "description": "Dashboard streams, API calls and queued jobs on the deep tier for three minutes",
+        "clients": 20, "duration": 180, "think_time": 2.0,
+        "research_type": "deep", "mix": {"research": 0.5, "stream": 0.35, "jobs": 0.15}
+    },
+}
+
+# Distinct contexts so the report and search caches don't answer repeat requests
+BUSINESS_CONTEXTS = (
+    "B2B SaaS onboarding platform for mid-market HR teams frustrated with manual paperwork.",
+    "Direct-to-consumer sleep supplement brand selling to stressed professionals aged 30-45.",
+    "Local commercial cleaning company bidding for multi-site office contracts.",
+    "Online coding bootcamp for career changers worried about job placement.",
+    "Premium dog food subscription for owners of senior and sensitive-stomach dogs.",
+)
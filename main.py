@@ -1,18 +1,163 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional
-from fastapi.responses import HTMLResponse
+from typing import List, Optional
+from fastapi.responses import HTMLResponse, StreamingResponse, Response
+import logging
 import os
+import time
+
+# Agent progress goes through logging - configure it before the graph module logs at import
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s")
 
 # Import your graph
-from agent.graph import graph
+from agent.graph import RESEARCH_TIERS, DEFAULT_RESEARCH_TIER, resolve_research_tier, resolve_plan_nodes
+from agent.executor import get_sync_executor, shutdown_sync_executor, run_sync
+from agent.llm_registry import llm_registry
+from agent.http_layer import http_layer
+from agent.streaming import research_event_stream, cached_event_stream
+from agent.report_cache import report_cache, plan_signature
+from agent.planner import ExecutionPlanner, target_keys
+from agent.search import search_cache
+from agent.metrics import observe_run, render_metrics
+from agent.tracing import tracer
+from agent.loop_monitor import loop_monitor
+from agent.quota import quota_scheduler, resolve_priority, DEFAULT_TENANT
+from agent.concurrency import concurrency_stats
+from agent.retry import llm_call_policy
+from agent.cascade import model_cascade
+from agent.jobs import ResearchJobQueue, QueueFullError
+from agent.checkpointing import (
+    open_checkpointer, new_thread_id, thread_config, resume_run, CheckpointRetention
+)
 
 app = FastAPI(title="Market Research Intelligence")
 
+# Checkpointed graphs used by the API - the planner is rebuilt at startup once the event loop is running
+checkpointer = None
+checkpoint_retention = None
+planner = ExecutionPlanner()
+
+@app.on_event("startup")
+async def startup():
+    """Create the sync executor, the shared outbound HTTP layer and the checkpointed graphs"""
+    global checkpointer, checkpoint_retention, planner
+    loop_monitor.start()
+    get_sync_executor()
+    await http_layer.start()
+    checkpointer = open_checkpointer()
+    checkpoint_retention = CheckpointRetention(checkpointer)
+    checkpoint_retention.start()
+    planner = ExecutionPlanner(checkpointer=checkpointer)
+    planner.graph_for(None)
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop job workers and the loop-lag probe, release executor threads, close pooled connections and the checkpoint DB"""
+    await job_queue.stop()
+    await loop_monitor.stop()
+    if checkpoint_retention is not None:
+        await checkpoint_retention.stop()
+    shutdown_sync_executor(wait=False)
+    llm_registry.clear()
+    await http_layer.aclose()
+    if checkpointer is not None:
+        await checkpointer.conn.close()
+
 class ResearchRequest(BaseModel):
     business_context: str
-    research_type: str = "comprehensive"
+    research_type: str = "comprehensive"  # express / standard / deep ("comprehensive" = deep)
     output_format: str = "full_json"
+    bypass_cache: bool = False  # Skip the report cache lookup and re-run (result still refreshes the cache)
+    targets: Optional[List[str]] = None  # State keys to compute - only their upstream nodes run
+    priority: Optional[str] = None  # interactive / batch provider-quota class (jobs default to batch)
+    tenant: Optional[str] = None  # Provider quota is shared fairly across tenants
+
+class ResearchJobRequest(ResearchRequest):
+    webhook_url: Optional[str] = None
+
+def shape_result(result: dict, output_format: str, targets: Optional[List[str]] = None) -> dict:
+    """Return the slice of the final state the requested output format asks for"""
+    keys = target_keys(output_format, targets)
+    if keys is not None:
+        return {
+            **{key: result.get(key, "") for key in keys},
+            "processing_times": result.get("processing_times", {}),
+            "model_routes": result.get("model_routes", {})
+        }
+    elif output_format == "psychology_report":
+        return {"report": result.get("psychology_report", "")}
+    elif output_format == "campaign_ready":
+        return {"insights": result.get("campaign_insights", "")}
+    else:
+        return result
+
+class ResearchRunError(Exception):
+    """Graph run failure that keeps the thread id so the caller can resume it"""
+
+    def __init__(self, message: str, thread_id: str):
+        super().__init__(message)
+        self.thread_id = thread_id
+
+def plan_request(payload: dict):
+    """(tier, node list, compiled graph, cache plan signature) for a request payload
+
+    Raises ValueError for an unknown research_type or priority, or target keys the tier cannot produce.
+    """
+    resolve_priority(payload.get("priority"))
+    tier = resolve_research_tier(payload.get("research_type"))
+    nodes, plan_graph = planner.plan(payload["output_format"], payload.get("targets"), tier)
+    return tier, nodes, plan_graph, plan_signature(nodes, resolve_plan_nodes(None, tier))
+
+async def execute_research(payload: dict, thread_id: Optional[str] = None) -> dict:
+    """Run the research graph for one request payload and shape its output
+
+    research_type selects the tier (express / standard / deep); within it only the
+    nodes the requested output_format / targets depend on are run.
+    Identical (whitespace-normalized) requests are answered from the report cache
+    unless the payload sets bypass_cache. Every node is checkpointed under thread_id;
+    if that thread was interrupted mid-run it resumes instead of starting over.
+    """
+    tier, nodes, plan_graph, plan = plan_request(payload)
+    targets = payload.get("targets")
+
+    if not payload.get("bypass_cache"):
+        cached = await run_sync(report_cache.get, payload["business_context"], tier, plan)
+        if cached is not None:
+            return {**shape_result(cached, payload["output_format"], targets), "cached": True}
+
+    thread_id = thread_id or new_thread_id()
+    config = thread_config(thread_id)
+    inputs = {
+        "business_context": payload["business_context"],
+        "research_type": payload["research_type"],
+        "output_format": payload["output_format"],
+        "research_tier": tier,
+        "execution_plan": nodes,
+        "request_priority": resolve_priority(payload.get("priority")),
+        "tenant": payload.get("tenant") or DEFAULT_TENANT
+    }
+
+    # A thread interrupted mid-run (e.g. a job cut off by a restart) picks up from its last checkpoint
+    interrupted = checkpointer is not None and bool((await plan_graph.aget_state(config)).next)
+    if checkpoint_retention is not None:
+        await checkpoint_retention.track(thread_id)
+
+    run_start = time.time()
+    try:
+        result = await plan_graph.ainvoke(None if interrupted else inputs, config)
+    except Exception as e:
+        observe_run(inputs, time.time() - run_start, status="failed")
+        raise ResearchRunError(str(e), thread_id) from e
+    observe_run(result, time.time() - run_start)
+    if checkpoint_retention is not None:
+        await checkpoint_retention.finished(thread_id, result)
+
+    await run_sync(report_cache.set, payload["business_context"], tier, result, plan)
+    return {**shape_result(result, payload["output_format"], targets), "thread_id": thread_id}
+
+job_queue = ResearchJobQueue(runner=execute_research)
 
 @app.get("/research")
 async def research_form():
@@ -21,8 +166,18 @@ async def research_form():
         "message": "Level 10 Hybrid Agent Ready",
         "endpoints": {
             "POST /research": "Run research with JSON payload",
+            "POST /research/stream": "Run research with live server-sent progress events",
+            "POST /research/jobs": "Queue a research run and collect it later",
+            "POST /research/{thread_id}/resume": "Resume a failed or interrupted run from its last completed node",
             "GET /": "Health check"
         },
+        "research_types": {
+            name: {
+                "latency_target_seconds": profile["latency_target_seconds"],
+                "description": profile["description"]
+            }
+            for name, profile in RESEARCH_TIERS.items()
+        },
         "test_payload": {
             "business_context": "Your business context here",
             "research_type": "comprehensive", 
@@ -34,30 +189,186 @@ async def research_form():
 async def run_research(request: ResearchRequest):
     """Run sophisticated market research"""
     try:
-        # Run your LangGraph workflow
-        result = await graph.ainvoke({
-            "business_context": request.business_context,
-            "research_type": request.research_type,
-            "output_format": request.output_format
-        })
-        
-        # Return based on format
-        if request.output_format == "psychology_report":
-            return {"report": result.get("psychology_report", "")}
-        elif request.output_format == "campaign_ready":
-            return {"insights": result.get("campaign_insights", "")}
-        else:
-            return result
+        # Run your LangGraph workflow and return based on format
+        return await execute_research(request.dict())
             
+    except ResearchRunError as e:
+        raise HTTPException(status_code=500, detail={
+            "error": str(e),
+            "thread_id": e.thread_id,
+            "resume_url": f"/research/{e.thread_id}/resume"
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/research/{thread_id}/resume")
+async def resume_research(thread_id: str):
+    """Resume a failed or interrupted run from its last completed node"""
+    if checkpointer is None:
+        raise HTTPException(status_code=503, detail="Checkpointing is not available")
+
+    snapshot = await planner.graph_for(None).aget_state(thread_config(thread_id))
+    if not snapshot.values:
+        raise HTTPException(status_code=404, detail="Unknown research thread")
+
+    # Resume on the same tier and plan the thread started with
+    tier = snapshot.values.get("research_tier") or DEFAULT_RESEARCH_TIER
+    nodes = snapshot.values.get("execution_plan") or resolve_plan_nodes(None, tier)
+    try:
+        result = await resume_run(planner.graph_for(nodes, tier), thread_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail={"error": str(e), "thread_id": thread_id})
+
+    if result is None:
+        # Nothing failed - return the finished state as-is
+        result = snapshot.values
+    else:
+        await checkpoint_retention.finished(thread_id, result)
+        await run_sync(report_cache.set, result["business_context"], tier, result,
+                       plan_signature(nodes, resolve_plan_nodes(None, tier)))
+    return {**shape_result(result, result.get("output_format", "full_json")), "thread_id": thread_id}
+
+@app.post("/research/stream")
+async def stream_research(request: ResearchRequest):
+    """Run research and stream node progress, token deltas and the final report as SSE"""
+    try:
+        tier, nodes, plan_graph, plan = plan_request(request.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    inputs = {
+        "business_context": request.business_context,
+        "research_type": request.research_type,
+        "output_format": request.output_format,
+        "research_tier": tier,
+        "execution_plan": nodes,
+        "request_priority": resolve_priority(request.priority),
+        "tenant": request.tenant or DEFAULT_TENANT
+    }
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+    if not request.bypass_cache:
+        cached = await run_sync(report_cache.get, request.business_context, tier, plan)
+        if cached is not None:
+            return StreamingResponse(cached_event_stream(cached), media_type="text/event-stream", headers=headers)
+
+    run_start = time.time()
+
+    async def store_report(final_state: dict):
+        observe_run(final_state, time.time() - run_start)
+        await checkpoint_retention.finished(thread_id, final_state)
+        await run_sync(report_cache.set, request.business_context, tier, final_state, plan)
+
+    thread_id = new_thread_id()
+    await checkpoint_retention.track(thread_id)
+    headers["X-Research-Thread-Id"] = thread_id
+    return StreamingResponse(
+        research_event_stream(plan_graph, inputs, config=thread_config(thread_id), on_complete=store_report),
+        media_type="text/event-stream",
+        headers=headers
+    )
+
+@app.post("/research/jobs", status_code=202)
+async def submit_research_job(request: ResearchJobRequest):
+    """Queue a research run - poll the status endpoint or wait for the webhook"""
+    payload = request.dict(exclude={"webhook_url"})
+    payload["priority"] = payload.get("priority") or "batch"
+    try:
+        plan_request(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        job_id = await job_queue.submit(payload, webhook_url=request.webhook_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFullError as e:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(e)},
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/research/jobs/{job_id}",
+        "result_url": f"/research/jobs/{job_id}/result"
+    }
+
+@app.get("/research/jobs/{job_id}")
+async def research_job_status(job_id: str):
+    """Job status without the (large) result payload"""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {key: job[key] for key in ("job_id", "status", "error", "created_at", "started_at", "finished_at")}
+
+@app.get("/research/jobs/{job_id}/result")
+async def research_job_result(job_id: str):
+    """Result of a completed job - 409 while it is still queued or running"""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return job["result"]
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss statistics for the report and search-result caches"""
+    return {
+        "reports": await run_sync(report_cache.stats),
+        "search": await run_sync(search_cache.stats)
+    }
+
+@app.get("/quota/stats")
+async def quota_stats():
+    """Provider rate-limit budgets, queued calls per priority class and worst wait"""
+    return quota_scheduler.stats()
+
+@app.get("/concurrency/stats")
+async def concurrency_limits():
+    """Adaptive in-flight limits per provider with their recent increases and cuts"""
+    return concurrency_stats()
+
+@app.get("/llm/stats")
+async def llm_call_stats():
+    """LLM retries, hedged requests and the first-token threshold each agent hedges at"""
+    return llm_call_policy.stats()
+
+@app.get("/cascade/stats")
+async def cascade_stats():
+    """Model cascade drafts, escalations and escalation rate per agent"""
+    return model_cascade.stats()
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint - per-node token, cost and latency metrics"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/traces/stats")
+async def trace_stats():
+    """p50/p95/p99 latency per span name (nodes, LLM calls, searches) over recent runs"""
+    return tracer.stats()
+
+@app.get("/traces/{run_id}")
+async def trace_run(run_id: str):
+    """Spans of one run (its thread id) and the node chain that set its wall-clock time"""
+    spans = tracer.spans_for(run_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="No spans recorded for this run")
+    return {"run_id": run_id, "critical_path": tracer.critical_path(run_id), "spans": spans}
+
 @app.get("/")
 async def root():
     return {
         "service": "Market Research Intelligence",
         "status": "ready",
-        "endpoints": ["/research"]
+        "endpoints": ["/research", "/research/stream", "/research/jobs"]
     }
 
 @app.get("/test")
@@ -239,6 +550,14 @@ async def client_dashboard():
                 min-height: 250px;
                 transition: border-color 0.2s;
             }
+            select {
+                width: 100%;
+                padding: 12px 15px;
+                border: 2px solid #e2e8f0;
+                border-radius: 8px;
+                font-size: 14px;
+                font-family: inherit;
+            }
             textarea:focus { 
                 outline: none;
                 border-color: #667eea;
@@ -426,6 +745,14 @@ Include:
 • Competitive landscape insights
 • Customer feedback or voice of customer data"></textarea>
                 </div>
+                <div class="form-group">
+                    <label for="researchType">Research Depth</label>
+                    <select id="researchType">
+                        <option value="express">⚡ Express - single-pass brief (~2 min)</option>
+                        <option value="standard">🎯 Standard - psychology, conversion & competitors (~5 min)</option>
+                        <option value="deep" selected>🧠 Deep - full six-agent analysis (~10 min)</option>
+                    </select>
+                </div>
                 
                 <div class="action-buttons">
                     <button class="btn btn-primary" onclick="generateReport()">
@@ -501,92 +828,147 @@ Include:
 
         <script>
         let currentReport = null;
-        let progressInterval = null;
+        let completedNodes = 0;
+        let totalNodes = 11;
+
+        // Graph nodes run by each research tier
+        const TIER_NODE_COUNTS = { express: 3, standard: 9, deep: 11 };
+        const NODE_LABELS = {
+            set_goal: 'Initializing research goal...',
+            express_research: 'Express single-pass analysis...',
+            psych_analysis_agent: 'Deep psychological analysis...',
+            psychological_digest: 'Condensing the psychological analysis...',
+            conversion_agent: 'Conversion intelligence analysis...',
+            competitor_search: 'Searching the competitive landscape...',
+            competitor_discovery: 'Competitor intelligence analysis...',
+            psych_interview_agent: 'Psychological interview simulation...',
+            sales_interview_agent: 'Sales intelligence interviews...',
+            campaign_synthesis: 'Campaign synthesis...',
+            learn: 'Capturing learning patterns...',
+            format_outputs: 'Finalizing comprehensive report...'
+        };
+        const LOADING_MARKUP = document.getElementById('resultContent').innerHTML;
 
         async function generateReport() {
             const businessContext = document.getElementById('businessContext').value.trim();
+            const researchType = document.getElementById('researchType').value;
             
             if (!businessContext) {
                 alert('Please enter your business context before generating the report.');
                 return;
             }
 
-            // Show result section and start loading
+            // Show result section and reset live progress
             document.getElementById('resultSection').style.display = 'block';
-            document.getElementById('loadingState').style.display = 'block';
+            document.getElementById('resultContent').innerHTML = LOADING_MARKUP + '<div id="liveSections"></div>';
             document.getElementById('statusIndicator').textContent = 'Processing';
             document.getElementById('statusIndicator').className = 'status-indicator status-processing';
-            
-            // Start progress animation
-            startProgressAnimation();
-            
-            const startTime = Date.now();
+            completedNodes = 0;
+            totalNodes = TIER_NODE_COUNTS[researchType];
+            setProgress(0, 'Connecting to intelligence stream...');
             
             try {
-                const response = await fetch('/research', {
+                const response = await fetch('/research/stream', {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json',
                     },
                     body: JSON.stringify({
                         business_context: businessContext,
-                        research_type: 'comprehensive',
+                        research_type: researchType,
                         output_format: 'psychology_report'
                     })
                 });
                 
-                const data = await response.json();
-                const endTime = Date.now();
-                const duration = ((endTime - startTime) / 1000).toFixed(1);
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
                 
-                // Stop progress animation
-                stopProgressAnimation();
+                // Parse server-sent events off the response body as they arrive
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
                 
-                // Display results
-                displayResults(data, duration);
+                while (true) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    buffer += decoder.decode(value, { stream: true });
+                    
+                    let boundary;
+                    while ((boundary = buffer.indexOf('\\n\\n')) !== -1) {
+                        const rawEvent = buffer.slice(0, boundary);
+                        buffer = buffer.slice(boundary + 2);
+                        handleRawEvent(rawEvent);
+                    }
+                }
                 
             } catch (error) {
                 console.error('Error:', error);
-                stopProgressAnimation();
                 displayError(error.message);
             }
         }
 
-        function startProgressAnimation() {
-            const progressFill = document.getElementById('progressFill');
-            const progressText = document.getElementById('progressText');
-            const stages = [
-                'Initializing 5-agent system...',
-                'Deep psychological analysis...',
-                'Conversion intelligence extraction...',
-                'Customer interview simulation...',
-                'Sales intelligence gathering...',
-                'Campaign synthesis...',
-                'Finalizing comprehensive report...'
-            ];
-            
-            let progress = 0;
-            let stageIndex = 0;
-            
-            progressInterval = setInterval(() => {
-                progress += Math.random() * 15;
-                if (progress > 95) progress = 95;
-                
-                progressFill.style.width = progress + '%';
-                
-                if (progress > (stageIndex + 1) * 12 && stageIndex < stages.length - 1) {
-                    stageIndex++;
-                    progressText.textContent = stages[stageIndex];
+        function handleRawEvent(rawEvent) {
+            let eventName = 'message';
+            let dataLines = [];
+            rawEvent.split('\\n').forEach(line => {
+                if (line.startsWith('event:')) eventName = line.slice(6).trim();
+                else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+            });
+            if (!dataLines.length) return;  // keep-alive comment
+            handleStreamEvent(eventName, JSON.parse(dataLines.join('\\n')));
+        }
+
+        function handleStreamEvent(eventName, data) {
+            if (eventName === 'node_start') {
+                setProgress((completedNodes / totalNodes) * 100, NODE_LABELS[data.node] || data.node);
+            } else if (eventName === 'attempt') {
+                // A new LLM request (escalation, retry or hedge) replaces the section's live text
+                const block = getLiveBlock(data.node);
+                block.dataset.attempt = data.attempt;
+                block.querySelector('pre').textContent = '';
+                block.querySelector('h4').textContent = `⏳ ${data.node.replace(/_/g, ' ')}` + (data.attempt > 1 ? ` (attempt ${data.attempt})` : '');
+            } else if (eventName === 'token') {
+                const block = getLiveBlock(data.node);
+                if (String(data.attempt) === block.dataset.attempt) {
+                    block.querySelector('pre').textContent += data.text;
+                }
+            } else if (eventName === 'node_end') {
+                completedNodes++;
+                setProgress((completedNodes / totalNodes) * 100, `✅ ${data.node.replace(/_/g, ' ')} (${data.duration.toFixed(1)}s)`);
+                const sections = Object.entries(data.sections || {});
+                if (sections.length) {
+                    const block = getLiveBlock(data.node);
+                    block.querySelector('pre').textContent = sections.map(([key, text]) => text).join('\\n\\n---\\n\\n');
+                    block.querySelector('h4').textContent = `✅ ${sections.map(([key]) => key.replace(/_/g, ' ')).join(' + ')} (${data.duration.toFixed(1)}s)`;
                 }
-            }, 1000);
+            } else if (eventName === 'complete') {
+                setProgress(100, 'Report complete');
+                displayResults(data, data.elapsed.toFixed(1));
+            } else if (eventName === 'error') {
+                displayError(data.detail);
+            }
         }
 
-        function stopProgressAnimation() {
-            if (progressInterval) {
-                clearInterval(progressInterval);
-                progressInterval = null;
+        function getLiveBlock(node) {
+            const blockId = `live-${node}`;
+            let block = document.getElementById(blockId);
+            if (!block) {
+                block = document.createElement('div');
+                block.id = blockId;
+                block.style.cssText = 'margin-top: 20px; padding: 20px; background: #f8fafc; border-radius: 8px; border: 1px solid #e2e8f0;';
+                block.innerHTML = '<h4 style="color: #334155; margin-bottom: 10px;"></h4><pre style="white-space: pre-wrap; font-family: inherit; font-size: 14px; color: #334155;"></pre>';
+                block.querySelector('h4').textContent = `⏳ ${node.replace(/_/g, ' ')}`;
+                document.getElementById('liveSections').appendChild(block);
             }
-            document.getElementById('progressFill').style.width = '100%';
+            return block;
+        }
+
+        function setProgress(percent, text) {
+            const progressFill = document.getElementById('progressFill');
+            const progressText = document.getElementById('progressText');
+            if (progressFill) progressFill.style.width = percent + '%';
+            if (progressText) progressText.textContent = text;
         }
 
         function displayResults(data, duration) {
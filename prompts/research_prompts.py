@@ -1,5 +1,7 @@
 # prompts/research_prompts.py - Corrected dual prompt system
 
+import re
+
 class ResearchPrompts:
     """Dual prompt system for maximum psychological depth + conversion intelligence"""
     
@@ -534,6 +536,115 @@ Based on the psychological analysis, identify offer types that resonate:
 ---
 
 **DELIVER MARKETING INTELLIGENCE THAT DIRECTLY DRIVES CONVERSIONS, LEADS, AND REVENUE GROWTH USING DEEP PSYCHOLOGICAL INSIGHTS.**
+"""
+    
+    @staticmethod
+    def get_competitor_intelligence():
+        """Competitor discovery & strategic intelligence prompt"""
+        return """
+BUSINESS CONTEXT:
+{business_context}
+
+PSYCHOLOGICAL INSIGHTS FOR COMPETITIVE ANALYSIS:
+{psychological_analysis}
+
+WEB SEARCH RESULTS:
+{search_results}
+
+COMPETITOR DISCOVERY & STRATEGIC INTELLIGENCE ANALYSIS
+
+**OBJECTIVE**: Identify key competitors and analyze their positioning, messaging, and strategic gaps using the psychological insights about our target customers.
+
+**ANALYSIS FRAMEWORK**:
+
+## PART A: COMPETITOR IDENTIFICATION & LANDSCAPE MAPPING
+
+### 1. Direct Competitors
+- Companies offering similar solutions to the same target market
+- Analyze their positioning, messaging, and value propositions
+- Identify market share and competitive strength
+
+### 2. Indirect Competitors  
+- Alternative solutions customers might consider
+- Different approaches to solving the same core problems
+- Substitute products or services
+
+### 3. Competitive Landscape Overview
+- Market positioning map showing where competitors sit
+- Identify crowded vs. uncrowded market spaces
+- Analyze competitive intensity in different segments
+
+## PART B: COMPETITOR MESSAGING & POSITIONING ANALYSIS
+
+### 1. Common Messaging Patterns
+- What themes and angles are competitors using?
+- What value propositions are most common?
+- How do they position against customer pain points?
+
+### 2. Positioning Gaps Analysis
+Using the psychological insights, identify:
+- What customer psychology are competitors missing?
+- Which emotional triggers are they not addressing?
+- What identity transformation opportunities are they ignoring?
+- Which unconscious beliefs are they not targeting?
+
+### 3. Messaging Weaknesses
+- Generic messaging that doesn't resonate deeply
+- Logical arguments that miss emotional drivers
+- Surface-level benefits vs. deeper psychological needs
+- Missed opportunities for identity-based positioning
+
+## PART C: STRATEGIC OPPORTUNITY IDENTIFICATION
+
+### 1. Psychological Positioning Gaps
+Based on customer psychology analysis:
+- What psychological angles are competitors missing?
+- Which identity transformation opportunities are untapped?
+- What unconscious motivations are they not addressing?
+- Which emotional triggers could create competitive advantage?
+
+### 2. Market Positioning Opportunities
+- Underserved customer segments or use cases
+- Unoccupied positioning territories
+- Differentiation opportunities based on psychological insights
+- Blue ocean opportunities in crowded markets
+
+### 3. "World Domination" Strategy Elements
+- Unique psychological positioning that competitors can't copy
+- Identity-based differentiation that creates customer loyalty
+- Emotional moats that make switching psychologically difficult
+- Messaging that hits deeper than competitors' surface-level benefits
+
+## PART D: COMPETITIVE INTELLIGENCE SYNTHESIS
+
+### 1. Competitor Strengths & Weaknesses
+- What are competitors doing well?
+- Where are their strategic vulnerabilities?
+- What resources and capabilities do they have?
+- Where are they vulnerable to disruption?
+
+### 2. Strategic Recommendations
+- How to position against identified competitors
+- What messaging will cut through competitive noise
+- Which psychological angles will create unbeatable advantage
+- How to build competitive moats using customer psychology
+
+### 3. Immediate Tactical Opportunities
+- Quick wins in positioning and messaging
+- Underutilized channels or approaches
+- Competitive gaps that can be exploited immediately
+- Psychological triggers that can be activated for rapid differentiation
+
+**DELIVERABLE REQUIREMENTS**:
+- Identify 5-10 key competitors with analysis
+- Map competitive landscape and positioning gaps
+- Provide specific psychological positioning opportunities
+- Deliver actionable "world domination" strategy recommendations
+- Include specific messaging angles that exploit competitive weaknesses
+
+**ANALYSIS DEPTH**: Minimum 2,000 words of substantive competitive intelligence with psychological strategy integration.
+
+Generate comprehensive competitor intelligence that reveals strategic opportunities for unbeatable market positioning.
 """
     
     @staticmethod
@@ -869,3 +980,83 @@ PSYCHOLOGICAL FOUNDATION:
 
 **DELIVER SALES INTELLIGENCE THAT REVEALS EXACTLY WHAT CUSTOMERS NEED TO KNOW AND BELIEVE TO BUY YOUR SOLUTION.**
 """
+
+    @staticmethod
+    def get_express_research():
+        """Express tier prompt - psychology, conversion and campaign strategy in one pass"""
+        return """
+
+Business Context: {business_context}
+
+Industry Patterns from Previous Research: {industry_patterns}
+
+EXPRESS MARKET INTELLIGENCE
+
+Deliver a fast, decision-ready market research brief in a single response. Prioritize the highest-leverage insights over exhaustive coverage.
+
+Respond with exactly these three sections, each starting with its heading line:
+
+## PSYCHOLOGICAL ANALYSIS
+- Primary customer archetypes (2-3) with their core identity tension
+- Top pain points in the customer's own language
+- Hidden contradictions between what customers say and what they do
+- Emotional triggers that move them to act
+
+## CONVERSION INTELLIGENCE
+- Top objections with the psychological driver behind each
+- Buying criteria and decision triggers
+- Messaging angles and 3 headline hooks ready for testing
+- Highest-converting channel bets for this audience
+
+## CAMPAIGN SYNTHESIS
+- Core positioning statement
+- Messaging pillars and proof points
+- 30-day launch plan with the first tests to run
+- Success metrics to watch
+
+**ANALYSIS DEPTH**: Roughly 1,500 words total. Be specific to this business - no generic marketing advice.
+"""
+
+    @staticmethod
+    def get_output_digest():
+        """Digest prompt - condenses one agent's report for downstream agents"""
+        return """
+
+SOURCE REPORT ({source_name}):
+{source_text}
+
+STRUCTURED DIGEST
+
+Condense the source report above into a compact digest that downstream research agents will use instead of the full text.
+
+Return ONLY a JSON object with exactly these keys, each a list of short strings:
+- "archetypes": customer archetypes or personas, each with their core identity tension
+- "pains": pain points and fears, in the customer's own words where possible
+- "objections": buying objections with the belief behind each
+- "triggers": emotional and situational triggers that move customers to act
+- "quotes": verbatim or near-verbatim customer phrases worth reusing in copy
+- "opportunities": positioning, messaging or competitive opportunities
+
+**RULES**:
+- At most 6 items per key, each under 30 words
+- Keep the report's specific details - names, numbers, exact phrases
+- Use an empty list when the report has nothing for a key
+- No commentary outside the JSON object
+"""
+
+    @staticmethod
+    def split_cacheable(template):
+        """Split a template into (static instructions, variable context template)
+
+        Every placeholder sits in the header of these prompts, so everything after the
+        last placeholder line is fixed instruction text that can be sent as a cached
+        prefix, with the per-request context appended after it.
+        """
+        lines = template.split("\n")
+        last_variable_line = max(
+            (i for i, line in enumerate(lines) if re.search(r"\{\w+\}", line)),
+            default=-1
+        )
+        context_template = "\n".join(lines[:last_variable_line + 1]).strip()
+        instructions = "\n".join(lines[last_variable_line + 1:]).strip()
+        return instructions, context_template
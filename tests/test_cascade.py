@@ -0,0 +1,121 @@
+# tests/test_cascade.py - Model cascade quality gate: threshold decides escalation, escalation rate is counted
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from agent.cascade import CASCADE_CHECKS, ModelCascade, score_output
+from benchmarks.stubs import StubLLM, filler_text
+
+ROUTE = "campaign_synthesis"
+
+
+class ReportStubLLM(StubLLM):
+    """StubLLM that writes the route's expected headings and markers (minus any left out)"""
+
+    def __init__(self, route: str, output_tokens: int = 2500, omit_sections: int = 0, stop_reason: str = "end_turn"):
+        super().__init__(route, latency=0.0, output_tokens=output_tokens)
+        self.omit_sections = omit_sections
+        self.stop_reason = stop_reason
+
+    def _content(self) -> str:
+        checks = CASCADE_CHECKS[self.task_type]
+        sections = checks["sections"][self.omit_sections:]
+        body = filler_text(self.output_tokens // max(len(sections), 1))
+        markers = " ".join(checks["markers"])
+        return "\n\n".join(f"## {section}\n\n{body} {markers}" for section in sections)
+
+    async def ainvoke(self, prompt: Any, *args: Any, **kwargs: Any):
+        message = await super().ainvoke(prompt, *args, **kwargs)
+        message.response_metadata = {"stop_reason": self.stop_reason}
+        return message
+
+
+def draft(llm: StubLLM):
+    return asyncio.run(llm.ainvoke("prompt"))
+
+
+@pytest.fixture
+def cascade() -> ModelCascade:
+    cascade = ModelCascade()
+    cascade.enabled = True
+    cascade.threshold = 0.85
+    return cascade
+
+
+def test_complete_draft_scores_full_marks():
+    score, checks = score_output(ROUTE, draft(ReportStubLLM(ROUTE)))
+    assert score == pytest.approx(1.0)
+    assert checks == {"length": 1.0, "sections": 1.0, "markers": 1.0, "complete": 1.0}
+
+
+def test_draft_above_threshold_is_kept(cascade):
+    verdict = cascade.judge(ROUTE, draft(ReportStubLLM(ROUTE)))
+    assert verdict["escalated"] is False
+    assert verdict["threshold"] == 0.85
+
+
+def test_unstructured_draft_is_escalated(cascade):
+    verdict = cascade.judge(ROUTE, draft(StubLLM(ROUTE, latency=0.0, output_tokens=2500)))
+    assert verdict["escalated"] is True
+    assert verdict["checks"]["sections"] == 0.0
+
+
+def test_truncated_draft_is_escalated(cascade):
+    verdict = cascade.judge(ROUTE, draft(ReportStubLLM(ROUTE, stop_reason="max_tokens")))
+    assert verdict["checks"]["complete"] == 0.0
+    assert verdict["escalated"] is True
+
+
+def test_draft_missing_half_its_sections_is_escalated(cascade):
+    verdict = cascade.judge(ROUTE, draft(ReportStubLLM(ROUTE, omit_sections=2)))
+    assert verdict["escalated"] is True
+
+
+def test_draft_missing_one_section_is_kept(cascade):
+    verdict = cascade.judge(ROUTE, draft(ReportStubLLM(ROUTE, omit_sections=1)))
+    assert verdict["escalated"] is False
+
+
+def test_threshold_decides_escalation(cascade):
+    truncated = draft(ReportStubLLM(ROUTE, stop_reason="max_tokens"))
+    assert cascade.judge(ROUTE, truncated)["escalated"] is True
+    cascade.threshold = 0.75
+    assert cascade.judge(ROUTE, truncated)["escalated"] is False
+
+
+def test_failed_draft_call_escalates(cascade):
+    verdict = cascade.judge(ROUTE, None)
+    assert verdict == {"score": 0.0, "threshold": 0.85, "escalated": True, "checks": {}}
+
+
+def test_escalation_rate_is_counted_per_route_and_overall(cascade):
+    good = draft(ReportStubLLM(ROUTE))
+    weak = draft(StubLLM(ROUTE, latency=0.0, output_tokens=2500))
+    for result in (good, good, good, weak):
+        cascade.judge(ROUTE, result)
+    cascade.judge("psychological_interviews", None)
+
+    assert cascade.escalation_rate(ROUTE) == pytest.approx(0.25)
+    assert cascade.escalation_rate("psychological_interviews") == 1.0
+    assert cascade.escalation_rate() == pytest.approx(0.4)
+
+    stats = cascade.stats()
+    assert stats["drafts"] == 5
+    assert stats["escalations"] == 2
+    route_stats = stats["routes"][ROUTE]
+    assert (route_stats["drafts"], route_stats["escalations"], route_stats["escalation_rate"]) == (4, 1, 0.25)
+    assert 0.75 < route_stats["mean_score"] < 1.0
+
+
+def test_escalation_rate_is_zero_before_any_draft(cascade):
+    assert cascade.escalation_rate() == 0.0
+    assert cascade.escalation_rate(ROUTE) == 0.0
+
+
+def test_cascade_applies_only_to_checked_routes(cascade):
+    assert cascade.applies(ROUTE)
+    assert not cascade.applies("psychological_analysis")
+    cascade.enabled = False
+    assert not cascade.applies(ROUTE)
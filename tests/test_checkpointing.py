@@ -0,0 +1,95 @@
+# tests/test_checkpointing.py - Resuming a finished run re-runs only the nodes that recorded a failure
+
+import asyncio
+from collections import Counter
+from typing import Annotated, Any, Dict, List, TypedDict
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.graph import END, StateGraph
+
+from agent.checkpointing import failed_nodes, resume_run, thread_config
+from agent.graph import merge_dicts, node_failure
+
+
+class StubState(TypedDict):
+    business_context: str
+    analysis: str
+    search: str
+    interviews: str
+    report: str
+    failed_nodes: Annotated[Dict[str, str], merge_dicts]
+
+
+def build_graph(saver: AsyncSqliteSaver, calls: Counter, failing: List[str]):
+    """set_goal -> analysis -> (search, interviews) -> report, with nodes in failing failing once"""
+
+    def node(name: str, key: str):
+        async def run(state: StubState) -> Dict[str, Any]:
+            calls[name] += 1
+            if name in failing:
+                failing.remove(name)
+                return {key: f"Error in {name}", **node_failure(name, RuntimeError("provider overloaded"))}
+            return {key: f"{name} #{calls[name]}"}
+        return run
+
+    workflow = StateGraph(StubState)
+    workflow.add_node("analysis_agent", node("analysis_agent", "analysis"))
+    workflow.add_node("search_agent", node("search_agent", "search"))
+    workflow.add_node("interview_agent", node("interview_agent", "interviews"))
+    workflow.add_node("report_agent", node("report_agent", "report"))
+    workflow.set_entry_point("analysis_agent")
+    workflow.add_edge("analysis_agent", "search_agent")
+    workflow.add_edge("analysis_agent", "interview_agent")
+    workflow.add_edge(["search_agent", "interview_agent"], "report_agent")
+    workflow.add_edge("report_agent", END)
+    return workflow.compile(checkpointer=saver)
+
+
+def run_and_resume(tmp_path, failing: List[str], resumes: int = 1):
+    calls = Counter()
+
+    async def scenario():
+        async with aiosqlite.connect(str(tmp_path / "checkpoints.db")) as conn:
+            graph = build_graph(AsyncSqliteSaver(conn), calls, failing)
+            first = await graph.ainvoke({"business_context": "B2B onboarding"}, thread_config("research_1"))
+            results = [first]
+            for _ in range(resumes):
+                results.append(await resume_run(graph, "research_1"))
+            return results
+
+    return calls, asyncio.run(scenario())
+
+
+def test_failed_nodes_reads_the_recorded_failures():
+    # Report text that merely mentions an error is not a failure
+    assert failed_nodes({"search": "Error fetching 1 of 5 queries", "failed_nodes": {}}) == []
+    assert failed_nodes({"failed_nodes": {"search_agent": "timeout"}}) == ["search_agent"]
+
+
+def test_resume_reruns_only_the_failed_sibling(tmp_path):
+    calls, (first, resumed) = run_and_resume(tmp_path, ["search_agent"])
+
+    assert failed_nodes(first) == ["search_agent"]
+    assert failed_nodes(resumed) == []
+    assert resumed["search"] == "search_agent #2"
+    # The sibling that succeeded next to the failed node is reused, not paid for again
+    assert resumed["interviews"] == "interview_agent #1"
+    assert calls == Counter(analysis_agent=1, search_agent=2, interview_agent=1, report_agent=2)
+
+
+def test_completed_run_has_nothing_to_resume(tmp_path):
+    calls, (first, resumed) = run_and_resume(tmp_path, [])
+
+    assert resumed is None
+    assert calls == Counter(analysis_agent=1, search_agent=1, interview_agent=1, report_agent=1)
+
+
+def test_second_resume_follows_the_resumed_branch(tmp_path):
+    # The resumed run succeeds, so its branch - not the failed original - decides what is left to do
+    calls, (first, resumed, again) = run_and_resume(tmp_path, ["report_agent"], resumes=2)
+
+    assert failed_nodes(first) == ["report_agent"]
+    assert failed_nodes(resumed) == []
+    assert again is None
+    assert calls == Counter(analysis_agent=1, search_agent=1, interview_agent=1, report_agent=2)
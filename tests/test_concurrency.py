@@ -0,0 +1,135 @@
+# tests/test_concurrency.py - AIMD limiter: additive increase under healthy saturation, multiplicative decrease on overload
+
+import asyncio
+
+import pytest
+
+from agent.concurrency import AdaptiveLimiter, is_overload
+
+
+class StatusError(Exception):
+    """Provider error carrying an HTTP status, like the SDKs' APIStatusError"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+async def call(limiter: AdaptiveLimiter, latency: float = 0.0, error: BaseException = None, key: str = "test"):
+    async with limiter.slot(key):
+        await asyncio.sleep(latency)
+        if error is not None:
+            raise error
+
+
+def test_saturated_healthy_call_increases_limit():
+    async def scenario():
+        limiter = AdaptiveLimiter("test", initial=1, minimum=1, maximum=10)
+        await call(limiter)
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.limit == 2.0
+    assert limiter.history[-1]["reason"] == "increase"
+
+
+def test_unsaturated_call_leaves_limit_unchanged():
+    async def scenario():
+        limiter = AdaptiveLimiter("test", initial=4, minimum=1, maximum=10)
+        await call(limiter)
+        return limiter
+
+    assert asyncio.run(scenario()).limit == 4.0
+
+
+def test_increase_is_additive_and_capped():
+    limiter = AdaptiveLimiter("test", initial=2, minimum=1, maximum=3)
+    limiter._on_success("test", 1.0, saturated=True)
+    assert limiter.limit == pytest.approx(2.5)
+    limiter._on_success("test", 1.0, saturated=True)
+    assert limiter.limit == pytest.approx(2.9)
+    for _ in range(10):
+        limiter._on_success("test", 1.0, saturated=True)
+    assert limiter.limit == 3.0
+
+
+def test_slow_call_does_not_increase_limit():
+    limiter = AdaptiveLimiter("test", initial=2, minimum=1, maximum=10, tolerance=2.0)
+    limiter._on_success("test", 1.0, saturated=True)
+    grown = limiter.limit
+    limiter._on_success("test", 5.0, saturated=True)
+    assert limiter.limit == grown
+
+
+@pytest.mark.parametrize("error", [StatusError(429), StatusError(529), asyncio.TimeoutError()])
+def test_overload_halves_limit(error):
+    async def scenario():
+        limiter = AdaptiveLimiter("test", initial=8, minimum=1, maximum=10)
+        with pytest.raises(type(error)):
+            await call(limiter, error=error)
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.limit == 4.0
+    assert limiter.in_flight == 0
+    assert limiter.history[-1]["reason"] == f"decrease:{type(error).__name__}"
+
+
+def test_non_overload_error_leaves_limit_unchanged():
+    async def scenario():
+        limiter = AdaptiveLimiter("test", initial=8, minimum=1, maximum=10)
+        with pytest.raises(StatusError):
+            await call(limiter, error=StatusError(500))
+        return limiter
+
+    assert not is_overload(StatusError(500))
+    assert asyncio.run(scenario()).limit == 8.0
+
+
+def test_burst_of_failures_counts_as_one_decrease():
+    async def scenario():
+        limiter = AdaptiveLimiter("test", initial=8, minimum=1, maximum=10)
+        results = await asyncio.gather(
+            *(call(limiter, latency=0.01, error=StatusError(429)) for _ in range(4)),
+            return_exceptions=True
+        )
+        assert all(isinstance(result, StatusError) for result in results)
+        return limiter
+
+    assert asyncio.run(scenario()).limit == 4.0
+
+
+def test_decrease_stops_at_minimum():
+    async def scenario():
+        limiter = AdaptiveLimiter("test", initial=2, minimum=1.5, maximum=10)
+        for _ in range(3):
+            with pytest.raises(StatusError):
+                await call(limiter, error=StatusError(529))
+        return limiter
+
+    assert asyncio.run(scenario()).limit == 1.5
+
+
+def test_callers_beyond_limit_wait_for_a_slot():
+    async def scenario():
+        limiter = AdaptiveLimiter("test", initial=2, minimum=1, maximum=2)
+        tasks = [asyncio.ensure_future(call(limiter, latency=0.05)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        in_flight, waiting = limiter.in_flight, limiter.stats()["waiting"]
+        await asyncio.gather(*tasks)
+        return in_flight, waiting, limiter.in_flight
+
+    assert asyncio.run(scenario()) == (2, 1, 0)
+
+
+def test_limiter_backs_off_for_cooldown_after_a_decrease():
+    async def scenario():
+        limiter = AdaptiveLimiter("test", initial=8, minimum=1, maximum=10, cooldown=0.05)
+        assert not limiter.backing_off
+        with pytest.raises(StatusError):
+            await call(limiter, error=StatusError(429))
+        during = limiter.backing_off
+        await asyncio.sleep(0.06)
+        return during, limiter.backing_off
+
+    assert asyncio.run(scenario()) == (True, False)
@@ -0,0 +1,40 @@
+# tests/test_graph.py - The research graph imports and compiles for every tier and planned subset
+
+import pytest
+
+from agent.graph import (
+    RESEARCH_TIERS, WORKFLOW_NODES, Level10ResearchState, create_enhanced_intelligence_workflow, resolve_plan_nodes
+)
+from agent.planner import KEY_PRODUCERS, TIER_KEY_PRODUCERS
+from agent.report_cache import NODE_SECTIONS
+from agent.token_budget import NODE_BUDGETS
+
+
+@pytest.mark.parametrize("tier", list(RESEARCH_TIERS))
+def test_every_tier_compiles(tier):
+    graph = create_enhanced_intelligence_workflow(tier=tier)
+    assert set(RESEARCH_TIERS[tier]["nodes"]) <= set(graph.nodes)
+
+
+@pytest.mark.parametrize("tier,node", [(tier, node) for tier, spec in RESEARCH_TIERS.items() for node in spec["nodes"]])
+def test_single_node_plans_compile(tier, node):
+    graph = create_enhanced_intelligence_workflow(nodes=[node], tier=tier)
+    assert set(resolve_plan_nodes([node], tier)) <= set(graph.nodes)
+
+
+def test_node_names_are_not_state_keys():
+    # LangGraph refuses a node named after a state channel
+    assert not set(WORKFLOW_NODES) & set(Level10ResearchState.__annotations__)
+
+
+@pytest.mark.parametrize("table", [NODE_BUDGETS, NODE_SECTIONS], ids=["budgets", "sections"])
+def test_node_tables_are_keyed_by_workflow_node(table):
+    # These tables are matched against execution plans, which list node names
+    assert set(table) <= set(WORKFLOW_NODES)
+
+
+def test_key_producers_are_workflow_nodes():
+    producers = set(KEY_PRODUCERS.values())
+    for overrides in TIER_KEY_PRODUCERS.values():
+        producers |= set(overrides.values())
+    assert producers <= set(WORKFLOW_NODES)
@@ -0,0 +1,77 @@
+# tests/test_jobs.py - Background research jobs reach a terminal status in the job store
+
+import asyncio
+from typing import Any, Dict
+
+from agent.jobs import JobStore, ResearchJobQueue
+
+
+async def wait_for_status(queue: ResearchJobQueue, job_id: str, timeout: float = 2.0) -> Dict[str, Any]:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = await queue.get(job_id)
+        if job["status"] in ("completed", "failed") or asyncio.get_running_loop().time() > deadline:
+            return job
+        await asyncio.sleep(0.01)
+
+
+def run_job(tmp_path, runner, request=None) -> Dict[str, Any]:
+    async def scenario():
+        queue = ResearchJobQueue(runner, store=JobStore(str(tmp_path / "jobs.db")), workers=1, max_queued=2)
+        await queue.start()
+        try:
+            job_id = await queue.submit(request or {"business_context": "B2B onboarding"})
+            return await wait_for_status(queue, job_id)
+        finally:
+            await queue.stop()
+
+    return asyncio.run(scenario())
+
+
+def test_job_runs_to_completed(tmp_path):
+    calls = []
+
+    async def stub_graph(request: Dict[str, Any], job_id: str) -> Dict[str, Any]:
+        calls.append(job_id)
+        return {"formatted_report": f"Report for {request['business_context']}"}
+
+    job = run_job(tmp_path, stub_graph)
+    assert job["status"] == "completed"
+    assert job["result"] == {"formatted_report": "Report for B2B onboarding"}
+    assert job["started_at"] is not None and job["finished_at"] >= job["started_at"]
+    assert calls == [job["job_id"]]
+
+
+def test_failing_job_is_marked_failed(tmp_path):
+    async def failing_graph(request: Dict[str, Any], job_id: str) -> Dict[str, Any]:
+        raise RuntimeError("graph exploded")
+
+    job = run_job(tmp_path, failing_graph)
+    assert job["status"] == "failed"
+    assert job["error"] == "graph exploded"
+    assert job["result"] is None
+
+
+def test_interrupted_and_overflow_jobs_run_after_restart(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.create("interrupted", {"business_context": "a"}, None)
+    store.update("interrupted", status="running")
+    for i in range(3):
+        store.create(f"queued-{i}", {"business_context": str(i)}, None)
+    done = []
+
+    async def stub_graph(request: Dict[str, Any], job_id: str) -> Dict[str, Any]:
+        done.append(job_id)
+        return {"formatted_report": "ok"}
+
+    async def scenario():
+        queue = ResearchJobQueue(stub_graph, store=store, workers=1, max_queued=1)
+        await queue.start()
+        try:
+            return [await wait_for_status(queue, job_id) for job_id in ("interrupted", "queued-0", "queued-1", "queued-2")]
+        finally:
+            await queue.stop()
+
+    jobs = asyncio.run(scenario())
+    assert [job["status"] for job in jobs] == ["completed"] * 4
+    assert sorted(done) == ["interrupted", "queued-0", "queued-1", "queued-2"]
@@ -0,0 +1,131 @@
+# tests/test_quota.py - Grant order of the provider quota scheduler: priority, tenant fairness, aging
+
+import asyncio
+import time
+from typing import List
+
+from agent.quota import ProviderQuota
+
+
+def make_quota(aging: float = 120.0) -> ProviderQuota:
+    """One request per second with the bucket empty, so every acquire queues until grant_one()"""
+    quota = ProviderQuota("test", rpm=60, aging=aging)
+    quota.requests.level = 0
+    return quota
+
+
+async def take(quota: ProviderQuota, order: List[str], label: str,
+               priority: str = "interactive", tenant: str = "default", tokens: int = 1):
+    await quota.acquire(tokens, priority, tenant)
+    order.append(label)
+
+
+async def queue_all(quota: ProviderQuota, order: List[str], calls) -> List[asyncio.Task]:
+    tasks = []
+    for label, priority, tenant, tokens in calls:
+        tasks.append(asyncio.ensure_future(take(quota, order, label, priority, tenant, tokens)))
+        await asyncio.sleep(0)
+    return tasks
+
+
+async def grant_one(quota: ProviderQuota):
+    """Refill exactly one request and let the granted caller run"""
+    quota.requests.level = 1
+    quota.requests.updated = time.monotonic()
+    quota._dispatch()
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def grant_all(quota: ProviderQuota, tasks: List[asyncio.Task]):
+    for _ in tasks:
+        await grant_one(quota)
+    await asyncio.gather(*tasks)
+
+
+def test_unlimited_quota_grants_immediately():
+    async def scenario():
+        quota = ProviderQuota("test")
+        reservation = await quota.acquire(500, "batch", "acme")
+        return reservation, quota.granted
+
+    reservation, granted = asyncio.run(scenario())
+    assert reservation.waited == 0.0
+    assert reservation.tokens == 500
+    assert granted == 1
+
+
+def test_interactive_is_served_before_earlier_batch():
+    async def scenario():
+        quota, order = make_quota(), []
+        tasks = await queue_all(quota, order, [
+            ("batch-1", "batch", "default", 1),
+            ("batch-2", "batch", "default", 1),
+            ("interactive-1", "interactive", "default", 1),
+        ])
+        assert order == []
+        await grant_all(quota, tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["interactive-1", "batch-1", "batch-2"]
+
+
+def test_light_tenant_is_not_crowded_out_by_heavy_tenant():
+    async def scenario():
+        quota, order = make_quota(), []
+        tasks = await queue_all(quota, order, [
+            ("heavy-1", "interactive", "heavy", 1000),
+            ("heavy-2", "interactive", "heavy", 1000),
+            ("heavy-3", "interactive", "heavy", 1000),
+            ("light-1", "interactive", "light", 10),
+            ("light-2", "interactive", "light", 10),
+        ])
+        await grant_all(quota, tasks)
+        return order
+
+    # The heavy tenant's first grant advances its virtual clock past everything the light tenant queued
+    assert asyncio.run(scenario()) == ["heavy-1", "light-1", "light-2", "heavy-2", "heavy-3"]
+
+
+def test_priority_outranks_tenant_fairness():
+    async def scenario():
+        quota, order = make_quota(), []
+        tasks = await queue_all(quota, order, [
+            ("light-batch", "batch", "light", 1),
+            ("heavy-1", "interactive", "heavy", 1000),
+            ("heavy-2", "interactive", "heavy", 1000),
+        ])
+        await grant_all(quota, tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["heavy-1", "heavy-2", "light-batch"]
+
+
+def test_batch_waiting_past_aging_limit_is_served_as_interactive():
+    async def scenario():
+        quota, order = make_quota(aging=0.05), []
+        tasks = await queue_all(quota, order, [("batch-1", "batch", "default", 1)])
+        await asyncio.sleep(0.1)
+        tasks += await queue_all(quota, order, [("interactive-1", "interactive", "default", 1)])
+        await grant_all(quota, tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["batch-1", "interactive-1"]
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        quota, order = make_quota(), []
+        tasks = await queue_all(quota, order, [
+            ("first", "interactive", "default", 1),
+            ("second", "interactive", "default", 1),
+        ])
+        tasks[0].cancel()
+        await asyncio.gather(tasks[0], return_exceptions=True)
+        await grant_all(quota, tasks[1:])
+        return order, quota.stats()
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["second"]
+    assert stats["queued"] == {}
+    assert stats["granted"] == 1
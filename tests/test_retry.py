@@ -0,0 +1,245 @@
+# tests/test_retry.py - LLM call policy: hedging after the first-token threshold, retries and the call deadline
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, List
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+import agent.retry as retry_module
+from agent.concurrency import AdaptiveLimiter
+from agent.quota import ProviderQuota
+from agent.retry import LLMCallPolicy
+from benchmarks.stubs import StubLLM
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class ScriptedLLM(StubLLM):
+    """StubLLM whose successive requests take the scripted latencies (an exception instance fails that request)"""
+
+    def __init__(self, script: List[Any]):
+        super().__init__("default", latency=0.0, output_tokens=50)
+        self.script = list(script)
+        self.started = 0
+        self.cancelled = 0
+
+    async def astream(self, prompt: Any, *args: Any, **kwargs: Any) -> AsyncIterator[AIMessageChunk]:
+        step = self.script[min(self.started, len(self.script) - 1)]
+        self.started += 1
+        if isinstance(step, BaseException):
+            raise step
+        try:
+            await asyncio.sleep(step)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        message = await super().ainvoke(prompt)
+        yield AIMessageChunk(content=message.content, usage_metadata=message.usage_metadata)
+
+
+class RecordingSpan:
+    def __init__(self):
+        self.attributes = {}
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+
+@pytest.fixture(autouse=True)
+def isolated_limiter(monkeypatch):
+    """Keep test calls out of the shared anthropic limiter"""
+    limiter = AdaptiveLimiter("test", initial=100, minimum=100, maximum=100)
+    monkeypatch.setitem(retry_module.LLM_LIMITERS, "anthropic", limiter)
+    return limiter
+
+
+@pytest.fixture(autouse=True)
+def isolated_quota(monkeypatch):
+    """Fresh unlimited anthropic quota, so grants can be counted per test"""
+    quota = ProviderQuota("anthropic")
+    monkeypatch.setitem(retry_module.quota_scheduler.providers, "anthropic", quota)
+    return quota
+
+
+def make_policy(hedge_after: float = None) -> LLMCallPolicy:
+    """Policy with fast backoff; with hedge_after, enough first-token samples to hedge at that delay"""
+    policy = LLMCallPolicy()
+    policy.base_delay = 0.01
+    policy.max_delay = 0.01
+    policy.hedge_enabled = hedge_after is not None
+    if hedge_after is not None:
+        policy.hedge_min_samples = 5
+        policy.hedge_max_ratio = 1.0
+        policy._first_token["test"].extend([hedge_after] * 5)
+    return policy
+
+
+def test_hedge_fires_after_first_token_threshold_and_cancels_loser():
+    async def scenario():
+        policy, llm, span = make_policy(hedge_after=0.05), ScriptedLLM([1.0, 0.01]), RecordingSpan()
+        start = time.monotonic()
+        result = await policy.call("test", llm, "prompt", span)
+        elapsed = time.monotonic() - start
+        await asyncio.sleep(0.01)
+        return policy, llm, span, result, elapsed
+
+    policy, llm, span, result, elapsed = asyncio.run(scenario())
+    assert result.content
+    assert elapsed < 0.5
+    assert policy.hedges == 1
+    assert llm.started == 2
+    assert llm.cancelled == 1
+    assert span.attributes == {"attempts": 1, "hedged": True, "quota_wait": 0.0}
+
+
+def test_no_hedge_when_first_token_arrives_before_threshold():
+    async def scenario():
+        policy, llm, span = make_policy(hedge_after=0.2), ScriptedLLM([0.01]), RecordingSpan()
+        await policy.call("test", llm, "prompt", span)
+        return policy, llm, span
+
+    policy, llm, span = asyncio.run(scenario())
+    assert policy.hedges == 0
+    assert llm.started == 1
+    assert span.attributes["hedged"] is False
+
+
+def test_no_hedge_while_limiter_is_backing_off(isolated_limiter):
+    async def scenario():
+        isolated_limiter._on_overload(start=time.monotonic(), reason="StatusError")
+        policy, llm = make_policy(hedge_after=0.02), ScriptedLLM([0.1, 0.01])
+        await policy.call("test", llm, "prompt")
+        return policy, llm
+
+    policy, llm = asyncio.run(scenario())
+    assert isolated_limiter.backing_off
+    assert policy.hedges == 0
+    assert llm.started == 1
+
+
+def test_no_hedge_when_limiter_has_no_free_slot(monkeypatch):
+    full = AdaptiveLimiter("test", initial=1, minimum=1, maximum=1)
+    monkeypatch.setitem(retry_module.LLM_LIMITERS, "anthropic", full)
+
+    async def scenario():
+        policy, llm = make_policy(hedge_after=0.02), ScriptedLLM([0.1, 0.01])
+        await policy.call("test", llm, "prompt")
+        return policy, llm
+
+    policy, llm = asyncio.run(scenario())
+    assert policy.hedges == 0
+    assert llm.started == 1
+
+
+def test_no_hedge_without_enough_first_token_samples():
+    policy = make_policy(hedge_after=0.05)
+    policy.hedge_min_samples = 50
+    assert policy.hedge_delay("test") is None
+
+
+def test_hedges_are_capped_by_ratio():
+    policy = make_policy(hedge_after=0.05)
+    policy.hedge_max_ratio = 0.1
+    policy.calls, policy.hedges = 10, 1
+    assert policy.hedge_delay("test") is None
+
+
+def test_retryable_error_is_retried():
+    async def scenario():
+        policy, llm, span = make_policy(), ScriptedLLM([StatusError(529), 0.0]), RecordingSpan()
+        result = await policy.call("test", llm, "prompt", span)
+        return policy, llm, span, result
+
+    policy, llm, span, result = asyncio.run(scenario())
+    assert result.content
+    assert policy.retries == 1
+    assert llm.started == 2
+    assert span.attributes["attempts"] == 2
+
+
+def test_every_attempt_takes_its_own_quota_reservation(isolated_quota):
+    async def scenario():
+        policy, llm = make_policy(), ScriptedLLM([StatusError(529), StatusError(503), 0.0])
+        await policy.call("test", llm, "prompt")
+        return llm
+
+    llm = asyncio.run(scenario())
+    assert llm.started == 3
+    assert isolated_quota.granted == 3
+
+
+def test_hedged_request_takes_its_own_quota_reservation_and_slot(isolated_quota, isolated_limiter):
+    async def scenario():
+        policy, llm = make_policy(hedge_after=0.02), ScriptedLLM([0.2, 0.2])
+        call = asyncio.ensure_future(policy.call("test", llm, "prompt"))
+        await asyncio.sleep(0.1)
+        in_flight = isolated_limiter.in_flight
+        await call
+        return in_flight
+
+    assert asyncio.run(scenario()) == 2
+    assert isolated_quota.granted == 2
+    assert isolated_limiter.in_flight == 0
+
+
+def test_quota_is_settled_to_billed_tokens(monkeypatch):
+    async def scenario():
+        quota = ProviderQuota("anthropic", tpm=600)
+        monkeypatch.setitem(retry_module.quota_scheduler.providers, "anthropic", quota)
+        llm = ScriptedLLM([0.0])
+        llm.max_tokens = 500
+        result = await make_policy().call("test", llm, "prompt")
+        return quota, result
+
+    quota, result = asyncio.run(scenario())
+    # Only what the response billed is gone from the bucket, not the max_tokens reservation
+    spent = quota.tokens.capacity - quota.tokens.level
+    assert spent == pytest.approx(result.usage_metadata["total_tokens"], abs=5)
+
+
+def test_non_retryable_error_is_raised_immediately():
+    async def scenario():
+        policy, llm = make_policy(), ScriptedLLM([StatusError(400), 0.0])
+        with pytest.raises(StatusError):
+            await policy.call("test", llm, "prompt")
+        return policy, llm
+
+    policy, llm = asyncio.run(scenario())
+    assert policy.retries == 0
+    assert llm.started == 1
+
+
+def test_deadline_bounds_the_whole_call():
+    async def scenario():
+        policy, llm = make_policy(), ScriptedLLM([1.0])
+        policy.deadline = 0.05
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await policy.call("test", llm, "prompt")
+        return llm, time.monotonic() - start
+
+    llm, elapsed = asyncio.run(scenario())
+    assert elapsed < 0.5
+    assert llm.cancelled == llm.started
+
+
+def test_deadline_bounds_hedged_attempts():
+    async def scenario():
+        policy, llm = make_policy(hedge_after=0.01), ScriptedLLM([1.0, 1.0])
+        policy.deadline = 0.1
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await policy.call("test", llm, "prompt")
+        await asyncio.sleep(0.01)
+        return policy, llm, time.monotonic() - start
+
+    policy, llm, elapsed = asyncio.run(scenario())
+    assert policy.hedges == 1
+    assert elapsed < 0.5
+    assert llm.cancelled == llm.started
@@ -0,0 +1,70 @@
+# tests/test_streaming.py - Live tokens follow one LLM attempt per node, so drafts and retries never mix
+
+import asyncio
+from typing import Any, Dict, List
+
+from langchain_core.messages import AIMessageChunk
+
+from agent.streaming import stream_graph_events
+
+
+class ScriptedGraph:
+    """Replays a fixed astream_events sequence"""
+
+    def __init__(self, events: List[Dict[str, Any]]):
+        self.nodes = {"__start__": None, "psych_interview_agent": None}
+        self.events = events
+
+    async def astream_events(self, inputs, config=None, version="v2"):
+        for event in self.events:
+            yield event
+
+
+def node_event(kind: str, **data) -> Dict[str, Any]:
+    node = "psych_interview_agent"
+    return {"event": kind, "name": node, "run_id": "node", "parent_ids": ["root"],
+            "metadata": {"langgraph_node": node}, "data": data}
+
+
+def llm_event(kind: str, run_id: str, text: str = None) -> Dict[str, Any]:
+    data = {"chunk": AIMessageChunk(content=text)} if text is not None else {}
+    return {"event": kind, "name": "ChatAnthropic", "run_id": run_id, "parent_ids": ["root", "node"],
+            "metadata": {"langgraph_node": "psych_interview_agent"}, "data": data}
+
+
+def collect(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def scenario():
+        return [item async for item in stream_graph_events(ScriptedGraph(events), {})]
+
+    return asyncio.run(scenario())
+
+
+def test_escalation_starts_a_new_attempt():
+    items = collect([
+        node_event("on_chain_start"),
+        llm_event("on_chat_model_start", "draft"),
+        llm_event("on_chat_model_stream", "draft", "weak draft"),
+        llm_event("on_chat_model_start", "escalated"),
+        llm_event("on_chat_model_stream", "escalated", "accepted"),
+        node_event("on_chain_end", output={"psychological_interviews": "accepted"}),
+    ])
+
+    assert [(item["event"], item.get("attempt")) for item in items[1:-2]] == [
+        ("attempt", 1), ("token", 1), ("attempt", 2), ("token", 2)
+    ]
+    assert items[-2]["sections"] == {"psychological_interviews": "accepted"}
+
+
+def test_tokens_of_a_superseded_request_are_dropped():
+    # A hedge starts while the primary is still streaming - only the hedge is followed
+    items = collect([
+        node_event("on_chain_start"),
+        llm_event("on_chat_model_start", "primary"),
+        llm_event("on_chat_model_stream", "primary", "slow "),
+        llm_event("on_chat_model_start", "hedge"),
+        llm_event("on_chat_model_stream", "primary", "interleaved"),
+        llm_event("on_chat_model_stream", "hedge", "fast"),
+    ])
+
+    tokens = [(item["run_id"], item["text"]) for item in items if item["event"] == "token"]
+    assert tokens == [("primary", "slow "), ("hedge", "fast")]